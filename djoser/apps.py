@@ -0,0 +1,14 @@
+from django.apps import AppConfig
+
+
+class DjoserConfig(AppConfig):
+    name = "djoser"
+
+    def ready(self):
+        from djoser import checks  # noqa: F401
+        from djoser.conf import settings
+
+        if settings.PRELOAD_PASSWORD_VALIDATORS:
+            from djoser.password_validation import preload_password_validators
+
+            preload_password_validators()
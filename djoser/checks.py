@@ -0,0 +1,64 @@
+from django.contrib.auth import get_user_model
+from django.core.checks import Warning, register
+from django.db import connections, router
+from django.db.models import F
+from django.db.models.functions import Collate, Lower
+
+from djoser.conf import settings
+from djoser.filters import get_search_fields
+
+
+def _lowered_fields(expression, collation=None):
+    if collation is not None and isinstance(expression, Collate):
+        if expression.collation == collation:
+            (source,) = expression.get_source_expressions()
+            yield from _lowered_fields(source)
+        return
+    if collation is None and isinstance(expression, Lower):
+        (source,) = expression.get_source_expressions()
+        if isinstance(source, F):
+            yield source.name
+    for child in getattr(expression, "get_source_expressions", list)():
+        yield from _lowered_fields(child, collation)
+
+
+@register()
+def check_user_search_indexes(app_configs, **kwargs):
+    """
+    Warn about search fields without an index on ``Lower(field)``, collated as
+    ``"C"`` on PostgreSQL.
+    """
+    if not settings.USER_SEARCH:
+        return []
+
+    User = get_user_model()
+    if app_configs is not None and User._meta.app_config not in app_configs:
+        return []
+
+    # the expressions of djoser.filters.get_search_expression()
+    if connections[router.db_for_read(User)].vendor == "postgresql":
+        collation, template = "C", "Collate(Lower('{}'), 'C')"
+    else:
+        collation, template = None, "Lower('{}')"
+    indexed = {
+        field_name
+        for index in User._meta.indexes
+        for expression in index.expressions
+        for field_name in _lowered_fields(expression, collation)
+    }
+    return [
+        Warning(
+            f"USER_SEARCH is enabled but {User._meta.label} has no index on "
+            f"{template.format(field_name)}, so searching users scans the whole "
+            "table.",
+            hint=(
+                f"Add models.Index({template.format(field_name)}, name=...) to "
+                f"{User._meta.object_name}.Meta.indexes. Silence this check if "
+                "the index is created otherwise, e.g. by a RunSQL migration."
+            ),
+            obj=User,
+            id="djoser.W001",
+        )
+        for field_name in get_search_fields()
+        if field_name not in indexed
+    ]
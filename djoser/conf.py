@@ -1,16 +1,18 @@
 # flake8: noqa E501
+import contextvars
+import itertools
+import threading
+from collections import OrderedDict
+from contextlib import contextmanager
+
 from django.apps import apps
 from django.conf import settings as django_settings
-from django.test.signals import setting_changed
+from django.core.signals import setting_changed
 from django.utils.functional import LazyObject
 from django.utils.module_loading import import_string
 
 DJOSER_SETTINGS_NAMESPACE = "DJOSER"
 
-auth_module, user_model = django_settings.AUTH_USER_MODEL.rsplit(".", 1)
-
-User = apps.get_model(auth_module, user_model)
-
 
 class ObjDict(dict):
     def __getattribute__(self, item):
@@ -27,98 +29,218 @@ class ObjDict(dict):
         return val
 
 
-default_settings = {
-    "USER_ID_FIELD": User._meta.pk.name,
-    "LOGIN_FIELD": User.USERNAME_FIELD,
-    "SEND_ACTIVATION_EMAIL": False,
-    "SEND_CONFIRMATION_EMAIL": False,
-    "USER_CREATE_PASSWORD_RETYPE": False,
-    "SET_PASSWORD_RETYPE": False,
-    "PASSWORD_RESET_CONFIRM_RETYPE": False,
-    "SET_USERNAME_RETYPE": False,
-    "USERNAME_RESET_CONFIRM_RETYPE": False,
-    "PASSWORD_RESET_SHOW_EMAIL_NOT_FOUND": False,
-    "USERNAME_RESET_SHOW_EMAIL_NOT_FOUND": False,
-    "PASSWORD_CHANGED_EMAIL_CONFIRMATION": False,
-    "USERNAME_CHANGED_EMAIL_CONFIRMATION": False,
-    "TOKEN_MODEL": "rest_framework.authtoken.models.Token",
-    "SERIALIZERS": ObjDict(
-        {
-            "activation": "djoser.serializers.ActivationSerializer",
-            "password_reset": "djoser.serializers.SendEmailResetSerializer",
-            "password_reset_confirm": "djoser.serializers.PasswordResetConfirmSerializer",
-            "password_reset_confirm_retype": "djoser.serializers.PasswordResetConfirmRetypeSerializer",
-            "set_password": "djoser.serializers.SetPasswordSerializer",
-            "set_password_retype": "djoser.serializers.SetPasswordRetypeSerializer",
-            "set_username": "djoser.serializers.SetUsernameSerializer",
-            "set_username_retype": "djoser.serializers.SetUsernameRetypeSerializer",
-            "username_reset": "djoser.serializers.SendEmailResetSerializer",
-            "username_reset_confirm": "djoser.serializers.UsernameResetConfirmSerializer",
-            "username_reset_confirm_retype": "djoser.serializers.UsernameResetConfirmRetypeSerializer",
-            "user_create": "djoser.serializers.UserCreateSerializer",
-            "user_create_password_retype": "djoser.serializers.UserCreatePasswordRetypeSerializer",
-            "user_delete": "djoser.serializers.UserDeleteSerializer",
-            "user": "djoser.serializers.UserSerializer",
-            "current_user": "djoser.serializers.UserSerializer",
-            "token": "djoser.serializers.TokenSerializer",
-            "token_create": "djoser.serializers.TokenCreateSerializer",
-            "provider_auth": "djoser.social.serializers.ProviderAuthSerializer",
-        }
-    ),
-    "EMAIL": ObjDict(
-        {
-            "activation": "djoser.email.ActivationEmail",
-            "confirmation": "djoser.email.ConfirmationEmail",
-            "password_reset": "djoser.email.PasswordResetEmail",
-            "password_changed_confirmation": "djoser.email.PasswordChangedConfirmationEmail",
-            "username_changed_confirmation": "djoser.email.UsernameChangedConfirmationEmail",
-            "username_reset": "djoser.email.UsernameResetEmail",
-        }
-    ),
-    "EMAIL_FRONTEND_DOMAIN": None,
-    "EMAIL_FRONTEND_PROTOCOL": None,
-    "EMAIL_FRONTEND_SITE_NAME": None,
-    "CONSTANTS": ObjDict({"messages": "djoser.constants.Messages"}),
-    "LOGOUT_ON_PASSWORD_CHANGE": False,
-    "CREATE_SESSION_ON_LOGIN": False,
-    "SOCIAL_AUTH_TOKEN_STRATEGY": "djoser.social.token.jwt.TokenStrategy",
-    "SOCIAL_AUTH_ALLOWED_REDIRECT_URIS": [],
-    "HIDE_USERS": True,
-    "PERMISSIONS": ObjDict(
-        {
-            "activation": ["rest_framework.permissions.AllowAny"],
-            "password_reset": ["rest_framework.permissions.AllowAny"],
-            "password_reset_confirm": ["rest_framework.permissions.AllowAny"],
-            "set_password": ["djoser.permissions.CurrentUserOrAdmin"],
-            "username_reset": ["rest_framework.permissions.AllowAny"],
-            "username_reset_confirm": ["rest_framework.permissions.AllowAny"],
-            "set_username": ["djoser.permissions.CurrentUserOrAdmin"],
-            "user_create": ["rest_framework.permissions.AllowAny"],
-            "user_delete": ["djoser.permissions.CurrentUserOrAdmin"],
-            "user": ["djoser.permissions.CurrentUserOrAdmin"],
-            "user_list": ["djoser.permissions.CurrentUserOrAdmin"],
-            "token_create": ["rest_framework.permissions.AllowAny"],
-            "token_destroy": ["rest_framework.permissions.IsAuthenticated"],
-        }
-    ),
-    "WEBAUTHN": ObjDict(
-        {
-            "RP_NAME": "localhost",
-            "RP_ID": "localhost",
-            "ORIGIN": "http://localhost:8000",
-            "CHALLENGE_LENGTH": 32,
-            "UKEY_LENGTH": 20,
-            "SIGNUP_SERIALIZER": "djoser.webauthn.serializers.WebauthnCreateUserSerializer",
-            "LOGIN_SERIALIZER": "djoser.webauthn.serializers.WebauthnLoginSerializer",
+def _get_user_model():
+    auth_module, user_model = django_settings.AUTH_USER_MODEL.rsplit(".", 1)
+    return apps.get_model(auth_module, user_model)
+
+
+_default_settings = None
+
+
+def get_default_settings():
+    # built on first use, so importing djoser.conf doesn't need the app registry
+    global _default_settings
+    if _default_settings is not None:
+        return _default_settings
+
+    User = _get_user_model()
+    _default_settings = {
+        "USER_ID_FIELD": User._meta.pk.name,
+        "LOGIN_FIELD": User.USERNAME_FIELD,
+        "SEND_ACTIVATION_EMAIL": False,
+        "SEND_CONFIRMATION_EMAIL": False,
+        "USER_CREATE_PASSWORD_RETYPE": False,
+        "SET_PASSWORD_RETYPE": False,
+        "PASSWORD_RESET_CONFIRM_RETYPE": False,
+        "SET_USERNAME_RETYPE": False,
+        "USERNAME_RESET_CONFIRM_RETYPE": False,
+        "PASSWORD_RESET_SHOW_EMAIL_NOT_FOUND": False,
+        "USERNAME_RESET_SHOW_EMAIL_NOT_FOUND": False,
+        "PASSWORD_CHANGED_EMAIL_CONFIRMATION": False,
+        "USERNAME_CHANGED_EMAIL_CONFIRMATION": False,
+        "TOKEN_MODEL": "rest_framework.authtoken.models.Token",
+        "SERIALIZERS": ObjDict(
+            {
+                "activation": "djoser.serializers.ActivationSerializer",
+                "password_reset": "djoser.serializers.SendEmailResetSerializer",
+                "password_reset_confirm": "djoser.serializers.PasswordResetConfirmSerializer",
+                "password_reset_confirm_retype": "djoser.serializers.PasswordResetConfirmRetypeSerializer",
+                "set_password": "djoser.serializers.SetPasswordSerializer",
+                "set_password_retype": "djoser.serializers.SetPasswordRetypeSerializer",
+                "set_username": "djoser.serializers.SetUsernameSerializer",
+                "set_username_retype": "djoser.serializers.SetUsernameRetypeSerializer",
+                "username_reset": "djoser.serializers.SendEmailResetSerializer",
+                "username_reset_confirm": "djoser.serializers.UsernameResetConfirmSerializer",
+                "username_reset_confirm_retype": "djoser.serializers.UsernameResetConfirmRetypeSerializer",
+                "user_create": "djoser.serializers.UserCreateSerializer",
+                "user_create_password_retype": "djoser.serializers.UserCreatePasswordRetypeSerializer",
+                "user_delete": "djoser.serializers.UserDeleteSerializer",
+                "user_bulk_action": "djoser.serializers.UserBulkActionSerializer",
+                "user": "djoser.serializers.UserSerializer",
+                "current_user": "djoser.serializers.UserSerializer",
+                "token": "djoser.serializers.TokenSerializer",
+                "token_create": "djoser.serializers.TokenCreateSerializer",
+                "provider_auth": "djoser.social.serializers.ProviderAuthSerializer",
+            }
+        ),
+        "EMAIL": ObjDict(
+            {
+                "activation": "djoser.email.ActivationEmail",
+                "confirmation": "djoser.email.ConfirmationEmail",
+                "password_reset": "djoser.email.PasswordResetEmail",
+                "password_changed_confirmation": "djoser.email.PasswordChangedConfirmationEmail",
+                "username_changed_confirmation": "djoser.email.UsernameChangedConfirmationEmail",
+                "username_reset": "djoser.email.UsernameResetEmail",
+            }
+        ),
+        "EMAIL_FRONTEND_DOMAIN": None,
+        "EMAIL_FRONTEND_PROTOCOL": None,
+        "EMAIL_FRONTEND_SITE_NAME": None,
+        "CONSTANTS": ObjDict({"messages": "djoser.constants.Messages"}),
+        "LOGOUT_ON_PASSWORD_CHANGE": False,
+        "CREATE_SESSION_ON_LOGIN": False,
+        "SOCIAL_AUTH_TOKEN_STRATEGY": "djoser.social.token.jwt.TokenStrategy",
+        "SOCIAL_AUTH_ALLOWED_REDIRECT_URIS": [],
+        "SOCIAL_AUTH_HTTP_POOLING": False,
+        "SOCIAL_AUTH_HTTP_POOL_SIZE": 10,
+        "SOCIAL_AUTH_HTTP_CONNECT_TIMEOUT": 3.05,
+        "SOCIAL_AUTH_HTTP_READ_TIMEOUT": 10,
+        "HIDE_USERS": True,
+        "USER_LIST_PAGINATION_CLASS": None,
+        "SPARSE_FIELDSETS": False,
+        "USER_SEARCH": False,
+        "USER_ETAGS": False,
+        "CACHE_USER_ME": False,
+        "USER_ME_CACHE_TIMEOUT": 300,
+        "CACHE_ALIAS": "default",
+        "PASSWORD_HASHING_WORKERS": None,
+        "PRELOAD_PASSWORD_VALIDATORS": False,
+        "TOKEN_GENERATORS": {
+            "activation": {
+                "NAME": "django.contrib.auth.tokens.default_token_generator"
+            },
+            "password_reset": {
+                "NAME": "django.contrib.auth.tokens.default_token_generator"
+            },
+            "username_reset": {
+                "NAME": "django.contrib.auth.tokens.default_token_generator"
+            },
+        },
+        "ONE_TIME_TOKENS": False,
+        "ONE_TIME_TOKEN_TIMEOUTS": {
+            "activation": 3 * 24 * 60 * 60,
+            "password_reset": 60 * 60,
+            "username_reset": 60 * 60,
+        },
+        "OTP_CODES": False,
+        "OTP_CODE_LENGTH": 6,
+        "OTP_CODE_TIMEOUT": 15 * 60,
+        "OTP_CODE_MAX_ATTEMPTS": 5,
+        "IDEMPOTENCY_KEYS": False,
+        "IDEMPOTENCY_KEY_TTL": 24 * 60 * 60,
+        "IDEMPOTENCY_LOCK_TIMEOUT": 10,
+        "TENANT_RESOLVER": None,
+        "TENANT_SETTINGS": {},
+        "TENANT_SETTINGS_CACHE_SIZE": 128,
+        "PERMISSIONS": ObjDict(
+            {
+                "activation": ["rest_framework.permissions.AllowAny"],
+                "password_reset": ["rest_framework.permissions.AllowAny"],
+                "password_reset_confirm": ["rest_framework.permissions.AllowAny"],
+                "set_password": ["djoser.permissions.CurrentUserOrAdmin"],
+                "username_reset": ["rest_framework.permissions.AllowAny"],
+                "username_reset_confirm": ["rest_framework.permissions.AllowAny"],
+                "set_username": ["djoser.permissions.CurrentUserOrAdmin"],
+                "user_create": ["rest_framework.permissions.AllowAny"],
+                "user_delete": ["djoser.permissions.CurrentUserOrAdmin"],
+                "user": ["djoser.permissions.CurrentUserOrAdmin"],
+                "user_list": ["djoser.permissions.CurrentUserOrAdmin"],
+                "user_export": ["rest_framework.permissions.IsAdminUser"],
+                "user_bulk_create": ["rest_framework.permissions.IsAdminUser"],
+                "user_bulk_deactivate": ["rest_framework.permissions.IsAdminUser"],
+                "user_bulk_delete": ["rest_framework.permissions.IsAdminUser"],
+                "token_create": ["rest_framework.permissions.AllowAny"],
+                "token_destroy": ["rest_framework.permissions.IsAuthenticated"],
+            }
+        ),
+        "WEBAUTHN": ObjDict(
+            {
+                "RP_NAME": "localhost",
+                "RP_ID": "localhost",
+                "ORIGIN": "http://localhost:8000",
+                "CHALLENGE_LENGTH": 32,
+                "UKEY_LENGTH": 20,
+                "SIGNUP_SERIALIZER": "djoser.webauthn.serializers.WebauthnCreateUserSerializer",
+                "LOGIN_SERIALIZER": "djoser.webauthn.serializers.WebauthnLoginSerializer",
+            }
+        ),
+    }
+    return _default_settings
+
+
+def __getattr__(name):
+    if name == "User":
+        return _get_user_model()
+    if name == "default_settings":
+        return get_default_settings()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+class LazySetting:
+    """
+    Class attribute resolved from djoser settings on every access, e.g.
+    ``serializer_class = LazySetting("SERIALIZERS.user")``.
+
+    Defining a class doesn't load the settings (and whatever they import),
+    and the attribute follows settings reloads.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self._parts = path.split(".")
+
+    def __get__(self, instance, owner=None):
+        value = settings
+        for part in self._parts:
+            value = getattr(value, part)
+        return value
+
+
+class LazyMessages:
+    """
+    ``default_error_messages`` mapping error codes to attribute names on
+    ``settings.CONSTANTS.messages``, looked up when the dict is read.
+    """
+
+    def __init__(self, **message_names):
+        self.message_names = message_names
+
+    def __get__(self, instance, owner=None):
+        messages = settings.CONSTANTS.messages
+        return {
+            code: getattr(messages, name) for code, name in self.message_names.items()
         }
-    ),
-}
 
-SETTINGS_TO_IMPORT = ["TOKEN_MODEL", "SOCIAL_AUTH_TOKEN_STRATEGY"]
+
+SETTINGS_TO_IMPORT = [
+    "TOKEN_MODEL",
+    "SOCIAL_AUTH_TOKEN_STRATEGY",
+    "TENANT_RESOLVER",
+    "TENANT_SETTINGS",
+    "USER_LIST_PAGINATION_CLASS",
+]
+
+_settings_generations = itertools.count()
 
 
 class Settings:
-    def __init__(self, default_settings, explicit_overriden_settings: dict = None):
+    def __init__(
+        self,
+        default_settings,
+        explicit_overriden_settings: dict = None,
+        tenant_overlay: dict = None,
+        tenant=None,
+    ):
         if explicit_overriden_settings is None:
             explicit_overriden_settings = {}
 
@@ -127,11 +249,23 @@ class Settings:
             or explicit_overriden_settings
         )
 
-        self._load_default_settings()
+        self._default_settings = default_settings
+        self._overriden_settings = overriden_settings
+        self._load_default_settings(default_settings)
         self._override_settings(overriden_settings)
+        if tenant_overlay:
+            self._override_settings(tenant_overlay)
         self._init_settings_to_import()
+        # the key passed to for_tenant, unlike the generation it's the same in
+        # every process
+        self.tenant = tenant
+        # bumped on every reload, lets callers cache values derived from settings
+        self.generation = next(_settings_generations)
+        self._memoized = {}
+        self._tenants = OrderedDict()
+        self._tenants_lock = threading.Lock()
 
-    def _load_default_settings(self):
+    def _load_default_settings(self, default_settings):
         for setting_name, setting_value in default_settings.items():
             if setting_name.isupper():
                 setattr(self, setting_name, setting_value)
@@ -145,20 +279,136 @@ class Settings:
             setattr(self, setting_name, value)
 
     def _init_settings_to_import(self):
+        # dotted paths are imported on first access, see __getattr__
+        self._pending_imports = {}
         for setting_name in SETTINGS_TO_IMPORT:
             value = getattr(self, setting_name)
             if isinstance(value, str):
-                setattr(self, setting_name, import_string(value))
+                self._pending_imports[setting_name] = value
+                delattr(self, setting_name)
+
+    def memoize(self, key, factory):
+        """
+        Return ``factory()``, computed once per ``key`` for this settings
+        instance, i.e. once per settings generation and tenant.
+        """
+        try:
+            return self._memoized[key]
+        except KeyError:
+            value = self._memoized[key] = factory()
+            return value
+
+    def for_tenant(self, tenant):
+        """
+        Return settings with ``TENANT_SETTINGS`` of ``tenant`` applied on top.
+
+        Instances are kept in a LRU cache of ``TENANT_SETTINGS_CACHE_SIZE``
+        entries, which is dropped together with these settings on reload.
+        """
+        with self._tenants_lock:
+            tenant_settings = self._tenants.get(tenant)
+            if tenant_settings is not None:
+                self._tenants.move_to_end(tenant)
+                return tenant_settings
+
+        if callable(self.TENANT_SETTINGS):
+            overlay = self.TENANT_SETTINGS(tenant)
+        else:
+            overlay = self.TENANT_SETTINGS.get(tenant)
+        tenant_settings = Settings(
+            self._default_settings,
+            self._overriden_settings,
+            overlay or {},
+            tenant=tenant,
+        )
+
+        with self._tenants_lock:
+            self._tenants[tenant] = tenant_settings
+            while len(self._tenants) > self.TENANT_SETTINGS_CACHE_SIZE:
+                self._tenants.popitem(last=False)
+        return tenant_settings
+
+    def __getattr__(self, name):
+        pending_imports = self.__dict__.get("_pending_imports", {})
+        try:
+            path = pending_imports[name]
+        except KeyError:
+            # another thread may have imported it since the lookup missed
+            try:
+                return self.__dict__[name]
+            except KeyError:
+                raise AttributeError(
+                    f"{self.__class__.__name__!r} object has no attribute {name!r}"
+                ) from None
+        value = import_string(path)
+        # set before it leaves the pending imports, so a concurrent lookup
+        # finds one or the other
+        setattr(self, name, value)
+        pending_imports.pop(name, None)
+        return value
+
+
+_tenant_settings = contextvars.ContextVar("djoser_tenant_settings", default=None)
 
 
 class LazySettings(LazyObject):
     def _setup(self, explicit_overriden_settings=None):
-        self._wrapped = Settings(default_settings, explicit_overriden_settings)
+        self._wrapped = Settings(get_default_settings(), explicit_overriden_settings)
+
+    def __getattr__(self, name):
+        tenant_settings = _tenant_settings.get()
+        if tenant_settings is not None:
+            return getattr(tenant_settings, name)
+        return super().__getattr__(name)
 
 
 settings = LazySettings()
 
 
+@contextmanager
+def tenant_settings(request):
+    """
+    Scope ``settings`` to the tenant that ``TENANT_RESOLVER`` returns for
+    ``request``. Without a resolver, or for a ``None`` tenant, the global
+    settings stay in use.
+    """
+    if _tenant_settings.get() is not None or settings.TENANT_RESOLVER is None:
+        yield
+        return
+
+    tenant = settings.TENANT_RESOLVER(request)
+    if tenant is None:
+        yield
+        return
+
+    token = _tenant_settings.set(settings.for_tenant(tenant))
+    try:
+        yield
+    finally:
+        _tenant_settings.reset(token)
+
+
+def bind_tenant_settings(iterable):
+    """
+    Iterate ``iterable`` with the tenant settings in use now, e.g. for the
+    content of a streaming response, consumed after the view has returned.
+    """
+    scoped = _tenant_settings.get()
+
+    def iterate(iterator):
+        while True:
+            token = _tenant_settings.set(scoped)
+            try:
+                item = next(iterator)
+            except StopIteration:
+                return
+            finally:
+                _tenant_settings.reset(token)
+            yield item
+
+    return iterate(iter(iterable))
+
+
 def reload_djoser_settings(*args, **kwargs):
     global settings
     setting, value = kwargs["setting"], kwargs["value"]
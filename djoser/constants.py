@@ -8,9 +8,27 @@ class Messages:
     )  # not in use since Django 1.10
     INVALID_TOKEN_ERROR = _("Invalid token for given user.")
     INVALID_UID_ERROR = _("Invalid user id or user doesn't exist.")
+    INVALID_OTP_CODE_ERROR = _("Invalid or expired code.")
     STALE_TOKEN_ERROR = _("Stale token for given user.")
     PASSWORD_MISMATCH_ERROR = _("The two password fields didn't match.")
     USERNAME_MISMATCH_ERROR = _("The two {0} fields didn't match.")
     INVALID_PASSWORD_ERROR = _("Invalid password.")
     EMAIL_NOT_FOUND = _("User with given email does not exist.")
     CANNOT_CREATE_USER_ERROR = _("Unable to create account.")
+    INVALID_FIELDS_ERROR = _("Unknown fields requested: {fields}.")
+    INVALID_EXPORT_FORMAT_ERROR = _('"{export_format}" is not a valid choice.')
+    BULK_CREATE_NOT_A_LIST_ERROR = _("Expected a list of users.")
+    DUPLICATE_IN_BATCH_ERROR = _("Duplicates an earlier user in this batch.")
+    BULK_ACTION_SCOPE_ERROR = _('Provide either "ids" or "all".')
+    IDEMPOTENCY_KEY_IN_USE_ERROR = _(
+        "A request with this Idempotency-Key is still being processed."
+    )
+    IDEMPOTENCY_KEY_REUSED_ERROR = _(
+        "This Idempotency-Key was already used with a different request."
+    )
+    BREACHED_PASSWORD_ERROR = _(
+        "This password has appeared in a data breach and can't be used."
+    )
+    BREACHED_PASSWORD_HELP_TEXT = _(
+        "Your password can't be one that has appeared in a data breach."
+    )
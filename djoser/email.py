@@ -1,7 +1,6 @@
-from django.contrib.auth.tokens import default_token_generator
 from django.contrib.sites.shortcuts import get_current_site
 
-from djoser import utils
+from djoser import tokens, utils
 from django.conf import settings as django_settings
 from djoser.conf import settings
 from django.core import mail
@@ -118,8 +117,10 @@ class ActivationEmail(BaseDjoserEmail):
 
         user = context.get("user")
         context["uid"] = utils.encode_uid(user.pk)
-        context["token"] = default_token_generator.make_token(user)
+        context["token"] = tokens.get_token_generator("activation").make_token(user)
         context["url"] = settings.ACTIVATION_URL.format(**context)
+        if settings.OTP_CODES:
+            context["code"] = tokens.make_otp_code("activation", user)
         return context
 
 
@@ -136,8 +137,10 @@ class PasswordResetEmail(BaseDjoserEmail):
 
         user = context.get("user")
         context["uid"] = utils.encode_uid(user.pk)
-        context["token"] = default_token_generator.make_token(user)
+        context["token"] = tokens.get_token_generator("password_reset").make_token(user)
         context["url"] = settings.PASSWORD_RESET_CONFIRM_URL.format(**context)
+        if settings.OTP_CODES:
+            context["code"] = tokens.make_otp_code("password_reset", user)
         return context
 
 
@@ -157,6 +160,8 @@ class UsernameResetEmail(BaseDjoserEmail):
 
         user = context.get("user")
         context["uid"] = utils.encode_uid(user.pk)
-        context["token"] = default_token_generator.make_token(user)
+        context["token"] = tokens.get_token_generator("username_reset").make_token(user)
         context["url"] = settings.USERNAME_RESET_CONFIRM_URL.format(**context)
+        if settings.OTP_CODES:
+            context["code"] = tokens.make_otp_code("username_reset", user)
         return context
@@ -0,0 +1,110 @@
+from django.contrib.auth import get_user_model
+from django.db import connections
+from django.db.models import Q
+from django.db.models.functions import Collate, Lower
+from rest_framework import serializers
+from rest_framework.exceptions import ValidationError
+from rest_framework.filters import BaseFilterBackend
+
+from djoser.conf import settings
+
+
+def get_search_fields():
+    """Return the user fields ``UserSearchFilter`` matches prefixes against."""
+    User = get_user_model()
+    return list(dict.fromkeys([settings.LOGIN_FIELD, User.get_email_field_name()]))
+
+
+# vendors comparing the search expressions by code point, so that a prefix
+# is a range which an index on the expression serves
+RANGE_SEARCH_VENDORS = {"postgresql", "sqlite"}
+
+
+def get_search_expression(field_name, vendor):
+    """
+    Return the expression of ``field_name`` that ``UserSearchFilter`` matches
+    prefixes against on ``vendor``, which the search indexes are built on.
+    """
+    expression = Lower(field_name)
+    if vendor == "postgresql":
+        # collations such as en_US.UTF-8 ignore punctuation when sorting
+        return Collate(expression, "C")
+    return expression
+
+
+def prefix_successor(prefix):
+    """Return the smallest string greater than every string starting with
+    ``prefix``, or ``None`` if there is none."""
+    while prefix:
+        last = ord(prefix[-1])
+        if last < 0x10FFFF:
+            return prefix[:-1] + chr(last + 1)
+        prefix = prefix[:-1]
+    return None
+
+
+class UserSearchFilter(BaseFilterBackend):
+    """
+    Filter users by a case-insensitive prefix of the login and email fields
+    (``?search=``) and by ``?is_active=``.
+
+    Prefixes are matched as a range on ``Lower(field)``, collated as ``"C"`` on
+    PostgreSQL, so that a B-tree index on that expression can be used, see the
+    ``djoser.W001`` system check. Other databases may not sort by code point,
+    so only ``startswith`` is used there.
+    """
+
+    search_param = "search"
+    is_active_param = "is_active"
+
+    def filter_queryset(self, request, queryset, view):
+        prefix = request.query_params.get(self.search_param, "").strip().lower()
+        if prefix:
+            vendor = connections[queryset.db].vendor
+            ranged = vendor in RANGE_SEARCH_VENDORS
+            query = Q()
+            for field_name in get_search_fields():
+                alias = f"djoser_search_{field_name}"
+                expression = get_search_expression(field_name, vendor)
+                queryset = queryset.alias(**{alias: expression})
+                query |= self.prefix_query(alias, prefix, ranged)
+            queryset = queryset.filter(query)
+
+        is_active = request.query_params.get(self.is_active_param)
+        if is_active is not None:
+            try:
+                is_active = serializers.BooleanField().to_internal_value(is_active)
+            except ValidationError as e:
+                raise ValidationError({self.is_active_param: e.detail})
+            queryset = queryset.filter(is_active=is_active)
+        return queryset
+
+    def prefix_query(self, alias, prefix, ranged=True):
+        # startswith is exact under any collation, the range is what an index
+        # serves but only finds every match when strings sort by code point
+        query = Q(**{f"{alias}__startswith": prefix})
+        if not ranged:
+            return query
+        query &= Q(**{f"{alias}__gte": prefix})
+        successor = prefix_successor(prefix)
+        if successor is not None:
+            query &= Q(**{f"{alias}__lt": successor})
+        return query
+
+    def get_schema_operation_parameters(self, view):
+        return [
+            {
+                "name": self.search_param,
+                "required": False,
+                "in": "query",
+                "description": "Case-insensitive prefix of the login or email.",
+                "schema": {"type": "string"},
+            },
+            {
+                "name": self.is_active_param,
+                "required": False,
+                "in": "query",
+                "description": "Only active or only inactive users.",
+                "schema": {"type": "boolean"},
+            },
+        ]
@@ -0,0 +1,106 @@
+import contextlib
+import heapq
+import itertools
+import os
+import sys
+import tempfile
+
+from django.core.management.base import BaseCommand, CommandError
+
+from djoser.password_validation import (
+    breached_password_prefix,
+    write_breached_passwords_header,
+)
+
+
+class Command(BaseCommand):
+    help = (
+        "Build the breached passwords file read by "
+        "djoser.password_validation.BreachedPasswordValidator from a local "
+        "corpus."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "corpus", help="Corpus file, one entry per line, '-' reads standard input."
+        )
+        parser.add_argument("output", help="File to write.")
+        parser.add_argument(
+            "--format",
+            choices=["plain", "sha1"],
+            default="plain",
+            help=(
+                "'plain' for one password per line, 'sha1' for hex SHA-1 hashes "
+                "optionally followed by ':count', e.g. the Pwned Passwords dump."
+            ),
+        )
+        parser.add_argument(
+            "--prefix-bytes",
+            type=int,
+            default=8,
+            help="Bytes of each SHA-1 kept, fewer make a smaller file with more "
+            "false positives.",
+        )
+        parser.add_argument(
+            "--chunk-size",
+            type=int,
+            default=10_000_000,
+            help="Entries sorted in memory at once, larger corpora are merged "
+            "from temporary files.",
+        )
+
+    def handle(self, *args, **options):
+        prefix_size = options["prefix_bytes"]
+        if not 4 <= prefix_size <= 20:
+            raise CommandError("--prefix-bytes must be between 4 and 20.")
+        if options["chunk_size"] < 1:
+            raise CommandError("--chunk-size must be positive.")
+
+        with contextlib.ExitStack() as stack:
+            if options["corpus"] == "-":
+                corpus = sys.stdin.buffer
+            else:
+                corpus = stack.enter_context(open(options["corpus"], "rb"))
+            prefixes = self.read_prefixes(corpus, options["format"], prefix_size)
+            runs = []
+            while chunk := sorted(itertools.islice(prefixes, options["chunk_size"])):
+                run = stack.enter_context(tempfile.TemporaryFile())
+                run.write(b"".join(chunk))
+                run.seek(0)
+                runs.append(run)
+
+            output = options["output"]
+            count = 0
+            with open(output + ".tmp", "wb") as file:
+                write_breached_passwords_header(file, prefix_size)
+                previous = None
+                merged = heapq.merge(
+                    *(iter(lambda run=run: run.read(prefix_size), b"") for run in runs)
+                )
+                for prefix in merged:
+                    if prefix != previous:
+                        file.write(prefix)
+                        previous = prefix
+                        count += 1
+            os.replace(output + ".tmp", output)
+
+        self.stdout.write(
+            self.style.SUCCESS(f"Wrote {count} breached password prefixes to {output}.")
+        )
+
+    def read_prefixes(self, corpus, file_format, prefix_size):
+        # lines are hashed as read, passwords are compared as UTF-8
+        for line in corpus:
+            line = line.rstrip(b"\r\n")
+            if file_format == "plain":
+                if line:
+                    yield breached_password_prefix(line, prefix_size)
+                continue
+            digest = line.split(b":", 1)[0].strip().decode("ascii", "replace")
+            try:
+                prefix = bytes.fromhex(digest)[:prefix_size]
+            except ValueError:
+                prefix = b""
+            if len(digest) != 40 or len(prefix) != prefix_size:
+                raise CommandError(f"Not a SHA-1 hash: {line!r}")
+            yield prefix
@@ -0,0 +1,162 @@
+import concurrent.futures
+import contextlib
+import csv
+import itertools
+import json
+import os
+import sys
+import time
+
+from django.contrib.auth.hashers import identify_hasher
+from django.core.management.base import BaseCommand, CommandError
+from rest_framework import serializers
+
+from djoser import signals, utils
+from djoser.conf import settings
+
+
+class Command(BaseCommand):
+    help = (
+        "Import users from a CSV or NDJSON file, validating every record with "
+        "the user_create serializer."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "path", help="CSV or NDJSON file to import, '-' reads standard input."
+        )
+        parser.add_argument(
+            "--format",
+            choices=["csv", "ndjson"],
+            help="Format of the file, guessed from its extension by default.",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=1000,
+            help="Records validated and inserted per transaction.",
+        )
+        parser.add_argument(
+            "--workers",
+            type=int,
+            help="Password hashing processes, PASSWORD_HASHING_WORKERS by default.",
+        )
+        parser.add_argument(
+            "--prehashed",
+            action="store_true",
+            help="Passwords are already hashed, e.g. exported from another site.",
+        )
+        parser.add_argument(
+            "--offset",
+            type=int,
+            default=0,
+            help=(
+                "Skip this many records, not lines: blank lines and the CSV "
+                "header don't count. Takes the offset printed by an "
+                "interrupted import to resume it."
+            ),
+        )
+        parser.add_argument(
+            "--send-emails",
+            action="store_true",
+            help="Send the activation or confirmation e-mails /users/ would send.",
+        )
+
+    def handle(self, *args, **options):
+        if options["batch_size"] < 1:
+            raise CommandError("--batch-size must be positive.")
+
+        path = options["path"]
+        file_format = options["format"] or (
+            "csv" if path.endswith(".csv") else "ndjson"
+        )
+        serializer_class = self.get_serializer_class(options["prehashed"])
+        with contextlib.ExitStack() as stack:
+            if path == "-":
+                stream = sys.stdin
+            else:
+                stream = stack.enter_context(open(path, newline="", encoding="utf-8"))
+            executor = None
+            workers = options["workers"] or settings.PASSWORD_HASHING_WORKERS
+            workers = workers or os.cpu_count() or 1
+            if not options["prehashed"] and workers > 1:
+                executor = stack.enter_context(
+                    concurrent.futures.ProcessPoolExecutor(max_workers=workers)
+                )
+
+            records = itertools.islice(
+                enumerate(self.read_records(stream, file_format)),
+                options["offset"],
+                None,
+            )
+            self.import_records(records, serializer_class, executor, workers, options)
+
+    def get_serializer_class(self, prehashed):
+        serializer_class = settings.SERIALIZERS.user_create
+        if not prehashed:
+            return serializer_class
+
+        class PrehashedSerializer(serializer_class):
+            # password validators can't judge a hash
+            def validate(self, attrs):
+                self.validate_unique(attrs)
+                return attrs
+
+            def validate_password(self, value):
+                try:
+                    identify_hasher(value)
+                except ValueError as e:
+                    raise serializers.ValidationError(str(e)) from e
+                return value
+
+        return PrehashedSerializer
+
+    def read_records(self, stream, file_format):
+        if file_format == "csv":
+            yield from csv.DictReader(stream)
+            return
+        for line in stream:
+            if not line.strip():
+                continue
+            try:
+                yield json.loads(line)
+            except ValueError:
+                # reported by the serializer as invalid data
+                yield line
+
+    def import_records(self, records, serializer_class, executor, workers, options):
+        started = time.monotonic()
+        offset = options["offset"]
+        created_count = failed_count = 0
+        while batch := list(itertools.islice(records, options["batch_size"])):
+            errors = {}
+            valid = utils.validate_users(batch, errors, serializer_class)
+            users = utils.build_users(
+                valid, errors, options["prehashed"], executor, workers
+            )
+            created = utils.bulk_insert_users(users, errors, options["batch_size"])
+            for user in created:
+                signals.user_registered.send(
+                    sender=self.__class__, user=user, request=None
+                )
+                if options["send_emails"]:
+                    utils.send_registration_email(None, user)
+
+            for index in sorted(errors):
+                self.stderr.write(f"Record {index}: {json.dumps(errors[index])}")
+            offset = batch[-1][0] + 1
+            created_count += len(created)
+            failed_count += len(errors)
+            # the clock may not have advanced on a fast batch
+            elapsed = max(time.monotonic() - started, 1e-9)
+            self.stdout.write(
+                f"Offset {offset}: {created_count} created, {failed_count} failed, "
+                f"{(offset - options['offset']) / elapsed:.0f} rows/s"
+            )
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Imported {created_count} users, {failed_count} failed, "
+                f"in {time.monotonic() - started:.1f}s."
+            )
+        )
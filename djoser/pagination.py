@@ -0,0 +1,16 @@
+from rest_framework.pagination import CursorPagination
+
+from djoser.conf import LazySetting
+
+
+class UserCursorPagination(CursorPagination):
+    """
+    Cursor pagination over ``USER_ID_FIELD``.
+
+    Pages are fetched with an indexed range lookup instead of an ``OFFSET``
+    and no ``COUNT(*)`` query is run, so listing stays cheap on large user
+    tables. ``USER_ID_FIELD`` is unique, which keeps the ordering stable.
+    """
+
+    page_size = 100
+    ordering = LazySetting("USER_ID_FIELD")
@@ -0,0 +1,99 @@
+import bisect
+import hashlib
+import mmap
+
+from django.contrib.auth import password_validation
+from django.core.exceptions import ImproperlyConfigured, ValidationError
+
+from djoser.conf import settings
+
+BREACHED_PASSWORDS_MAGIC = b"DJBP\x01"
+BREACHED_PASSWORDS_HEADER_SIZE = 8
+
+
+def get_password_validators():
+    """
+    Return the ``AUTH_PASSWORD_VALIDATORS`` instances. Django creates them
+    once per process, until the setting changes.
+    """
+    return password_validation.get_default_password_validators()
+
+
+def preload_password_validators():
+    """
+    Create the password validators now rather than on the first password
+    validated, so word lists and breached password files are loaded before
+    a server forks its workers.
+    """
+    get_password_validators()
+
+
+def breached_password_prefix(password, prefix_size):
+    if isinstance(password, str):
+        password = password.encode()
+    return hashlib.sha1(password).digest()[:prefix_size]
+
+
+def write_breached_passwords_header(file, prefix_size):
+    header = BREACHED_PASSWORDS_MAGIC + bytes([prefix_size])
+    file.write(header.ljust(BREACHED_PASSWORDS_HEADER_SIZE, b"\0"))
+
+
+class _Records:
+    """Sequence of the fixed size records of a mapped file, for ``bisect``."""
+
+    def __init__(self, buffer, record_size, offset):
+        self.buffer = buffer
+        self.record_size = record_size
+        self.offset = offset
+        self.count = (len(buffer) - offset) // record_size
+
+    def __len__(self):
+        return self.count
+
+    def __getitem__(self, index):
+        start = self.offset + index * self.record_size
+        return self.buffer[start : start + self.record_size]
+
+
+class BreachedPasswordValidator:
+    """
+    Reject passwords found in a breach corpus, without network access.
+
+    ``path`` is a file written by the ``djoser_build_breached_passwords``
+    command: sorted SHA-1 prefixes of the breached passwords. It's memory
+    mapped, so worker processes share it, and searched in O(log n).
+    """
+
+    def __init__(self, path):
+        try:
+            with open(path, "rb") as file:
+                self._buffer = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        except (OSError, ValueError) as e:
+            raise ImproperlyConfigured(
+                f"Can't open the breached passwords file {path!r}: {e}"
+            ) from e
+        header = self._buffer[:BREACHED_PASSWORDS_HEADER_SIZE]
+        if not header.startswith(BREACHED_PASSWORDS_MAGIC):
+            raise ImproperlyConfigured(
+                f"{path!r} isn't a file built by djoser_build_breached_passwords."
+            )
+        self.prefix_size = header[len(BREACHED_PASSWORDS_MAGIC)]
+        self._records = _Records(
+            self._buffer, self.prefix_size, BREACHED_PASSWORDS_HEADER_SIZE
+        )
+
+    def __contains__(self, password):
+        prefix = breached_password_prefix(password, self.prefix_size)
+        index = bisect.bisect_left(self._records, prefix)
+        return index < len(self._records) and self._records[index] == prefix
+
+    def validate(self, password, user=None):
+        if password in self:
+            raise ValidationError(
+                settings.CONSTANTS.messages.BREACHED_PASSWORD_ERROR,
+                code="password_breached",
+            )
+
+    def get_help_text(self):
+        return settings.CONSTANTS.messages.BREACHED_PASSWORD_HELP_TEXT
@@ -1,19 +1,118 @@
+import copy
+from collections.abc import Mapping
+
 from django.contrib.auth import authenticate, get_user_model
+from django.contrib.auth.base_user import BaseUserManager
 from django.contrib.auth.password_validation import validate_password
 from django.core import exceptions as django_exceptions
-from django.db import IntegrityError, transaction
+from django.db import IntegrityError
+from django.db.models import Q, QuerySet
 from rest_framework import exceptions, serializers
 from rest_framework.exceptions import ValidationError
+from rest_framework.fields import SkipField, empty
 from rest_framework.settings import api_settings
+from rest_framework.utils import model_meta
+from rest_framework.utils.field_mapping import get_unique_error_message
+from rest_framework.validators import UniqueValidator
 
-from djoser import utils
+from djoser import tokens, utils
 from djoser.compat import get_user_email, get_user_email_field_name
-from djoser.conf import settings
+from djoser.conf import LazyMessages, LazySetting, settings
 
 User = get_user_model()
 
 
-class UserSerializer(serializers.ModelSerializer):
+class CachedFieldsMixin:
+    """
+    Build the fields once per serializer class and settings generation and
+    give every instance a copy, sparing the ``ModelSerializer`` introspection
+    and settings lookups per request. Fields depending on settings are added
+    or renamed in ``build_fields`` rather than in ``__init__``.
+    """
+
+    def get_fields(self):
+        meta = getattr(self, "Meta", None)
+        meta_fields = getattr(meta, "fields", None)
+        # Meta may be changed after the class is created, e.g. in tests
+        key = (
+            "serializer_fields",
+            type(self),
+            User,
+            getattr(meta, "model", None),
+            tuple(meta_fields) if isinstance(meta_fields, list) else meta_fields,
+        )
+        fields = settings.memoize(
+            key, lambda: self.build_fields(super(CachedFieldsMixin, self).get_fields())
+        )
+        return copy.deepcopy(fields)
+
+    def build_fields(self, fields):
+        """
+        Return ``fields``, the serializer's declared and model fields, with the
+        settings-dependent ones added. The result is shared by instances.
+        """
+        return fields
+
+
+class StagedValidationMixin:
+    """
+    Validate in order of cost and stop at the first failing stage.
+
+    ``pre_validate`` runs structural and equality checks on the parsed input,
+    then fields are validated, those listed in ``expensive_fields`` (e.g. ones
+    checking a password hash) only once the others passed, and ``validate``
+    runs the password validators last.
+    """
+
+    expensive_fields = ()
+
+    _validating = None
+
+    def run_validation(self, data=empty):
+        if isinstance(data, Mapping):
+            try:
+                self.pre_validate(data)
+            except (ValidationError, django_exceptions.ValidationError) as exc:
+                raise ValidationError(detail=serializers.as_serializer_error(exc))
+        return super().run_validation(data)
+
+    def pre_validate(self, data):
+        pass
+
+    def get_parsed_value(self, data, field_name):
+        """
+        Return the field's value in ``data`` without running its validators,
+        or ``None`` if it's missing or invalid, which its validation reports.
+        """
+        field = self.fields[field_name]
+        try:
+            is_empty_value, value = field.validate_empty_values(field.get_value(data))
+            return value if is_empty_value else field.to_internal_value(value)
+        except (ValidationError, django_exceptions.ValidationError, SkipField):
+            return None
+
+    def to_internal_value(self, data):
+        if not any(name in self.fields for name in self.expensive_fields):
+            return super().to_internal_value(data)
+        try:
+            self._validating = "cheap"
+            attrs = super().to_internal_value(data)
+            self._validating = "expensive"
+            attrs.update(super().to_internal_value(data))
+        finally:
+            self._validating = None
+        return attrs
+
+    @property
+    def _writable_fields(self):
+        for field in super()._writable_fields:
+            if self._validating is None or self._validating == (
+                "expensive" if field.field_name in self.expensive_fields else "cheap"
+            ):
+                yield field
+
+
+class UserSerializer(CachedFieldsMixin, serializers.ModelSerializer):
     class Meta:
         model = User
         fields = tuple(User.REQUIRED_FIELDS) + (
@@ -25,13 +124,31 @@ class UserSerializer(serializers.ModelSerializer):
     def update(self, instance, validated_data):
         email_field = get_user_email_field_name(User)
         instance.email_changed = False
+        update_fields = []
         if settings.SEND_ACTIVATION_EMAIL and email_field in validated_data:
             instance_email = get_user_email(instance)
             if instance_email != validated_data[email_field]:
                 instance.is_active = False
                 instance.email_changed = True
-                instance.save(update_fields=["is_active"])
-        return super().update(instance, validated_data)
+                update_fields.append("is_active")
+
+        # a single UPDATE of the columns whose value changes, unlike
+        # ModelSerializer.update which saves every column
+        relations = model_meta.get_field_info(instance).relations
+        many_to_many = {}
+        for attr, value in validated_data.items():
+            if attr in relations and relations[attr].to_many:
+                many_to_many[attr] = value
+            elif getattr(instance, attr) != value:
+                setattr(instance, attr, value)
+                update_fields.append(attr)
+        if update_fields:
+            instance.save(
+                update_fields=utils.get_update_fields(instance, update_fields)
+            )
+        for attr, value in many_to_many.items():
+            getattr(instance, attr).set(value)
+        return instance
 
 
 class UserCreateMixin:
@@ -44,20 +161,20 @@ class UserCreateMixin:
         return user
 
     def perform_create(self, validated_data):
-        with transaction.atomic():
-            user = User.objects.create_user(**validated_data)
-            if settings.SEND_ACTIVATION_EMAIL:
-                user.is_active = False
-                user.save(update_fields=["is_active"])
-        return user
+        if settings.SEND_ACTIVATION_EMAIL:
+            validated_data = {**validated_data, "is_active": False}
+        return User.objects.create_user(**validated_data)
 
 
-class UserCreateSerializer(UserCreateMixin, serializers.ModelSerializer):
+class UserCreateSerializer(
+    UserCreateMixin,
+    CachedFieldsMixin,
+    StagedValidationMixin,
+    serializers.ModelSerializer,
+):
     password = serializers.CharField(style={"input_type": "password"}, write_only=True)
 
-    default_error_messages = {
-        "cannot_create_user": settings.CONSTANTS.messages.CANNOT_CREATE_USER_ERROR
-    }
+    default_error_messages = LazyMessages(cannot_create_user="CANNOT_CREATE_USER_ERROR")
 
     class Meta:
         model = User
@@ -67,7 +184,73 @@ class UserCreateSerializer(UserCreateMixin, serializers.ModelSerializer):
             "password",
         )
 
+    @classmethod
+    def get_unique_fields(cls):
+        """
+        Return the unique model fields among the login, username and e-mail
+        fields, which ``validate_unique`` checks.
+        """
+        names = {
+            User.USERNAME_FIELD,
+            settings.LOGIN_FIELD,
+            get_user_email_field_name(User),
+        }
+        return [
+            field for field in User._meta.fields if field.unique and field.name in names
+        ]
+
+    def build_standard_field(self, field_name, model_field):
+        field_class, field_kwargs = super().build_standard_field(
+            field_name, model_field
+        )
+        if model_field in self.get_unique_fields():
+            # replaced by the single query of validate_unique
+            field_kwargs["validators"] = [
+                validator
+                for validator in field_kwargs.get("validators", [])
+                # validators of conditional constraints get a filtered queryset
+                if not isinstance(validator, UniqueValidator)
+                or isinstance(validator.queryset, QuerySet)
+            ]
+        return field_class, field_kwargs
+
+    def validate_unique(self, attrs):
+        """
+        Reject values of the unique fields that are already taken, as given
+        and as ``create_user`` normalizes them, with one indexed query run
+        before the password is validated or hashed. ``create`` still handles
+        the ``IntegrityError`` of a concurrent signup.
+        """
+        email_field = get_user_email_field_name(User)
+        candidates = {}
+        for field in self.get_unique_fields():
+            value = attrs.get(field.name)
+            if value is None:
+                continue
+            if field.name == email_field:
+                normalized = BaseUserManager.normalize_email(value)
+            elif field.name == User.USERNAME_FIELD:
+                normalized = User.normalize_username(value)
+            else:
+                normalized = value
+            candidates[field] = {value, normalized}
+        if not candidates:
+            return
+
+        lookups = Q()
+        for field, values in candidates.items():
+            lookups |= Q(**{f"{field.name}__in": values})
+        names = [field.name for field in candidates]
+        errors = {}
+        for row in User._default_manager.filter(lookups).values_list(*names):
+            for field, value in zip(candidates, row):
+                if value in candidates[field]:
+                    errors[field.name] = [get_unique_error_message(field)]
+        if errors:
+            raise ValidationError(errors, code="unique")
+
     def validate(self, attrs):
+        self.validate_unique(attrs)
         user = User(**attrs)
         password = attrs.get("password")
 
@@ -83,37 +266,41 @@ class UserCreateSerializer(UserCreateMixin, serializers.ModelSerializer):
 
 
 class UserCreatePasswordRetypeSerializer(UserCreateSerializer):
-    default_error_messages = {
-        "password_mismatch": settings.CONSTANTS.messages.PASSWORD_MISMATCH_ERROR
-    }
-
-    def __init__(self, *args, **kwargs):
-        super().__init__(*args, **kwargs)
-        self.fields["re_password"] = serializers.CharField(
-            style={"input_type": "password"}
-        )
+    default_error_messages = LazyMessages(password_mismatch="PASSWORD_MISMATCH_ERROR")
+
+    def build_fields(self, fields):
+        fields = super().build_fields(fields)
+        fields["re_password"] = serializers.CharField(style={"input_type": "password"})
+        return fields
+
+    def pre_validate(self, data):
+        super().pre_validate(data)
+        password = self.get_parsed_value(data, "password")
+        re_password = self.get_parsed_value(data, "re_password")
+        if None not in (password, re_password) and password != re_password:
+            self.fail("password_mismatch")
 
     def validate(self, attrs):
         self.fields.pop("re_password", None)
-        re_password = attrs.pop("re_password")
-        attrs = super().validate(attrs)
-        if attrs["password"] == re_password:
-            return attrs
-        else:
-            self.fail("password_mismatch")
+        attrs.pop("re_password")
+        return super().validate(attrs)
 
 
-class TokenCreateSerializer(serializers.Serializer):
+class TokenCreateSerializer(CachedFieldsMixin, serializers.Serializer):
     password = serializers.CharField(required=False, style={"input_type": "password"})
 
-    default_error_messages = {
-        "invalid_credentials": settings.CONSTANTS.messages.INVALID_CREDENTIALS_ERROR,
-    }
+    default_error_messages = LazyMessages(
+        invalid_credentials="INVALID_CREDENTIALS_ERROR"
+    )
 
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
         self.user = None
-        self.fields[settings.LOGIN_FIELD] = serializers.CharField(required=False)
+
+    def build_fields(self, fields):
+        fields = super().build_fields(fields)
+        fields[settings.LOGIN_FIELD] = serializers.CharField(required=False)
+        return fields
 
     def validate(self, attrs):
         password = attrs.get("password")
@@ -147,57 +334,146 @@ class UserFunctionsMixin:
             self.fail("email_not_found")
 
 
-class SendEmailResetSerializer(serializers.Serializer, UserFunctionsMixin):
-    default_error_messages = {
-        "email_not_found": settings.CONSTANTS.messages.EMAIL_NOT_FOUND
-    }
+class SendEmailResetSerializer(
+    CachedFieldsMixin, serializers.Serializer, UserFunctionsMixin
+):
+    default_error_messages = LazyMessages(email_not_found="EMAIL_NOT_FOUND")
 
-    def __init__(self, *args, **kwargs):
-        super().__init__(*args, **kwargs)
+    @property
+    def email_field(self):
+        return get_user_email_field_name(User)
 
-        self.email_field = get_user_email_field_name(User)
-        self.fields[self.email_field] = serializers.EmailField()
+    def build_fields(self, fields):
+        fields = super().build_fields(fields)
+        fields[self.email_field] = serializers.EmailField()
+        return fields
 
 
-class UidAndTokenSerializer(serializers.Serializer):
+class UidAndTokenSerializer(
+    CachedFieldsMixin, StagedValidationMixin, serializers.Serializer
+):
+    """
+    Check the user's uid and token, or e-mail and code with ``OTP_CODES``,
+    before the other fields and the password validators. One-time tokens and
+    codes are only used up once everything else passed.
+    """
+
     uid = serializers.CharField()
     token = serializers.CharField()
 
-    default_error_messages = {
-        "invalid_token": settings.CONSTANTS.messages.INVALID_TOKEN_ERROR,
-        "invalid_uid": settings.CONSTANTS.messages.INVALID_UID_ERROR,
-    }
+    default_error_messages = LazyMessages(
+        invalid_token="INVALID_TOKEN_ERROR",
+        invalid_uid="INVALID_UID_ERROR",
+        invalid_code="INVALID_OTP_CODE_ERROR",
+    )
+
+    @property
+    def email_field(self):
+        return get_user_email_field_name(User)
+
+    def build_fields(self, fields):
+        fields = super().build_fields(fields)
+        if settings.OTP_CODES:
+            # either uid and token or e-mail and code
+            fields["uid"] = serializers.CharField(required=False)
+            fields["token"] = serializers.CharField(required=False)
+            fields[self.email_field] = serializers.EmailField(required=False)
+            fields["code"] = serializers.CharField(required=False)
+        return fields
+
+    def pre_validate(self, data):
+        super().pre_validate(data)
+        code = self.get_parsed_value(data, "code") if "code" in self.fields else None
+        if code is not None:
+            email = self.get_parsed_value(data, self.email_field)
+            if email is not None:
+                self.check_code(email, code)
+        # missing fields are reported by their validation, or validate with
+        # OTP_CODES; uid and token aren't fields of model serializers otherwise
+        elif all(name in data or name not in self.fields for name in ("uid", "token")):
+            self.check_uid_and_token(data.get("uid", ""), data.get("token", ""))
 
     def validate(self, attrs):
+        code = attrs.get("code")
+        required = [self.email_field] if code is not None else ["uid", "token"]
+        missing = [
+            name for name in required if name in self.fields and name not in attrs
+        ]
+        if missing:
+            raise ValidationError(
+                {
+                    name: [self.fields[name].error_messages["required"]]
+                    for name in missing
+                },
+                code="required",
+            )
+
         validated_data = super().validate(attrs)
+        if code is not None:
+            email = attrs[self.email_field]
+            if not tokens.use_otp_code(self.get_token_flow(), email, code):
+                raise self.field_error("code", "invalid_code")
+            return validated_data
+
+        token_generator = self.get_token_generator()
+        if isinstance(
+            token_generator, tokens.OneTimeTokenGenerator
+        ) and not token_generator.consume_token(
+            self.user.pk, self.initial_data.get("token", "")
+        ):
+            raise self.field_error("token", "invalid_token")
+        return validated_data
+
+    def check_uid_and_token(self, uid, token):
+        token_generator = self.get_token_generator()
 
         # uid validation have to be here, because validate_<field_name>
         # doesn't work with modelserializer
         try:
-            uid = utils.decode_uid(self.initial_data.get("uid", ""))
+            uid = utils.decode_uid(uid)
+        except (ValueError, TypeError, OverflowError):
+            raise self.field_error("uid", "invalid_uid")
+
+        # one-time tokens are looked up before loading the user
+        one_time = isinstance(token_generator, tokens.OneTimeTokenGenerator)
+        if one_time and not token_generator.has_token(uid, token):
+            raise self.field_error("token", "invalid_token")
+
+        try:
             self.user = User.objects.get(pk=uid)
         except (User.DoesNotExist, ValueError, TypeError, OverflowError):
-            key_error = "invalid_uid"
-            raise ValidationError(
-                {"uid": [self.error_messages[key_error]]}, code=key_error
-            )
+            raise self.field_error("uid", "invalid_uid")
+
+        if not (one_time or token_generator.check_token(self.user, token)):
+            raise self.field_error("token", "invalid_token")
+
+    def check_code(self, email, code):
+        # the code is looked up before loading the user
+        uid = tokens.check_otp_code(self.get_token_flow(), email, code)
+        if uid is None:
+            raise self.field_error("code", "invalid_code")
+        try:
+            self.user = User.objects.get(pk=uid)
+        except User.DoesNotExist:
+            raise self.field_error("code", "invalid_code")
 
-        is_token_valid = self.context["view"].token_generator.check_token(
-            self.user, self.initial_data.get("token", "")
+    def get_token_flow(self):
+        return self.context["view"].get_token_flow()
+
+    def get_token_generator(self):
+        view = self.context["view"]
+        if hasattr(view, "get_token_generator"):
+            return view.get_token_generator()
+        return view.token_generator
+
+    def field_error(self, field_name, key_error):
+        return ValidationError(
+            {field_name: [self.error_messages[key_error]]}, code=key_error
         )
-        if is_token_valid:
-            return validated_data
-        else:
-            key_error = "invalid_token"
-            raise ValidationError(
-                {"token": [self.error_messages[key_error]]}, code=key_error
-            )
 
 
 class ActivationSerializer(UidAndTokenSerializer):
-    default_error_messages = {
-        "stale_token": settings.CONSTANTS.messages.STALE_TOKEN_ERROR
-    }
+    default_error_messages = LazyMessages(stale_token="STALE_TOKEN_ERROR")
 
     def validate(self, attrs):
         attrs = super().validate(attrs)
@@ -206,7 +482,7 @@ class ActivationSerializer(UidAndTokenSerializer):
         raise exceptions.PermissionDenied(self.error_messages["stale_token"])
 
 
-class PasswordSerializer(serializers.Serializer):
+class PasswordSerializer(StagedValidationMixin, serializers.Serializer):
     new_password = serializers.CharField(style={"input_type": "password"})
 
     def validate(self, attrs):
@@ -224,24 +500,25 @@ class PasswordSerializer(serializers.Serializer):
 class PasswordRetypeSerializer(PasswordSerializer):
     re_new_password = serializers.CharField(style={"input_type": "password"})
 
-    default_error_messages = {
-        "password_mismatch": settings.CONSTANTS.messages.PASSWORD_MISMATCH_ERROR
-    }
+    default_error_messages = LazyMessages(password_mismatch="PASSWORD_MISMATCH_ERROR")
 
-    def validate(self, attrs):
-        attrs = super().validate(attrs)
-        if attrs["new_password"] == attrs["re_new_password"]:
-            return attrs
-        else:
+    def pre_validate(self, data):
+        super().pre_validate(data)
+        new_password = self.get_parsed_value(data, "new_password")
+        re_new_password = self.get_parsed_value(data, "re_new_password")
+        if None not in (new_password, re_new_password) and (
+            new_password != re_new_password
+        ):
             self.fail("password_mismatch")
 
 
-class CurrentPasswordSerializer(serializers.Serializer):
+class CurrentPasswordSerializer(StagedValidationMixin, serializers.Serializer):
     current_password = serializers.CharField(style={"input_type": "password"})
 
-    default_error_messages = {
-        "invalid_password": settings.CONSTANTS.messages.INVALID_PASSWORD_ERROR
-    }
+    # checking it hashes the password
+    expensive_fields = ("current_password",)
+
+    default_error_messages = LazyMessages(invalid_password="INVALID_PASSWORD_ERROR")
 
     def validate_current_password(self, value):
         is_password_valid = self.context["request"].user.check_password(value)
@@ -251,19 +528,32 @@ class CurrentPasswordSerializer(serializers.Serializer):
             self.fail("invalid_password")
 
 
-class UsernameSerializer(serializers.ModelSerializer):
+class UsernameSerializer(
+    CachedFieldsMixin, StagedValidationMixin, serializers.ModelSerializer
+):
+    username_field = LazySetting("LOGIN_FIELD")
+
     class Meta:
         model = User
         fields = (settings.LOGIN_FIELD,)
 
-    def __init__(self, *args, **kwargs):
-        super().__init__(*args, **kwargs)
-        self.username_field = settings.LOGIN_FIELD
-        self._default_username_field = User.USERNAME_FIELD
-        self.fields[f"new_{self.username_field}"] = self.fields.pop(self.username_field)
+    def get_field_names(self, declared_fields, info):
+        # the login field is accepted as new_<login field>
+        return [
+            f"new_{name}" if name == self.username_field else name
+            for name in super().get_field_names(declared_fields, info)
+        ]
+
+    def get_extra_kwargs(self):
+        extra_kwargs = super().get_extra_kwargs()
+        extra_kwargs[f"new_{self.username_field}"] = {
+            **extra_kwargs.get(self.username_field, {}),
+            "source": self.username_field,
+        }
+        return extra_kwargs
 
     def save(self, **kwargs):
-        if self.username_field != self._default_username_field:
+        if self.username_field != User.USERNAME_FIELD:
             kwargs[User.USERNAME_FIELD] = self.validated_data.get(
                 f"new_{self.username_field}"
             )
@@ -271,30 +561,31 @@ class UsernameSerializer(serializers.ModelSerializer):
 
 
 class UsernameRetypeSerializer(UsernameSerializer):
-    default_error_messages = {
-        "username_mismatch": settings.CONSTANTS.messages.USERNAME_MISMATCH_ERROR.format(
-            settings.LOGIN_FIELD
-        )
-    }
-
-    def __init__(self, *args, **kwargs):
-        super().__init__(*args, **kwargs)
-        self.fields["re_new_" + settings.LOGIN_FIELD] = serializers.CharField()
-
-    def validate(self, attrs):
-        attrs = super().validate(attrs)
-        new_username = attrs[settings.LOGIN_FIELD]
-        if new_username != attrs[f"re_new_{settings.LOGIN_FIELD}"]:
-            self.fail("username_mismatch")
-        else:
-            return attrs
+    default_error_messages = LazyMessages(username_mismatch="USERNAME_MISMATCH_ERROR")
+
+    def build_fields(self, fields):
+        fields = super().build_fields(fields)
+        fields["re_new_" + settings.LOGIN_FIELD] = serializers.CharField()
+        return fields
+
+    def pre_validate(self, data):
+        super().pre_validate(data)
+        new_username = self.get_parsed_value(data, f"new_{settings.LOGIN_FIELD}")
+        re_new_username = self.get_parsed_value(data, f"re_new_{settings.LOGIN_FIELD}")
+        if None not in (new_username, re_new_username) and (
+            new_username != re_new_username
+        ):
+            message = self.error_messages["username_mismatch"]
+            raise ValidationError(
+                message.format(settings.LOGIN_FIELD), code="username_mismatch"
+            )
 
 
-class TokenSerializer(serializers.ModelSerializer):
+class TokenSerializer(CachedFieldsMixin, serializers.ModelSerializer):
     auth_token = serializers.CharField(source="key")
 
     class Meta:
-        model = settings.TOKEN_MODEL
+        model = LazySetting("TOKEN_MODEL")
         fields = ("auth_token",)
 
 
@@ -330,6 +621,27 @@ class UserDeleteSerializer(CurrentPasswordSerializer):
     pass
 
 
+class UserBulkActionSerializer(serializers.Serializer):
+    ids = serializers.ListField(
+        child=serializers.CharField(), required=False, allow_empty=False
+    )
+    all = serializers.BooleanField(default=False)
+
+    default_error_messages = LazyMessages(scope="BULK_ACTION_SCOPE_ERROR")
+
+    def validate_ids(self, value):
+        model_field = User._meta.get_field(settings.USER_ID_FIELD)
+        try:
+            return [model_field.to_python(user_id) for user_id in value]
+        except django_exceptions.ValidationError as e:
+            raise serializers.ValidationError(list(e.messages))
+
+    def validate(self, attrs):
+        if bool(attrs.get("ids")) == attrs["all"]:
+            self.fail("scope")
+        return attrs
+
+
 class SetUsernameSerializer(UsernameSerializer, CurrentPasswordSerializer):
     class Meta:
         model = User
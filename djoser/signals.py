@@ -8,3 +8,9 @@ user_activated = Signal()
 
 # User has been updated. Args: user, request.
 user_updated = Signal()
+
+# Staff deactivated users in bulk. Args: user_ids, request.
+users_deactivated = Signal()
+
+# Staff deleted users in bulk. Args: user_ids, request.
+users_deleted = Signal()
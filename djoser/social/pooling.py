@@ -0,0 +1,88 @@
+import types
+from http.cookiejar import DefaultCookiePolicy
+
+import requests
+from requests.adapters import HTTPAdapter
+from social_core.exceptions import AuthConnectionError
+from social_core.utils import user_agent
+
+from djoser.conf import settings
+
+
+def get_session(ssl_protocol=None):
+    """
+    Return the ``requests.Session`` shared by the social backends, keeping
+    ``SOCIAL_AUTH_HTTP_POOL_SIZE`` connections alive per provider host. It's
+    created once per settings reload, and per backend ``SSL_PROTOCOL``.
+    """
+    return settings.memoize(
+        ("social_http_session", ssl_protocol), lambda: _build_session(ssl_protocol)
+    )
+
+
+class _SSLProtocolAdapter(HTTPAdapter):
+    # what the SSLHttpAdapter of older social-core versions does for
+    # SSL_PROTOCOL, keeping its connections alive
+    def __init__(self, ssl_protocol, **kwargs):
+        self.ssl_protocol = ssl_protocol
+        super().__init__(**kwargs)
+
+    def init_poolmanager(self, *args, **kwargs):
+        kwargs["ssl_version"] = self.ssl_protocol
+        super().init_poolmanager(*args, **kwargs)
+
+
+def _build_session(ssl_protocol):
+    session = requests.Session()
+    # the session is shared by all users, never keep provider cookies
+    session.cookies.set_policy(DefaultCookiePolicy(allowed_domains=[]))
+    pool_size = settings.SOCIAL_AUTH_HTTP_POOL_SIZE
+    adapter = HTTPAdapter(pool_maxsize=pool_size)
+    session.mount("http://", adapter)
+    if ssl_protocol:
+        adapter = _SSLProtocolAdapter(ssl_protocol, pool_maxsize=pool_size)
+    session.mount("https://", adapter)
+    return session
+
+
+def request(backend, url, method="GET", *, headers=None, timeout=None, **kwargs):
+    """
+    ``BaseAuth.request`` sending through the pooled session. Unless a
+    ``timeout`` is given, the backend's ``REQUESTS_TIMEOUT`` or
+    ``URLOPEN_TIMEOUT`` setting is used, and otherwise the
+    ``SOCIAL_AUTH_HTTP_CONNECT_TIMEOUT`` and ``SOCIAL_AUTH_HTTP_READ_TIMEOUT``.
+    HTTPS connections use the backend's ``SSL_PROTOCOL`` setting if any.
+    """
+    headers = {} if headers is None else dict(headers)
+    if backend.SEND_USER_AGENT and "User-Agent" not in headers:
+        headers["User-Agent"] = backend.setting("USER_AGENT") or user_agent()
+    if timeout is None:
+        timeout = (
+            backend.setting("REQUESTS_TIMEOUT")
+            or backend.setting("URLOPEN_TIMEOUT")
+            or (
+                settings.SOCIAL_AUTH_HTTP_CONNECT_TIMEOUT,
+                settings.SOCIAL_AUTH_HTTP_READ_TIMEOUT,
+            )
+        )
+
+    try:
+        response = get_session(backend.setting("SSL_PROTOCOL")).request(
+            method,
+            url,
+            headers=headers,
+            timeout=timeout,
+            proxies=backend.setting("PROXIES"),
+            verify=backend.setting("VERIFY_SSL", True),
+            **kwargs,
+        )
+    except requests.ConnectionError as err:
+        raise AuthConnectionError(backend, str(err)) from err
+    response.raise_for_status()
+    return response
+
+
+def use_pooled_session(backend):
+    """Make the HTTP requests of ``backend`` go through ``get_session()``."""
+    backend.request = types.MethodType(request, backend)
+    return backend
@@ -3,6 +3,7 @@ from social_core import exceptions
 from social_django.utils import load_backend, load_strategy
 
 from djoser.conf import settings
+from djoser.social import pooling
 
 
 class ProviderAuthSerializer(serializers.Serializer):
@@ -17,14 +18,9 @@ class ProviderAuthSerializer(serializers.Serializer):
 
     def validate(self, attrs):
         request = self.context["request"]
+        backend = self.get_backend()
         if "state" in request.GET:
-            self._validate_state(request.GET["state"])
-
-        strategy = load_strategy(request)
-        redirect_uri = strategy.session_get("redirect_uri")
-
-        backend_name = self.context["view"].kwargs["provider"]
-        backend = load_backend(strategy, backend_name, redirect_uri=redirect_uri)
+            self._validate_state(request.GET["state"], backend)
 
         try:
             user = backend.auth_complete()
@@ -36,16 +32,23 @@ class ProviderAuthSerializer(serializers.Serializer):
             )
         return {"user": user}
 
-    def _validate_state(self, value):
-        request = self.context["request"]
-        strategy = load_strategy(request)
+    def get_backend(self):
+        """
+        Load the strategy and the backend of the provider, with the
+        ``redirect_uri`` stored in the session by ``ProviderAuthView.get``.
+        """
+        strategy = load_strategy(self.context["request"])
         redirect_uri = strategy.session_get("redirect_uri")
 
         backend_name = self.context["view"].kwargs["provider"]
         backend = load_backend(strategy, backend_name, redirect_uri=redirect_uri)
+        if settings.SOCIAL_AUTH_HTTP_POOLING:
+            pooling.use_pooled_session(backend)
+        return backend
 
+    def _validate_state(self, value, backend):
         try:
-            backend.validate_state()
+            state = backend.validate_state()
         except exceptions.AuthMissingParameter:
             raise serializers.ValidationError(
                 "State could not be found in request data."
@@ -57,4 +60,7 @@ class ProviderAuthSerializer(serializers.Serializer):
         except exceptions.AuthStateForbidden:
             raise serializers.ValidationError("Invalid state has been provided.")
 
+        if state is not None:
+            # auth_complete validates the state again, spare it the session read
+            backend.get_session_state = lambda: state
         return value
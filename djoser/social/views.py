@@ -3,12 +3,14 @@ from rest_framework.response import Response
 from social_django.utils import load_backend, load_strategy
 from social_core.exceptions import MissingBackend
 
-from djoser.conf import settings
+from djoser.conf import LazySetting, settings
+from djoser.social import pooling
+from djoser.utils import TenantSettingsMixin
 
 
-class ProviderAuthView(generics.CreateAPIView):
+class ProviderAuthView(TenantSettingsMixin, generics.CreateAPIView):
     permission_classes = [permissions.AllowAny]
-    serializer_class = settings.SERIALIZERS.provider_auth
+    serializer_class = LazySetting("SERIALIZERS.provider_auth")
 
     def get(self, request, *args, **kwargs):
         redirect_uri = request.GET.get("redirect_uri")
@@ -29,5 +31,7 @@ class ProviderAuthView(generics.CreateAPIView):
                 status=status.HTTP_404_NOT_FOUND,
             )
 
+        if settings.SOCIAL_AUTH_HTTP_POOLING:
+            pooling.use_pooled_session(backend)
         authorization_url = backend.auth_url()
         return Response(data={"authorization_url": authorization_url})
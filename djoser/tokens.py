@@ -0,0 +1,214 @@
+import hashlib
+import secrets
+
+import django
+from django.contrib.auth.tokens import PasswordResetTokenGenerator
+from django.core.cache import caches
+from django.core.exceptions import ImproperlyConfigured
+from django.utils.crypto import constant_time_compare, salted_hmac
+from django.utils.http import base36_to_int
+from django.utils.module_loading import import_string
+
+from djoser.compat import get_user_email
+from djoser.conf import settings
+
+
+class TokenGenerator(PasswordResetTokenGenerator):
+    """
+    Django's HMAC token generator with its own ``secret``, ``key_salt``,
+    ``algorithm`` and ``timeout`` in seconds, ``PASSWORD_RESET_TIMEOUT`` by
+    default, for ``TOKEN_GENERATORS``.
+    """
+
+    def __init__(self, secret=None, key_salt=None, algorithm=None, timeout=None):
+        super().__init__()
+        if secret is not None:
+            self.secret = secret
+        if key_salt is not None:
+            self.key_salt = key_salt
+        if algorithm is not None:
+            self.algorithm = algorithm
+        self.timeout = timeout
+
+    def check_token(self, user, token):
+        if self.timeout is None:
+            return super().check_token(user, token)
+        if not (user and token):
+            return False
+        try:
+            ts_b36, _ = token.split("-")
+            ts = base36_to_int(ts_b36)
+        except ValueError:
+            return False
+        if self._num_seconds(self._now()) - ts > self.timeout:
+            return False
+        return any(
+            constant_time_compare(expected, token)
+            for expected in self._make_tokens_with_timestamp(user, ts)
+        )
+
+    def _make_tokens_with_timestamp(self, user, timestamp):
+        if django.VERSION < (4, 1):
+            # no SECRET_KEY_FALLBACKS, and the third argument is legacy on 3.2
+            yield self._make_token_with_timestamp(user, timestamp)
+            return
+        for secret in [self.secret, *getattr(self, "secret_fallbacks", ())]:
+            yield self._make_token_with_timestamp(user, timestamp, secret)
+
+
+class OneTimeTokenGenerator:
+    """
+    Random single-use tokens kept in the ``CACHE_ALIAS`` cache for the
+    ``ONE_TIME_TOKEN_TIMEOUTS`` entry of their ``flow``, unless a ``timeout``
+    in seconds is given.
+
+    Unlike Django's HMAC tokens, which depend on the user's password hash and
+    last login, a token is checked with one cache lookup before the user is
+    loaded, and it's used up by the check.
+    """
+
+    def __init__(self, flow, timeout=None):
+        self.flow = flow
+        self.timeout = timeout
+
+    def _cache_key(self, token):
+        digest = hashlib.sha256(token.encode()).hexdigest()
+        return f"djoser:token:{self.flow}:{digest}"
+
+    def make_token(self, user):
+        token = secrets.token_urlsafe(24)
+        caches[settings.CACHE_ALIAS].set(
+            self._cache_key(token),
+            str(user.pk),
+            (
+                settings.ONE_TIME_TOKEN_TIMEOUTS[self.flow]
+                if self.timeout is None
+                else self.timeout
+            ),
+        )
+        return token
+
+    def has_token(self, uid, token):
+        """
+        Return whether ``token`` was made for the user whose primary key is
+        ``uid`` and wasn't used yet, without using it up.
+        """
+        if not isinstance(token, str) or not token:
+            return False
+        cache_key = self._cache_key(token)
+        return caches[settings.CACHE_ALIAS].get(cache_key) == str(uid)
+
+    def consume_token(self, uid, token):
+        """``has_token``, using the token up."""
+        if not self.has_token(uid, token):
+            return False
+        # of concurrent requests, only the one deleting the key may use it
+        return caches[settings.CACHE_ALIAS].delete(self._cache_key(token))
+
+    def check_token(self, user, token):
+        return user is not None and self.consume_token(user.pk, token)
+
+
+def get_token_generator(flow):
+    """
+    Return the token generator of ``flow``, one of ``"activation"``,
+    ``"password_reset"`` and ``"username_reset"``, which both makes and checks
+    its tokens. It's created once per settings reload.
+    """
+    return settings.memoize(
+        ("token_generator", flow), lambda: _build_token_generator(flow)
+    )
+
+
+def _build_token_generator(flow):
+    if settings.ONE_TIME_TOKENS:
+        return OneTimeTokenGenerator(flow)
+
+    config = settings.TOKEN_GENERATORS[flow]
+    generator = import_string(config["NAME"])
+    if not isinstance(generator, type):
+        # an instance, e.g. Django's default_token_generator
+        return generator
+    options = dict(config.get("OPTIONS", {}))
+    if issubclass(generator, OneTimeTokenGenerator):
+        options.setdefault("flow", flow)
+    return generator(**options)
+
+
+def _otp_cache_key(flow, email):
+    digest = hashlib.sha256(email.strip().lower().encode()).hexdigest()
+    return f"djoser:otp:{flow}:{digest}"
+
+
+def _hash_otp_code(flow, code):
+    return salted_hmac("djoser.tokens.otp", f"{flow}:{code}").hexdigest()
+
+
+def make_otp_code(flow, user):
+    """
+    Return a new ``OTP_CODE_LENGTH`` digits code for ``flow``, replacing the
+    previous code of ``user``'s e-mail. Only its HMAC is kept in the
+    ``CACHE_ALIAS`` cache, for ``OTP_CODE_TIMEOUT`` seconds. The tries left for
+    the e-mail aren't restored, see ``check_otp_code``.
+    """
+    length = settings.OTP_CODE_LENGTH
+    if not 6 <= length <= 8:
+        raise ImproperlyConfigured("OTP_CODE_LENGTH must be between 6 and 8.")
+    code = f"{secrets.randbelow(10**length):0{length}d}"
+    caches[settings.CACHE_ALIAS].set(
+        _otp_cache_key(flow, get_user_email(user)),
+        {"uid": str(user.pk), "code": _hash_otp_code(flow, code)},
+        settings.OTP_CODE_TIMEOUT,
+    )
+    return code
+
+
+def check_otp_code(flow, email, code):
+    """
+    Return the primary key of the user ``code`` was made for, or ``None`` if
+    it's wrong, expired or used, without using it up, see ``use_otp_code``.
+
+    Tries are counted per e-mail in the cache, whatever the code, and after
+    ``OTP_CODE_MAX_ATTEMPTS`` of them within ``OTP_CODE_TIMEOUT`` seconds of
+    the first one the codes of the e-mail are refused, even newly sent ones.
+    """
+    if not (isinstance(email, str) and isinstance(code, str) and code):
+        return None
+    cache = caches[settings.CACHE_ALIAS]
+    cache_key = _otp_cache_key(flow, email)
+    attempts_key = f"{cache_key}:attempts"
+    entry = cache.get(cache_key)
+    if entry is None:
+        return None
+    # the window starts with the first try, sending a new code doesn't reset it
+    cache.add(attempts_key, 0, settings.OTP_CODE_TIMEOUT)
+    try:
+        attempts = cache.incr(attempts_key)
+    except ValueError:
+        # expired since it was added
+        return None
+    if attempts > settings.OTP_CODE_MAX_ATTEMPTS:
+        cache.delete(cache_key)
+        return None
+    if not constant_time_compare(entry["code"], _hash_otp_code(flow, code)):
+        return None
+    return entry["uid"]
+
+
+def use_otp_code(flow, email, code):
+    """
+    Use up ``code`` once ``check_otp_code`` accepted it. Return whether it was
+    still the e-mail's code, unused.
+    """
+    cache = caches[settings.CACHE_ALIAS]
+    cache_key = _otp_cache_key(flow, email)
+    entry = cache.get(cache_key)
+    if entry is None or not constant_time_compare(
+        entry["code"], _hash_otp_code(flow, code)
+    ):
+        return False
+    # of concurrent requests, only the one deleting the key may use it
+    if not cache.delete(cache_key):
+        return False
+    cache.delete(f"{cache_key}:attempts")
+    return True
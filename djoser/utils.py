@@ -1,8 +1,31 @@
-from django.contrib.auth import login, logout, user_logged_in, user_logged_out
+import concurrent.futures
+import hashlib
+import os
+import time
+import uuid
+
+from django.contrib.auth import (
+    get_user_model,
+    login,
+    logout,
+    user_logged_in,
+    user_logged_out,
+)
+from django.contrib.auth.hashers import make_password
+from django.core.cache import caches
+from django.core.exceptions import ValidationError as DjangoValidationError
+from django.db import IntegrityError, connections, router, transaction
+from django.utils import timezone
+from django.utils.crypto import salted_hmac
 from django.utils.encoding import force_bytes, force_str
-from django.utils.http import urlsafe_base64_decode, urlsafe_base64_encode
+from django.utils.http import parse_etags, urlsafe_base64_decode, urlsafe_base64_encode
+from rest_framework import exceptions, serializers, status
+from rest_framework.response import Response
+from rest_framework.settings import api_settings
 
-from djoser.conf import settings
+from djoser import signals
+from djoser.compat import get_user_email
+from djoser.conf import settings, tenant_settings
 
 
 def encode_uid(pk):
@@ -31,8 +54,374 @@ def logout_user(request):
         logout(request)
 
 
+def hash_passwords(passwords, executor=None, workers=None):
+    """
+    Return ``make_password`` of every password, hashed in parallel by
+    ``executor`` or by a pool of ``workers`` processes created for the call
+    (``PASSWORD_HASHING_WORKERS`` by default).
+    """
+    workers = workers or settings.PASSWORD_HASHING_WORKERS or os.cpu_count() or 1
+    if executor is None:
+        workers = min(workers, len(passwords))
+        if workers <= 1:
+            return [make_password(password) for password in passwords]
+        with concurrent.futures.ProcessPoolExecutor(max_workers=workers) as executor:
+            return hash_passwords(passwords, executor, workers)
+    chunksize = max(1, len(passwords) // (workers * 4))
+    return list(executor.map(make_password, passwords, chunksize=chunksize))
+
+
+def validate_users(items, errors, get_serializer):
+    """
+    Validate ``(index, data)`` pairs with serializers from ``get_serializer``
+    and return ``(index, validated_data)`` pairs of the valid ones. Items
+    repeating a unique value of an earlier valid item are rejected too.
+    """
+    unique_fields = [
+        field.name for field in get_user_model()._meta.fields if field.unique
+    ]
+    seen = set()
+    valid = []
+    for index, item in items:
+        serializer = get_serializer(data=item)
+        if not serializer.is_valid():
+            errors[index] = serializer.errors
+            continue
+
+        data = serializer.validated_data
+        values = {
+            (name, data[name]) for name in unique_fields if data.get(name) is not None
+        }
+        duplicates = sorted(name for name, _ in values & seen)
+        if duplicates:
+            message = settings.CONSTANTS.messages.DUPLICATE_IN_BATCH_ERROR
+            errors[index] = {name: [message] for name in duplicates}
+            continue
+        seen |= values
+        valid.append((index, data))
+    return valid
+
+
+def build_users(valid, errors, prehashed=False, executor=None, workers=None):
+    """
+    Return unsaved ``(index, user)`` pairs for ``(index, validated_data)``
+    pairs, with all passwords hashed at once by ``hash_passwords`` unless they
+    are ``prehashed``. Users failing ``clean()`` are reported in ``errors``.
+    """
+    User = get_user_model()
+    passwords = [data["password"] for _, data in valid]
+    if not prehashed:
+        passwords = hash_passwords(passwords, executor, workers)
+
+    users = []
+    for (index, data), password in zip(valid, passwords):
+        data = {name: value for name, value in data.items() if name != "password"}
+        user = User(**data)
+        user.password = password
+        if settings.SEND_ACTIVATION_EMAIL:
+            user.is_active = False
+        try:
+            # normalizes the username and email like create_user does
+            user.clean()
+        except DjangoValidationError as e:
+            errors[index] = serializers.as_serializer_error(e)
+            continue
+        users.append((index, user))
+    return users
+
+
+def bulk_insert_users(users, errors, batch_size):
+    """
+    Insert ``(index, user)`` pairs with ``bulk_create``, one transaction per
+    ``batch_size`` users, and return the created users. A batch that violates
+    a constraint is retried row by row, so only the offending users fail.
+    """
+    User = get_user_model()
+    using = router.db_for_write(User)
+    returns_pks = connections[using].features.can_return_rows_from_bulk_insert
+    created = []
+    for start in range(0, len(users), batch_size):
+        batch = users[start : start + batch_size]
+        try:
+            with transaction.atomic(using=using):
+                User.objects.using(using).bulk_create([user for _, user in batch])
+                if not returns_pks:
+                    _fetch_inserted_pks([user for _, user in batch], using)
+        except IntegrityError:
+            pass
+        else:
+            created.extend(user for _, user in batch)
+            continue
+
+        message = settings.CONSTANTS.messages.CANNOT_CREATE_USER_ERROR
+        for index, user in batch:
+            try:
+                with transaction.atomic():
+                    user.save(force_insert=True)
+            except IntegrityError:
+                errors[index] = {api_settings.NON_FIELD_ERRORS_KEY: [message]}
+            else:
+                created.append(user)
+    return created
+
+
+def _fetch_inserted_pks(users, using):
+    # e.g. MySQL doesn't return the primary keys of bulk inserted rows
+    User = get_user_model()
+    field_name = User.USERNAME_FIELD
+    # keep within the query parameters limit of older SQLite versions
+    for start in range(0, len(users), 500):
+        chunk = users[start : start + 500]
+        pks = dict(
+            User.objects.using(using)
+            .filter(**{f"{field_name}__in": [getattr(u, field_name) for u in chunk]})
+            .values_list(field_name, "pk")
+        )
+        for user in chunk:
+            user.pk = pks[getattr(user, field_name)]
+            user._state.adding = False
+            user._state.db = using
+
+
+def _auto_now_fields(model):
+    return [
+        field.name
+        for field in model._meta.concrete_fields
+        if getattr(field, "auto_now", False)
+    ]
+
+
+def get_update_fields(instance, field_names):
+    """
+    Return ``field_names`` for ``instance.save(update_fields=...)`` with the
+    ``auto_now`` fields of its model, which Django only sets when listed.
+    """
+    return [
+        *field_names,
+        *(name for name in _auto_now_fields(type(instance)) if name not in field_names),
+    ]
+
+
+def get_update_values(model, **values):
+    """
+    Return ``values`` for ``QuerySet.update()`` on ``model`` with its
+    ``auto_now`` fields set to the current time, which ``update()`` skips.
+    """
+    now = timezone.now()
+    return {**{name: now for name in _auto_now_fields(model)}, **values}
+
+
+def revoke_tokens(users):
+    """
+    Delete the auth tokens of the ``users`` queryset, in a single statement
+    unless token deletion has signal receivers or cascades.
+    """
+    if settings.TOKEN_MODEL is not None:
+        settings.TOKEN_MODEL.objects.filter(user__in=users.values("pk")).delete()
+
+
+def send_registration_email(request, user):
+    context = {"user": user}
+    to = [get_user_email(user)]
+    if settings.SEND_ACTIVATION_EMAIL:
+        settings.EMAIL.activation(request, context).send(to)
+    elif settings.SEND_CONFIRMATION_EMAIL:
+        settings.EMAIL.confirmation(request, context).send(to)
+
+
+def _user_version_key(pk):
+    return f"djoser:user-version:{pk}"
+
+
+def get_user_version(user):
+    """
+    Return an opaque token that changes whenever djoser changes ``user``.
+
+    Tokens live in the ``CACHE_ALIAS`` cache; a user without one gets a new
+    random token, so an evicted entry can only make clients re-fetch.
+    """
+    cache = caches[settings.CACHE_ALIAS]
+    key = _user_version_key(user.pk)
+    version = cache.get(key)
+    if version is None:
+        cache.add(key, uuid.uuid4().hex, None)
+        version = cache.get(key)
+    return version
+
+
+def bump_user_version(user):
+    caches[settings.CACHE_ALIAS].set(_user_version_key(user.pk), uuid.uuid4().hex, None)
+
+
+def bump_user_versions(user_ids):
+    """``bump_user_version`` for many users at once."""
+    caches[settings.CACHE_ALIAS].set_many(
+        {_user_version_key(pk): uuid.uuid4().hex for pk in user_ids}, None
+    )
+
+
+def etag_matches(etag, if_none_match):
+    """Weak comparison of ``etag`` against an ``If-None-Match`` header."""
+    etags = parse_etags(if_none_match)
+    if "*" in etags:
+        return True
+    opaque_tag = etag.removeprefix("W/")
+    return any(candidate.removeprefix("W/") == opaque_tag for candidate in etags)
+
+
+def user_representation_cache_key(user, serializer_class):
+    """
+    Return the cache key of the ``/users/me/`` representation of ``user``.
+
+    It's built from values that are the same in every process: the user's
+    version, so bumping it drops the entries of all tenants at once, the
+    tenant and the serializer class.
+    """
+    variant = hashlib.md5(
+        f"{settings.tenant!r}|{serializer_class.__module__}."
+        f"{serializer_class.__qualname__}".encode(),
+        usedforsecurity=False,
+    ).hexdigest()
+    return f"djoser:user-me:{user.pk}:{get_user_version(user)}:{variant}"
+
+
+def invalidate_user_representation(user):
+    """Drop the cached ``/users/me/`` representations of ``user``."""
+    if settings.CACHE_USER_ME:
+        bump_user_version(user)
+
+
+def invalidate_user_representations(user_ids):
+    """``invalidate_user_representation`` for many users at once."""
+    if settings.CACHE_USER_ME:
+        bump_user_versions(user_ids)
+
+
+def _invalidate_user_representation(sender, user, **kwargs):
+    invalidate_user_representation(user)
+
+
+signals.user_updated.connect(
+    _invalidate_user_representation, dispatch_uid="djoser.utils.user_updated"
+)
+signals.user_activated.connect(
+    _invalidate_user_representation, dispatch_uid="djoser.utils.user_activated"
+)
+
+
 class ActionViewMixin:
     def post(self, request, **kwargs):
         serializer = self.get_serializer(data=request.data)
         serializer.is_valid(raise_exception=True)
         return self._action(serializer)
+
+
+class TenantSettingsMixin:
+    """Serve each request with the settings of its tenant, see TENANT_RESOLVER."""
+
+    def dispatch(self, request, *args, **kwargs):
+        with tenant_settings(request):
+            return super().dispatch(request, *args, **kwargs)
+
+
+class IdempotencyKeyInUse(exceptions.APIException):
+    status_code = status.HTTP_409_CONFLICT
+    default_code = "idempotency_key_in_use"
+
+    def __init__(self):
+        super().__init__(settings.CONSTANTS.messages.IDEMPOTENCY_KEY_IN_USE_ERROR)
+
+
+class IdempotencyKeyReused(exceptions.APIException):
+    status_code = status.HTTP_422_UNPROCESSABLE_ENTITY
+    default_code = "idempotency_key_reused"
+
+    def __init__(self):
+        super().__init__(settings.CONSTANTS.messages.IDEMPOTENCY_KEY_REUSED_ERROR)
+
+
+class _IdempotentReplay(Exception):
+    def __init__(self, stored):
+        self.stored = stored
+
+
+class IdempotencyMixin:
+    """
+    Replay the stored response of POST requests repeating an
+    ``Idempotency-Key`` header, see IDEMPOTENCY_KEYS.
+
+    The first request with a key holds a lock in the ``CACHE_ALIAS`` cache
+    while it runs, so concurrent duplicates wait for its response instead of
+    running the action again.
+    """
+
+    idempotency_header = "Idempotency-Key"
+    idempotency_poll_interval = 0.05
+
+    def dispatch(self, request, *args, **kwargs):
+        try:
+            return super().dispatch(request, *args, **kwargs)
+        finally:
+            # finalize_response doesn't run when an unhandled exception is
+            # raised, the lock mustn't outlive the request then
+            if getattr(self, "_idempotency", None) is not None:
+                _, lock_key, _ = self._idempotency
+                self._idempotency = None
+                caches[settings.CACHE_ALIAS].delete(lock_key)
+
+    def initial(self, request, *args, **kwargs):
+        self._idempotency = None
+        key = request.headers.get(self.idempotency_header)
+        if not settings.IDEMPOTENCY_KEYS or request.method != "POST" or not key:
+            return super().initial(request, *args, **kwargs)
+
+        # read before anything parses the request data and consumes the body;
+        # bodies may hold passwords, keep no plain hash of them in the cache
+        fingerprint = salted_hmac("djoser.idempotency", request.body).hexdigest()
+        super().initial(request, *args, **kwargs)
+        # keys are only unique per client, so scope them to the user
+        user_pk = request.user.pk if request.user.is_authenticated else ""
+        scope = hashlib.sha256(f"{request.path}\n{user_pk}\n{key}".encode()).hexdigest()
+        cache_key = f"djoser:idempotency:{scope}"
+        lock_key = f"{cache_key}:lock"
+
+        cache = caches[settings.CACHE_ALIAS]
+        deadline = time.monotonic() + settings.IDEMPOTENCY_LOCK_TIMEOUT
+        while not cache.add(lock_key, fingerprint, settings.IDEMPOTENCY_LOCK_TIMEOUT):
+            if time.monotonic() >= deadline:
+                raise IdempotencyKeyInUse()
+            time.sleep(self.idempotency_poll_interval)
+
+        stored = cache.get(cache_key)
+        if stored is not None:
+            cache.delete(lock_key)
+            if stored["fingerprint"] != fingerprint:
+                raise IdempotencyKeyReused()
+            raise _IdempotentReplay(stored)
+        self._idempotency = (cache_key, lock_key, fingerprint)
+
+    def handle_exception(self, exc):
+        if isinstance(exc, _IdempotentReplay):
+            return Response(
+                exc.stored["data"],
+                status=exc.stored["status"],
+                headers={"Idempotent-Replayed": "true"},
+            )
+        return super().handle_exception(exc)
+
+    def finalize_response(self, request, response, *args, **kwargs):
+        response = super().finalize_response(request, response, *args, **kwargs)
+        if getattr(self, "_idempotency", None) is not None:
+            cache_key, lock_key, fingerprint = self._idempotency
+            self._idempotency = None
+            cache = caches[settings.CACHE_ALIAS]
+            # server errors may be transient, let the client retry them
+            if response.status_code < 500 and hasattr(response, "data"):
+                stored = {
+                    "fingerprint": fingerprint,
+                    "status": response.status_code,
+                    "data": response.data,
+                }
+                cache.set(cache_key, stored, settings.IDEMPOTENCY_KEY_TTL)
+            cache.delete(lock_key)
+        return response
@@ -1,24 +1,44 @@
+import csv
+import hashlib
+import warnings
+
 from django.contrib.auth import get_user_model, update_session_auth_hash
 from django.contrib.auth.tokens import default_token_generator
+from django.core.cache import caches
+from django.core.exceptions import FieldDoesNotExist
+from django.db import transaction
+from django.http import StreamingHttpResponse
 from django.utils.timezone import now
 from rest_framework import generics, status, views, viewsets
 from rest_framework.decorators import action
-from rest_framework.exceptions import NotFound
+from rest_framework.exceptions import NotFound, PermissionDenied, ValidationError
 from rest_framework.response import Response
 from rest_framework.serializers import Serializer
+from rest_framework.settings import api_settings
+from rest_framework.utils.encoders import JSONEncoder
 
-from djoser import signals, utils
+from djoser import signals, tokens, utils
 from djoser.compat import get_user_email
-from djoser.conf import settings
+from djoser.conf import LazySetting, bind_tenant_settings, settings
+from djoser.filters import UserSearchFilter
 
 User = get_user_model()
 
+# serializer field backed by something other than a model field, e.g. a
+# property or a method, so the columns it needs can't be told
+_UNKNOWN_SOURCE = object()
+
 
-class TokenCreateView(utils.ActionViewMixin, generics.GenericAPIView):
+class TokenCreateView(
+    utils.TenantSettingsMixin,
+    utils.IdempotencyMixin,
+    utils.ActionViewMixin,
+    generics.GenericAPIView,
+):
     """Use this endpoint to obtain user authentication token."""
 
-    serializer_class = settings.SERIALIZERS.token_create
-    permission_classes = settings.PERMISSIONS.token_create
+    serializer_class = LazySetting("SERIALIZERS.token_create")
+    permission_classes = LazySetting("PERMISSIONS.token_create")
 
     def _action(self, serializer):
         token = utils.login_user(self.request, serializer.user)
@@ -28,23 +48,36 @@ class TokenCreateView(utils.ActionViewMixin, generics.GenericAPIView):
         )
 
 
-class TokenDestroyView(views.APIView):
+class TokenDestroyView(
+    utils.TenantSettingsMixin, utils.IdempotencyMixin, views.APIView
+):
     """Use this endpoint to logout user (remove user authentication token)."""
 
     serializer_class = Serializer
-    permission_classes = settings.PERMISSIONS.token_destroy
+    permission_classes = LazySetting("PERMISSIONS.token_destroy")
 
     def post(self, request):
         utils.logout_user(request)
         return Response(status=status.HTTP_204_NO_CONTENT)
 
 
-class UserViewSet(viewsets.ModelViewSet):
-    serializer_class = settings.SERIALIZERS.user
+class UserViewSet(
+    utils.TenantSettingsMixin, utils.IdempotencyMixin, viewsets.ModelViewSet
+):
+    serializer_class = LazySetting("SERIALIZERS.user")
     queryset = User.objects.all()
-    permission_classes = settings.PERMISSIONS.user
+    permission_classes = LazySetting("PERMISSIONS.user")
+    # deprecated, overriding it still replaces the TOKEN_GENERATORS
     token_generator = default_token_generator
-    lookup_field = settings.USER_ID_FIELD
+    # flows of the tokens and OTP codes checked by each action, see
+    # TOKEN_GENERATORS and OTP_CODES
+    token_flows = {
+        "activation": "activation",
+        "reset_password_confirm": "password_reset",
+        "reset_username_confirm": "username_reset",
+    }
+    lookup_field = LazySetting("USER_ID_FIELD")
+    search_filter_class = UserSearchFilter
 
     def permission_denied(self, request, **kwargs):
         if (
@@ -55,97 +88,311 @@ class UserViewSet(viewsets.ModelViewSet):
             raise NotFound()
         super().permission_denied(request, **kwargs)
 
+    @property
+    def paginator(self):
+        if not hasattr(self, "_paginator"):
+            pagination_class = (
+                settings.USER_LIST_PAGINATION_CLASS or self.pagination_class
+            )
+            self._paginator = None if pagination_class is None else pagination_class()
+        return self._paginator
+
+    def filter_queryset(self, queryset):
+        queryset = super().filter_queryset(queryset)
+        if settings.USER_SEARCH:
+            queryset = self.search_filter_class().filter_queryset(
+                self.request, queryset, self
+            )
+        return queryset
+
+    # read-only actions whose queryset is narrowed to the serializer's fields
+    narrowed_actions = ("list", "retrieve", "export")
+
     def get_queryset(self):
         user = self.request.user
         queryset = super().get_queryset()
-        if settings.HIDE_USERS and self.action == "list" and not user.is_staff:
+        if (
+            settings.HIDE_USERS
+            and self.action in ("list", "export")
+            and not user.is_staff
+        ):
             queryset = queryset.filter(pk=user.pk)
+        if self.action in self.narrowed_actions:
+            # a conditional GET only needs the row to exist to compare ETags
+            field_names = (
+                ()
+                if getattr(self, "_probing_etag", False)
+                else self.get_requested_fields()
+            )
+            queryset = self.narrow_queryset(
+                queryset, self.get_serializer_class(), field_names
+            )
         return queryset
 
-    def get_permissions(self):
-        if self.action == "create":
-            self.permission_classes = settings.PERMISSIONS.user_create
-        elif self.action == "activation":
-            self.permission_classes = settings.PERMISSIONS.activation
-        elif self.action == "resend_activation":
-            self.permission_classes = settings.PERMISSIONS.password_reset
-        elif self.action == "list":
-            self.permission_classes = settings.PERMISSIONS.user_list
-        elif self.action == "reset_password":
-            self.permission_classes = settings.PERMISSIONS.password_reset
-        elif self.action == "reset_password_confirm":
-            self.permission_classes = settings.PERMISSIONS.password_reset_confirm
-        elif self.action == "set_password":
-            self.permission_classes = settings.PERMISSIONS.set_password
-        elif self.action == "set_username":
-            self.permission_classes = settings.PERMISSIONS.set_username
-        elif self.action == "reset_username":
-            self.permission_classes = settings.PERMISSIONS.username_reset
-        elif self.action == "reset_username_confirm":
-            self.permission_classes = settings.PERMISSIONS.username_reset_confirm
-        elif self.action == "destroy" or (
-            self.action == "me" and self.request and self.request.method == "DELETE"
+    # actions accepting ``?fields=`` on GET when SPARSE_FIELDSETS is enabled
+    sparse_fieldset_actions = ("list", "retrieve", "me", "export")
+
+    def get_requested_fields(self):
+        """
+        Return the serializer fields picked with ``?fields=``, or ``None``
+        when all of them should be serialized.
+        """
+        if not hasattr(self, "_requested_fields"):
+            self._requested_fields = self._parse_requested_fields()
+        return self._requested_fields
+
+    def _parse_requested_fields(self):
+        if (
+            not settings.SPARSE_FIELDSETS
+            or self.action not in self.sparse_fieldset_actions
+            or self.request.method not in ("GET", "HEAD")
         ):
-            self.permission_classes = settings.PERMISSIONS.user_delete
-        return super().get_permissions()
+            return None
+        value = self.request.query_params.get("fields")
+        if not value:
+            return None
+
+        requested = []
+        for name in value.split(","):
+            name = name.strip()
+            if name and name not in requested:
+                requested.append(name)
+
+        serializer_class = self.get_serializer_class()
+        readable = settings.memoize(
+            ("readable_fields", serializer_class),
+            lambda: frozenset(
+                name
+                for name, field in serializer_class().fields.items()
+                if not field.write_only
+            ),
+        )
+        unknown = [name for name in requested if name not in readable]
+        if unknown:
+            message = settings.CONSTANTS.messages.INVALID_FIELDS_ERROR
+            raise ValidationError(
+                {"fields": [message.format(fields=", ".join(unknown))]},
+                code="invalid_fields",
+            )
+        return requested
+
+    def get_serializer(self, *args, **kwargs):
+        serializer = super().get_serializer(*args, **kwargs)
+        requested = self.get_requested_fields()
+        if requested is not None:
+            fields = getattr(serializer, "child", serializer).fields
+            for name in [name for name in fields if name not in requested]:
+                del fields[name]
+        return serializer
+
+    def narrow_queryset(self, queryset, serializer_class, field_names=None):
+        """
+        Load only the columns read by ``field_names`` of ``serializer_class``
+        (all of its fields by default), plus the relations listed in its
+        ``Meta.select_related`` and ``Meta.prefetch_related``.
+
+        The queryset is returned unchanged when a field reads anything other
+        than a model field, as the columns it needs are unknown.
+        """
+        sources = settings.memoize(
+            ("serializer_sources", serializer_class),
+            lambda: self._get_serializer_sources(serializer_class, queryset.model),
+        )
+        if sources is None:
+            return queryset
+        if field_names is None:
+            field_names = sources
+
+        columns = {queryset.model._meta.pk.name, settings.USER_ID_FIELD}
+        for field_name in field_names:
+            source = sources.get(field_name)
+            if source is _UNKNOWN_SOURCE:
+                return queryset
+            if source is not None:
+                columns.add(source)
+
+        select_related = getattr(serializer_class.Meta, "select_related", ())
+        prefetch_related = getattr(serializer_class.Meta, "prefetch_related", ())
+        # relations traversed by select_related can't be deferred
+        columns.update(lookup.split("__", 1)[0] for lookup in select_related)
+        if select_related:
+            queryset = queryset.select_related(*select_related)
+        if prefetch_related:
+            queryset = queryset.prefetch_related(*prefetch_related)
+        return queryset.only(*columns)
+
+    @staticmethod
+    def _get_serializer_sources(serializer_class, model):
+        # field name -> model field it reads, None for relations that aren't
+        # stored on the user table (those are loaded by separate queries)
+        meta = getattr(serializer_class, "Meta", None)
+        if getattr(meta, "model", None) is not model:
+            return None
+
+        sources = {}
+        for field_name, field in serializer_class().fields.items():
+            if field.write_only:
+                continue
+            if field.source == "*":
+                sources[field_name] = _UNKNOWN_SOURCE
+                continue
+            try:
+                model_field = model._meta.get_field(field.source_attrs[0])
+            except FieldDoesNotExist:
+                sources[field_name] = _UNKNOWN_SOURCE
+                continue
+            if model_field.concrete and not model_field.many_to_many:
+                sources[field_name] = model_field.name
+            else:
+                sources[field_name] = None
+        return sources
+
+    # (action, HTTP method) -> key in ``settings.PERMISSIONS``; a ``None``
+    # method applies to every method not listed explicitly for the action
+    permission_keys = {
+        ("create", None): "user_create",
+        ("activation", None): "activation",
+        ("resend_activation", None): "password_reset",
+        ("list", None): "user_list",
+        ("export", None): "user_export",
+        ("bulk_create", None): "user_bulk_create",
+        ("bulk_deactivate", None): "user_bulk_deactivate",
+        ("bulk_delete", None): "user_bulk_delete",
+        ("reset_password", None): "password_reset",
+        ("reset_password_confirm", None): "password_reset_confirm",
+        ("set_password", None): "set_password",
+        ("set_username", None): "set_username",
+        ("reset_username", None): "username_reset",
+        ("reset_username_confirm", None): "username_reset_confirm",
+        ("destroy", None): "user_delete",
+        ("me", "DELETE"): "user_delete",
+    }
+    # (action, HTTP method) -> key in ``settings.SERIALIZERS``
+    serializer_keys = {
+        ("create", None): "user_create",
+        ("bulk_create", None): "user_create",
+        ("bulk_deactivate", None): "user_bulk_action",
+        ("bulk_delete", None): "user_bulk_action",
+        ("destroy", None): "user_delete",
+        ("me", "DELETE"): "user_delete",
+        ("activation", None): "activation",
+        ("resend_activation", None): "password_reset",
+        ("reset_password", None): "password_reset",
+        ("reset_password_confirm", None): "password_reset_confirm",
+        ("set_password", None): "set_password",
+        ("set_username", None): "set_username",
+        ("reset_username", None): "username_reset",
+        ("reset_username_confirm", None): "username_reset_confirm",
+        ("me", None): "current_user",
+        ("export", None): "user",
+    }
+    # serializer key -> (boolean setting, serializer key used when it is set)
+    retype_serializer_keys = {
+        "user_create": (
+            "USER_CREATE_PASSWORD_RETYPE",
+            "user_create_password_retype",
+        ),
+        "password_reset_confirm": (
+            "PASSWORD_RESET_CONFIRM_RETYPE",
+            "password_reset_confirm_retype",
+        ),
+        "set_password": ("SET_PASSWORD_RETYPE", "set_password_retype"),
+        "set_username": ("SET_USERNAME_RETYPE", "set_username_retype"),
+        "username_reset_confirm": (
+            "USERNAME_RESET_CONFIRM_RETYPE",
+            "username_reset_confirm_retype",
+        ),
+    }
+
+    @classmethod
+    def _expand_methods(cls, keys, resolve):
+        table = {}
+        for (action_name, method), key in keys.items():
+            if method is None:
+                value = resolve(key)
+                table[(action_name, None)] = value
+                for name in cls.http_method_names:
+                    table.setdefault((action_name, name.upper()), value)
+        for (action_name, method), key in keys.items():
+            if method is not None:
+                table[(action_name, method)] = resolve(key)
+        return table
+
+    @classmethod
+    def _resolve_serializer_key(cls, key):
+        if key in cls.retype_serializer_keys:
+            setting_name, retype_key = cls.retype_serializer_keys[key]
+            if getattr(settings, setting_name):
+                key = retype_key
+        return getattr(settings.SERIALIZERS, key)
+
+    @classmethod
+    def get_dispatch_tables(cls):
+        """
+        Return ``(permission_table, serializer_table)`` keyed by
+        ``(action, method)``, built once per djoser settings generation.
+        """
+        return settings.memoize(("dispatch_tables", cls), cls._build_dispatch_tables)
+
+    @classmethod
+    def _build_dispatch_tables(cls):
+        permission_table = cls._expand_methods(
+            cls.permission_keys, lambda key: getattr(settings.PERMISSIONS, key)
+        )
+        serializer_table = cls._expand_methods(
+            cls.serializer_keys, cls._resolve_serializer_key
+        )
+        return permission_table, serializer_table
+
+    def _get_dispatch_key(self):
+        method = self.request.method if self.request else None
+        return self.action, method
+
+    def get_permissions(self):
+        permission_table, _ = self.get_dispatch_tables()
+        permission_classes = permission_table.get(
+            self._get_dispatch_key(), self.permission_classes
+        )
+        return [permission() for permission in permission_classes]
 
     def get_serializer_class(self):
-        if self.action == "create":
-            if settings.USER_CREATE_PASSWORD_RETYPE:
-                return settings.SERIALIZERS.user_create_password_retype
-            return settings.SERIALIZERS.user_create
-        elif self.action == "destroy" or (
-            self.action == "me" and self.request and self.request.method == "DELETE"
-        ):
-            return settings.SERIALIZERS.user_delete
-        elif self.action == "activation":
-            return settings.SERIALIZERS.activation
-        elif self.action == "resend_activation":
-            return settings.SERIALIZERS.password_reset
-        elif self.action == "reset_password":
-            return settings.SERIALIZERS.password_reset
-        elif self.action == "reset_password_confirm":
-            if settings.PASSWORD_RESET_CONFIRM_RETYPE:
-                return settings.SERIALIZERS.password_reset_confirm_retype
-            return settings.SERIALIZERS.password_reset_confirm
-        elif self.action == "set_password":
-            if settings.SET_PASSWORD_RETYPE:
-                return settings.SERIALIZERS.set_password_retype
-            return settings.SERIALIZERS.set_password
-        elif self.action == "set_username":
-            if settings.SET_USERNAME_RETYPE:
-                return settings.SERIALIZERS.set_username_retype
-            return settings.SERIALIZERS.set_username
-        elif self.action == "reset_username":
-            return settings.SERIALIZERS.username_reset
-        elif self.action == "reset_username_confirm":
-            if settings.USERNAME_RESET_CONFIRM_RETYPE:
-                return settings.SERIALIZERS.username_reset_confirm_retype
-            return settings.SERIALIZERS.username_reset_confirm
-        elif self.action == "me":
-            return settings.SERIALIZERS.current_user
-
-        return self.serializer_class
+        _, serializer_table = self.get_dispatch_tables()
+        return serializer_table.get(self._get_dispatch_key(), self.serializer_class)
 
     def get_instance(self):
         return self.request.user
 
+    def get_token_flow(self):
+        return self.token_flows[self.action]
+
+    def get_token_generator(self):
+        if (
+            self.token_generator is not default_token_generator
+            and not settings.ONE_TIME_TOKENS
+        ):
+            warnings.warn(
+                "UserViewSet.token_generator is deprecated, set TOKEN_GENERATORS "
+                "instead.",
+                DeprecationWarning,
+                stacklevel=2,
+            )
+            return self.token_generator
+        return tokens.get_token_generator(self.get_token_flow())
+
     def perform_create(self, serializer, *args, **kwargs):
         user = serializer.save(*args, **kwargs)
+        self.notify_user_registered(user)
+
+    def notify_user_registered(self, user):
         signals.user_registered.send(
             sender=self.__class__, user=user, request=self.request
         )
-
-        context = {"user": user}
-        to = [get_user_email(user)]
-        if settings.SEND_ACTIVATION_EMAIL:
-            settings.EMAIL.activation(self.request, context).send(to)
-        elif settings.SEND_CONFIRMATION_EMAIL:
-            settings.EMAIL.confirmation(self.request, context).send(to)
+        utils.send_registration_email(self.request, user)
 
     def perform_update(self, serializer, *args, **kwargs):
         super().perform_update(serializer, *args, **kwargs)
         user = serializer.instance
+        utils.bump_user_version(user)
         signals.user_updated.send(
             sender=self.__class__, user=user, request=self.request
         )
@@ -156,6 +403,62 @@ class UserViewSet(viewsets.ModelViewSet):
             to = [get_user_email(user)]
             settings.EMAIL.activation(self.request, context).send(to)
 
+    def retrieve(self, request, *args, **kwargs):
+        if not settings.USER_ETAGS:
+            return Response(self.get_representation(self.get_object()))
+
+        if_none_match = request.headers.get("If-None-Match")
+        self._probing_etag = if_none_match is not None
+        instance = self.get_object()
+        etag = self.get_etag(instance)
+        if self._probing_etag and utils.etag_matches(etag, if_none_match):
+            return Response(status=status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag})
+
+        if self._probing_etag:
+            # the probe deferred every column the serializer reads
+            self._probing_etag = False
+            if self.action != "me":
+                instance = self.get_object()
+        return Response(self.get_representation(instance), headers={"ETag": etag})
+
+    def get_representation(self, instance):
+        """
+        Return the serialized ``instance``. With ``CACHE_USER_ME`` enabled the
+        current user's full representation is served from the cache.
+        """
+        if (
+            not settings.CACHE_USER_ME
+            or self.action != "me"
+            or self.get_requested_fields() is not None
+        ):
+            return self.get_serializer(instance).data
+
+        cache = caches[settings.CACHE_ALIAS]
+        key = utils.user_representation_cache_key(instance, self.get_serializer_class())
+        data = cache.get(key)
+        if data is None:
+            data = dict(self.get_serializer(instance).data)
+            cache.set(key, data, settings.USER_ME_CACHE_TIMEOUT)
+        return data
+
+    def get_etag(self, instance):
+        """
+        Return a weak ETag for the representation of ``instance``.
+
+        It combines the version bumped whenever djoser changes the user with
+        everything else that shapes the response body.
+        """
+        serializer_class = self.get_serializer_class()
+        representation = "|".join(
+            [
+                f"{serializer_class.__module__}.{serializer_class.__qualname__}",
+                ",".join(self.get_requested_fields() or ()),
+                getattr(self.request.accepted_renderer, "format", ""),
+            ]
+        )
+        digest = hashlib.md5(representation.encode(), usedforsecurity=False)
+        return f'W/"{utils.get_user_version(instance)}-{digest.hexdigest()[:8]}"'
+
     def destroy(self, request, *args, **kwargs):
         instance = self.get_object()
         serializer = self.get_serializer(instance, data=request.data)
@@ -178,13 +481,190 @@ class UserViewSet(viewsets.ModelViewSet):
         elif request.method == "DELETE":
             return self.destroy(request, *args, **kwargs)
 
+    # rows fetched per database round trip by the export action
+    export_chunk_size = 2000
+    export_content_types = {
+        "ndjson": "application/x-ndjson",
+        "csv": "text/csv",
+    }
+    # spreadsheets run CSV cells starting with these as formulas
+    csv_formula_prefixes = ("=", "+", "-", "@", "\t", "\r")
+
+    @action(["get"], detail=False)
+    def export(self, request, *args, **kwargs):
+        export_format = request.query_params.get("export_format", "ndjson")
+        if export_format not in self.export_content_types:
+            message = settings.CONSTANTS.messages.INVALID_EXPORT_FORMAT_ERROR
+            raise ValidationError(
+                {"export_format": [message.format(export_format=export_format)]},
+                code="invalid_choice",
+            )
+
+        queryset = self.filter_queryset(self.get_queryset()).order_by("pk")
+        serializer = self.get_serializer()
+        if export_format == "csv":
+            rows = self._export_csv(queryset, serializer)
+        else:
+            rows = self._export_ndjson(queryset, serializer)
+
+        # rows are produced after dispatch has left the tenant's settings
+        response = StreamingHttpResponse(
+            bind_tenant_settings(rows),
+            content_type=self.export_content_types[export_format],
+        )
+        response["Content-Disposition"] = (
+            f'attachment; filename="users.{export_format}"'
+        )
+        return response
+
+    def _export_ndjson(self, queryset, serializer):
+        encoder = JSONEncoder()
+        for user in queryset.iterator(chunk_size=self.export_chunk_size):
+            yield encoder.encode(serializer.to_representation(user)) + "\n"
+
+    def _export_csv(self, queryset, serializer):
+        class Line:
+            def write(self, value):
+                return value
+
+        writer = csv.writer(Line())
+        field_names = [
+            name for name, field in serializer.fields.items() if not field.write_only
+        ]
+        yield writer.writerow(field_names)
+        for user in queryset.iterator(chunk_size=self.export_chunk_size):
+            data = serializer.to_representation(user)
+            yield writer.writerow(
+                [self.escape_csv_cell(data.get(name)) for name in field_names]
+            )
+
+    def escape_csv_cell(self, value):
+        """Quote user-controlled text that spreadsheets would run as a formula."""
+        if isinstance(value, str) and value.startswith(self.csv_formula_prefixes):
+            return "'" + value
+        return value
+
+    # users inserted per INSERT statement by the bulk_create action
+    bulk_create_batch_size = 1000
+
+    @action(["post"], detail=False)
+    def bulk_create(self, request, *args, **kwargs):
+        if not isinstance(request.data, list):
+            message = settings.CONSTANTS.messages.BULK_CREATE_NOT_A_LIST_ERROR
+            raise ValidationError(
+                {api_settings.NON_FIELD_ERRORS_KEY: [message]}, code="not_a_list"
+            )
+
+        errors = {}
+        valid = self.validate_bulk_create(request.data, errors)
+        users = utils.build_users(valid, errors)
+        created = self.perform_bulk_create(users, errors)
+        for user in created:
+            self.notify_user_registered(user)
+
+        serializer_class = settings.SERIALIZERS.user
+        data = {
+            "created": serializer_class(
+                created, many=True, context=self.get_serializer_context()
+            ).data,
+            "errors": [
+                {"index": index, "errors": errors[index]} for index in sorted(errors)
+            ],
+        }
+        if not errors:
+            response_status = status.HTTP_201_CREATED
+        elif created:
+            response_status = status.HTTP_207_MULTI_STATUS
+        else:
+            response_status = status.HTTP_400_BAD_REQUEST
+        return Response(data, status=response_status)
+
+    def validate_bulk_create(self, items, errors):
+        return utils.validate_users(enumerate(items), errors, self.get_serializer)
+
+    def perform_bulk_create(self, users, errors):
+        return utils.bulk_insert_users(users, errors, self.bulk_create_batch_size)
+
+    # users updated or deleted per statement by the bulk actions
+    bulk_action_chunk_size = 1000
+
+    @action(["post"], detail=False)
+    def bulk_deactivate(self, request, *args, **kwargs):
+        queryset = self.get_bulk_action_queryset().filter(is_active=True)
+        utils.revoke_tokens(queryset)
+        user_ids = []
+        for pks in self.iter_pk_chunks(queryset):
+            queryset.filter(pk__range=(pks[0], pks[-1])).update(
+                **utils.get_update_values(queryset.model, is_active=False)
+            )
+            utils.bump_user_versions(pks)
+            user_ids.extend(pks)
+
+        signals.users_deactivated.send(
+            sender=self.__class__, user_ids=user_ids, request=self.request
+        )
+        return Response({"count": len(user_ids)})
+
+    @action(["post"], detail=False)
+    def bulk_delete(self, request, *args, **kwargs):
+        queryset = self.get_bulk_action_queryset()
+        utils.revoke_tokens(queryset)
+        user_ids = []
+        for pks in self.iter_pk_chunks(queryset):
+            with transaction.atomic():
+                queryset.filter(pk__range=(pks[0], pks[-1])).delete()
+            utils.invalidate_user_representations(pks)
+            user_ids.extend(pks)
+
+        signals.users_deleted.send(
+            sender=self.__class__, user_ids=user_ids, request=self.request
+        )
+        return Response({"count": len(user_ids)})
+
+    def get_bulk_action_queryset(self):
+        """
+        Return the users picked by the request's ``ids``, or all users passing
+        the view's filter backends, leaving out the requesting user.
+        """
+        serializer = self.get_serializer(data=self.request.data)
+        serializer.is_valid(raise_exception=True)
+        queryset = self.filter_queryset(self.get_queryset())
+        ids = serializer.validated_data.get("ids")
+        if ids:
+            queryset = queryset.filter(**{f"{settings.USER_ID_FIELD}__in": ids})
+        return queryset.exclude(pk=self.request.user.pk).order_by()
+
+    def iter_pk_chunks(self, queryset):
+        """
+        Yield ascending lists of up to ``bulk_action_chunk_size`` primary keys
+        of ``queryset``, each covering a contiguous primary key range.
+        """
+        last_pk = None
+        while True:
+            chunk = queryset if last_pk is None else queryset.filter(pk__gt=last_pk)
+            pks = list(
+                chunk.order_by("pk").values_list("pk", flat=True)[
+                    : self.bulk_action_chunk_size
+                ]
+            )
+            if not pks:
+                return
+            yield pks
+            last_pk = pks[-1]
+
     @action(["post"], detail=False)
     def activation(self, request, *args, **kwargs):
         serializer = self.get_serializer(data=request.data)
         serializer.is_valid(raise_exception=True)
         user = serializer.user
+        # the row count tells whether a concurrent request activated it first
+        activated = User._default_manager.filter(pk=user.pk, is_active=False).update(
+            **utils.get_update_values(User, is_active=True)
+        )
+        if not activated:
+            raise PermissionDenied(settings.CONSTANTS.messages.STALE_TOKEN_ERROR)
         user.is_active = True
-        user.save()
+        utils.bump_user_version(user)
 
         signals.user_activated.send(
             sender=self.__class__, user=user, request=self.request
@@ -219,7 +699,10 @@ class UserViewSet(viewsets.ModelViewSet):
         serializer.is_valid(raise_exception=True)
 
         self.request.user.set_password(serializer.data["new_password"])
-        self.request.user.save()
+        self.request.user.save(
+            update_fields=utils.get_update_fields(self.request.user, ["password"])
+        )
+        utils.bump_user_version(self.request.user)
 
         if settings.PASSWORD_CHANGED_EMAIL_CONFIRMATION:
             context = {"user": self.request.user}
@@ -251,9 +734,14 @@ class UserViewSet(viewsets.ModelViewSet):
         serializer.is_valid(raise_exception=True)
 
         serializer.user.set_password(serializer.data["new_password"])
+        update_fields = ["password"]
         if hasattr(serializer.user, "last_login"):
             serializer.user.last_login = now()
-        serializer.user.save()
+            update_fields.append("last_login")
+        serializer.user.save(
+            update_fields=utils.get_update_fields(serializer.user, update_fields)
+        )
+        utils.bump_user_version(serializer.user)
 
         if settings.PASSWORD_CHANGED_EMAIL_CONFIRMATION:
             context = {"user": serializer.user}
@@ -269,7 +757,8 @@ class UserViewSet(viewsets.ModelViewSet):
         new_username = serializer.data["new_" + User.USERNAME_FIELD]
 
         setattr(user, User.USERNAME_FIELD, new_username)
-        user.save()
+        user.save(update_fields=utils.get_update_fields(user, [User.USERNAME_FIELD]))
+        utils.bump_user_version(user)
         if settings.USERNAME_CHANGED_EMAIL_CONFIRMATION:
             context = {"user": user}
             to = [get_user_email(user)]
@@ -296,9 +785,14 @@ class UserViewSet(viewsets.ModelViewSet):
         new_username = serializer.data["new_" + User.USERNAME_FIELD]
 
         setattr(serializer.user, User.USERNAME_FIELD, new_username)
+        update_fields = [User.USERNAME_FIELD]
         if hasattr(serializer.user, "last_login"):
             serializer.user.last_login = now()
-        serializer.user.save()
+            update_fields.append("last_login")
+        serializer.user.save(
+            update_fields=utils.get_update_fields(serializer.user, update_fields)
+        )
+        utils.bump_user_version(serializer.user)
 
         if settings.USERNAME_CHANGED_EMAIL_CONFIRMATION:
             context = {"user": serializer.user}
@@ -1,7 +1,7 @@
 from django.contrib.auth import get_user_model
 from rest_framework import serializers
 
-from djoser.conf import settings
+from djoser.conf import LazyMessages, settings
 from djoser.serializers import UserCreateMixin
 
 from .models import CredentialOptions
@@ -42,9 +42,9 @@ class WebauthnCreateUserSerializer(UserCreateMixin, serializers.ModelSerializer)
 
 
 class WebauthnLoginSerializer(serializers.Serializer):
-    default_error_messages = {
-        "invalid_credentials": settings.CONSTANTS.messages.INVALID_CREDENTIALS_ERROR
-    }
+    default_error_messages = LazyMessages(
+        invalid_credentials="INVALID_CREDENTIALS_ERROR"
+    )
 
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
@@ -19,8 +19,8 @@ from webauthn.webauthn import (
 
 from djoser import signals
 from djoser.compat import get_user_email
-from djoser.conf import settings
-from djoser.utils import login_user
+from djoser.conf import LazySetting, settings
+from djoser.utils import TenantSettingsMixin, login_user
 
 from .models import CredentialOptions
 from .serializers import WebauthnLoginSerializer, WebauthnSignupSerializer
@@ -29,7 +29,7 @@ from .utils import create_challenge
 User = get_user_model()
 
 
-class SignupRequestView(APIView):
+class SignupRequestView(TenantSettingsMixin, APIView):
     permission_classes = (AllowAny,)
     serializer_class = WebauthnSignupSerializer
 
@@ -51,9 +51,9 @@ class SignupRequestView(APIView):
         return Response(credential_registration_dict.registration_dict)
 
 
-class SignupView(APIView):
+class SignupView(TenantSettingsMixin, APIView):
     permission_classes = (AllowAny,)
-    serializer_class = settings.WEBAUTHN.SIGNUP_SERIALIZER
+    serializer_class = LazySetting("WEBAUTHN.SIGNUP_SERIALIZER")
 
     def post(self, request, ukey):
         co = get_object_or_404(CredentialOptions, ukey=ukey)
@@ -81,7 +81,15 @@ class SignupView(APIView):
         co.sign_count = webauthn_credential.sign_count
         co.credential_id = webauthn_credential.credential_id.decode()
         co.public_key = webauthn_credential.public_key.decode()
-        co.save()
+        co.save(
+            update_fields=[
+                "challenge",
+                "user",
+                "sign_count",
+                "credential_id",
+                "public_key",
+            ]
+        )
         signals.user_registered.send(
             sender=self.__class__, user=user, request=self.request
         )
@@ -94,7 +102,7 @@ class SignupView(APIView):
         return Response(user_serializer.data, status=status.HTTP_201_CREATED)
 
 
-class LoginRequestView(APIView):
+class LoginRequestView(TenantSettingsMixin, APIView):
     permission_classes = (AllowAny,)
     serializer_class = WebauthnLoginSerializer
 
@@ -106,7 +114,7 @@ class LoginRequestView(APIView):
         )
 
         co.challenge = create_challenge(32)
-        co.save()
+        co.save(update_fields=["challenge"])
 
         webauthn_user = WebAuthnUser(
             user_id=co.ukey,
@@ -126,9 +134,9 @@ class LoginRequestView(APIView):
 
 
 # this name looks good :)
-class LoginView(APIView):
+class LoginView(TenantSettingsMixin, APIView):
     permission_classes = (AllowAny,)
-    serializer_class = settings.WEBAUTHN.LOGIN_SERIALIZER
+    serializer_class = LazySetting("WEBAUTHN.LOGIN_SERIALIZER")
 
     def post(self, request):
         serializer = self.serializer_class(data=request.data)
@@ -165,7 +173,7 @@ class LoginView(APIView):
 
         co.sign_count = sign_count
         co.challenge = ""
-        co.save()
+        co.save(update_fields=["sign_count", "challenge"])
 
         token_serializer_class = settings.SERIALIZERS.token
         token = login_user(request, user)
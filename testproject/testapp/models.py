@@ -24,6 +24,7 @@ class CustomUser(AbstractBaseUser):
     custom_email = models.EmailField(blank=True)
     custom_required_field = models.CharField(max_length=2)
     is_active = models.BooleanField(default=True)
+    updated_at = models.DateTimeField(auto_now=True)
     objects = CustomUserManager()
 
     EMAIL_FIELD = "custom_email"
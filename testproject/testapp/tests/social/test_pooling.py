@@ -0,0 +1,136 @@
+import json
+import ssl
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from unittest import mock
+
+import pytest
+from django.contrib.sessions.middleware import SessionMiddleware
+from rest_framework import status
+from rest_framework.test import APIRequestFactory
+
+from djoser.social import pooling
+from djoser.social.views import ProviderAuthView
+
+
+class ProviderHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        self.server.connections.add(self.client_address)
+        self.server.paths.append(self.path.split("?")[0])
+        if "access_token" in self.path.split("?")[0]:
+            payload = {"access_token": "token"}
+        else:
+            payload = {"id": "1234", "name": "John", "email": "john@example.com"}
+        body = json.dumps(payload).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.send_header("Set-Cookie", "provider_session=secret; Path=/")
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def provider():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), ProviderHandler)
+    server.connections = set()
+    server.paths = []
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    base_url = f"http://127.0.0.1:{server.server_port}/v{{version}}"
+    with (
+        mock.patch(
+            "social_core.backends.facebook.FacebookOAuth2.ACCESS_TOKEN_URL",
+            f"{base_url}/oauth/access_token",
+        ),
+        mock.patch(
+            "social_core.backends.facebook.FacebookOAuth2.USER_DATA_URL",
+            f"{base_url}/me",
+        ),
+        mock.patch(
+            "social_core.backends.oauth.OAuthAuth.get_session_state",
+            return_value="ABC",
+        ),
+        mock.patch.dict("os.environ", {"NO_PROXY": "127.0.0.1"}),
+    ):
+        yield server
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.mark.django_db
+class TestPooledProviderRequests:
+    def login(self):
+        request = APIRequestFactory().post("/auth/facebook/")
+        request.GET = {"code": "XYZ", "state": "ABC"}
+        SessionMiddleware(lambda req: None).process_request(request)
+        request.session.save()
+        return ProviderAuthView.as_view()(request, provider="facebook")
+
+    def test_logins_reuse_the_provider_connection(self, djoser_settings, provider):
+        djoser_settings["SOCIAL_AUTH_HTTP_POOLING"] = True
+
+        responses = [self.login(), self.login()]
+
+        assert [r.status_code for r in responses] == [status.HTTP_201_CREATED] * 2
+        assert len(provider.paths) == 4
+        assert len(provider.connections) == 1
+        assert not pooling.get_session().cookies
+
+    def test_logins_open_connections_without_pooling(self, provider):
+        responses = [self.login(), self.login()]
+
+        assert [r.status_code for r in responses] == [status.HTTP_201_CREATED] * 2
+        assert len(provider.connections) == 4
+
+    def test_session_settings(self, djoser_settings):
+        djoser_settings.update(
+            SOCIAL_AUTH_HTTP_POOL_SIZE=3,
+            SOCIAL_AUTH_HTTP_CONNECT_TIMEOUT=1,
+            SOCIAL_AUTH_HTTP_READ_TIMEOUT=2,
+        )
+        session = pooling.get_session()
+        backend = mock.Mock(SEND_USER_AGENT=False)
+        backend.setting.side_effect = lambda name, default=None: default
+
+        with mock.patch.object(session, "request") as send:
+            pooling.request(backend, "https://provider.test/me")
+
+        assert pooling.get_session() is session
+        assert session.get_adapter("https://provider.test")._pool_maxsize == 3
+        assert send.call_args.kwargs["timeout"] == (1, 2)
+
+    def test_backend_timeout_settings_take_precedence(self):
+        backend = mock.Mock(SEND_USER_AGENT=False)
+        backend.setting.side_effect = lambda name, default=None: {
+            "REQUESTS_TIMEOUT": 7
+        }.get(name, default)
+
+        with mock.patch.object(pooling.get_session(), "request") as send:
+            pooling.request(backend, "https://provider.test/me")
+            pooling.request(backend, "https://provider.test/me", timeout=1)
+
+        assert [call.kwargs["timeout"] for call in send.call_args_list] == [7, 1]
+
+    def test_backend_ssl_protocol_is_used(self):
+        backend = mock.Mock(SEND_USER_AGENT=False)
+        backend.setting.side_effect = lambda name, default=None: {
+            "SSL_PROTOCOL": ssl.PROTOCOL_TLS_CLIENT
+        }.get(name, default)
+        session = pooling.get_session(ssl.PROTOCOL_TLS_CLIENT)
+
+        with mock.patch.object(session, "request") as send:
+            pooling.request(backend, "https://provider.test/me")
+            pooling.request(backend, "https://provider.test/me")
+
+        assert send.call_count == 2
+        adapter = session.get_adapter("https://provider.test")
+        assert adapter.poolmanager.connection_pool_kw["ssl_version"] == (
+            ssl.PROTOCOL_TLS_CLIENT
+        )
+        assert session is not pooling.get_session()
@@ -3,6 +3,8 @@ from testapp.factories import UserFactory
 from django.contrib.sessions.middleware import SessionMiddleware
 from rest_framework import status
 from rest_framework.test import APIRequestFactory
+from social_django.strategy import DjangoStrategy
+from social_django.utils import load_backend, load_strategy
 from social_core.exceptions import (
     AuthException,
     AuthForbidden,
@@ -109,6 +111,52 @@ class TestProviderAuthView:
         assert response.status_code == status.HTTP_201_CREATED
         assert set(response.data.keys()) == {"access", "refresh", "user"}
 
+    def test_post_loads_backend_and_reads_session_once(self, django_assert_num_queries):
+        data = {"code": "XYZ", "state": "ABC"}
+        user = UserFactory.create()
+        session_get = DjangoStrategy.session_get
+
+        with (
+            mock.patch(
+                "djoser.social.serializers.load_strategy", wraps=load_strategy
+            ) as strategy_loads,
+            mock.patch(
+                "djoser.social.serializers.load_backend", wraps=load_backend
+            ) as backend_loads,
+            mock.patch.object(
+                DjangoStrategy,
+                "session_get",
+                autospec=True,
+                side_effect=lambda strategy, name, default=None: (
+                    data["state"]
+                    if name == "facebook_state"
+                    else session_get(strategy, name, default)
+                ),
+            ) as session_reads,
+            mock.patch(
+                "social_core.backends.facebook.FacebookOAuth2.request",
+                return_value=mock.Mock(json=lambda: {"access_token": "token"}),
+            ),
+            mock.patch(
+                "social_core.backends.facebook.FacebookOAuth2.do_auth",
+                return_value=user,
+            ),
+        ):
+            request = self.factory.post("/auth/facebook/")
+            request.GET = dict(data)
+            SessionMiddleware(lambda req: None).process_request(request)
+            request.session.save()
+            with django_assert_num_queries(0):
+                response = self.view_class.as_view()(request, provider="facebook")
+
+        assert response.status_code == status.HTTP_201_CREATED
+        assert strategy_loads.call_count == 1
+        assert backend_loads.call_count == 1
+        assert sorted(call.args[1] for call in session_reads.call_args_list) == [
+            "facebook_state",
+            "redirect_uri",
+        ]
+
     @pytest.mark.parametrize(
         "auth_error",
         [
@@ -1,8 +1,11 @@
+from unittest import mock
+
 import pytest
 from django.contrib.auth.tokens import default_token_generator
 from rest_framework import status
 from rest_framework.reverse import reverse
 
+import djoser.serializers
 import djoser.signals
 import djoser.utils
 import djoser.views
@@ -93,3 +96,35 @@ class TestActivationView:
         assert len(mailoutbox) == 1
         assert mailoutbox[0].to == [user.email]
         assert signal_tracker.signal_sent
+
+    def test_post_concurrent_activation_wins_once(
+        self, djoser_settings, api_client, user, signal_tracker, mailoutbox
+    ):
+        djoser_settings["SEND_CONFIRMATION_EMAIL"] = True
+        user.is_active = False
+        user.save()
+        djoser.signals.user_activated.connect(signal_tracker.receiver)
+        data = {
+            "uid": djoser.utils.encode_uid(user.pk),
+            "token": default_token_generator.make_token(user),
+        }
+        validate = djoser.serializers.ActivationSerializer.validate
+
+        def validate_then_activate_elsewhere(serializer, attrs):
+            attrs = validate(serializer, attrs)
+            type(user).objects.filter(pk=user.pk).update(is_active=True)
+            return attrs
+
+        with mock.patch.object(
+            djoser.serializers.ActivationSerializer,
+            "validate",
+            validate_then_activate_elsewhere,
+        ):
+            response = api_client.post(self.base_url, data)
+
+        assert response.status_code == status.HTTP_403_FORBIDDEN
+        assert response.data["detail"] == (
+            default_settings.CONSTANTS.messages.STALE_TOKEN_ERROR
+        )
+        assert len(mailoutbox) == 0
+        assert not signal_tracker.signal_sent
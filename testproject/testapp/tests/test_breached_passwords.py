@@ -0,0 +1,93 @@
+import hashlib
+import io
+from unittest import mock
+
+import pytest
+from django.apps import apps
+from django.core.exceptions import ImproperlyConfigured, ValidationError
+from django.core.management import CommandError, call_command
+from rest_framework import status
+from rest_framework.reverse import reverse
+
+from djoser.password_validation import BreachedPasswordValidator
+
+
+def build(tmp_path, corpus, **options):
+    corpus_path = tmp_path / "corpus.txt"
+    corpus_path.write_text(corpus)
+    output = tmp_path / "breached.bin"
+    stdout = io.StringIO()
+    call_command(
+        "djoser_build_breached_passwords",
+        str(corpus_path),
+        str(output),
+        stdout=stdout,
+        **options,
+    )
+    return output, stdout.getvalue()
+
+
+class TestBreachedPasswordValidator:
+    def test_rejects_passwords_of_the_corpus(self, tmp_path):
+        path, stdout = build(
+            tmp_path, "password\n123456\nhunter2\npassword\nqwerty\n", chunk_size=2
+        )
+        validator = BreachedPasswordValidator(str(path))
+
+        assert "Wrote 4 breached" in stdout
+        for password in ("password", "123456", "hunter2", "qwerty"):
+            with pytest.raises(ValidationError) as exc_info:
+                validator.validate(password)
+            assert exc_info.value.code == "password_breached"
+        validator.validate("correct horse battery staple")
+        validator.validate("")
+
+    def test_sha1_corpus(self, tmp_path):
+        digest = hashlib.sha1(b"hunter2").hexdigest().upper()
+        path, _ = build(tmp_path, f"{digest}:17\n", format="sha1", prefix_bytes=4)
+        validator = BreachedPasswordValidator(str(path))
+
+        assert "hunter2" in validator
+        assert "hunter3" not in validator
+
+    def test_invalid_sha1_corpus(self, tmp_path):
+        with pytest.raises(CommandError):
+            build(tmp_path, "hunter2\n", format="sha1")
+
+    def test_unknown_file(self, tmp_path):
+        path = tmp_path / "breached.bin"
+        path.write_bytes(b"not a breached passwords file")
+
+        with pytest.raises(ImproperlyConfigured):
+            BreachedPasswordValidator(str(path))
+        with pytest.raises(ImproperlyConfigured):
+            BreachedPasswordValidator(str(tmp_path / "missing.bin"))
+
+    @pytest.mark.django_db
+    def test_signup_with_breached_password(self, api_client, settings, tmp_path):
+        path, _ = build(tmp_path, "hunter2secret\n")
+        settings.AUTH_PASSWORD_VALIDATORS = [
+            {
+                "NAME": "djoser.password_validation.BreachedPasswordValidator",
+                "OPTIONS": {"path": str(path)},
+            }
+        ]
+        data = {"username": "john", "password": "hunter2secret"}
+
+        response = api_client.post(reverse("user-list"), data)
+
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        assert response.data["password"][0].code == "password_breached"
+
+
+class TestPreloadPasswordValidators:
+    @pytest.mark.parametrize("preload", [True, False])
+    def test_validators_are_created_on_ready(self, djoser_settings, preload):
+        djoser_settings["PRELOAD_PASSWORD_VALIDATORS"] = preload
+
+        with mock.patch(
+            "django.contrib.auth.password_validation.get_default_password_validators"
+        ) as get_validators:
+            apps.get_app_config("djoser").ready()
+
+        assert get_validators.called is preload
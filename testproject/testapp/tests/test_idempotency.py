@@ -0,0 +1,142 @@
+import hashlib
+from unittest import mock
+
+import pytest
+from django.contrib.auth import get_user_model
+from django.core.cache import caches
+from django.utils.crypto import salted_hmac
+from rest_framework import status
+from rest_framework.reverse import reverse
+
+User = get_user_model()
+
+
+def lock_key(path, key, user_pk=""):
+    scope = hashlib.sha256(f"{path}\n{user_pk}\n{key}".encode()).hexdigest()
+    return f"djoser:idempotency:{scope}:lock"
+
+
+@pytest.mark.django_db
+class TestIdempotencyKeys:
+    @pytest.fixture(autouse=True)
+    def setup(self, djoser_settings):
+        djoser_settings["IDEMPOTENCY_KEYS"] = True
+        caches["default"].clear()
+        self.base_url = reverse("user-list")
+        self.data = {
+            "username": "john",
+            "email": "john@beatles.com",
+            "password": "secret123!",
+        }
+
+    def test_retry_replays_stored_response(
+        self, api_client, djoser_settings, mailoutbox
+    ):
+        djoser_settings["SEND_ACTIVATION_EMAIL"] = True
+        first = api_client.post(self.base_url, self.data, HTTP_IDEMPOTENCY_KEY="k1")
+
+        with mock.patch("djoser.serializers.validate_password") as validate:
+            retry = api_client.post(self.base_url, self.data, HTTP_IDEMPOTENCY_KEY="k1")
+
+        assert first.status_code == retry.status_code == status.HTTP_201_CREATED
+        assert retry.data == first.data
+        assert retry["Idempotent-Replayed"] == "true"
+        validate.assert_not_called()
+        assert User.objects.filter(username="john").count() == 1
+        assert len(mailoutbox) == 1
+
+    def test_client_errors_are_replayed(self, api_client):
+        self.data["password"] = "666"
+        first = api_client.post(self.base_url, self.data, HTTP_IDEMPOTENCY_KEY="k1")
+
+        retry = api_client.post(self.base_url, self.data, HTTP_IDEMPOTENCY_KEY="k1")
+
+        assert retry.status_code == status.HTTP_400_BAD_REQUEST
+        assert retry.data == first.data
+        assert retry["Idempotent-Replayed"] == "true"
+
+    def test_key_reused_with_different_request(self, api_client):
+        api_client.post(self.base_url, self.data, HTTP_IDEMPOTENCY_KEY="k1")
+        self.data["username"] = "paul"
+
+        response = api_client.post(self.base_url, self.data, HTTP_IDEMPOTENCY_KEY="k1")
+
+        assert response.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
+        assert not User.objects.filter(username="paul").exists()
+
+    def test_distinct_keys_run_separately(self, api_client):
+        api_client.post(self.base_url, self.data, HTTP_IDEMPOTENCY_KEY="k1")
+
+        response = api_client.post(self.base_url, self.data, HTTP_IDEMPOTENCY_KEY="k2")
+
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        assert "username" in response.data
+
+    def test_keys_are_scoped_to_the_user(self, api_client, user, mailoutbox):
+        url = reverse("user-reset-password")
+        api_client.post(url, {"email": user.email}, HTTP_IDEMPOTENCY_KEY="k1")
+        api_client.force_authenticate(user=user)
+
+        response = api_client.post(
+            url, {"email": user.email}, HTTP_IDEMPOTENCY_KEY="k1"
+        )
+
+        assert "Idempotent-Replayed" not in response
+        assert len(mailoutbox) == 2
+
+    def test_concurrent_duplicate_waits_for_lock(self, api_client):
+        cache = caches["default"]
+        cache.add(lock_key(self.base_url, "k1"), "other request")
+
+        with mock.patch(
+            "djoser.utils.time.sleep",
+            side_effect=lambda _: cache.delete(lock_key(self.base_url, "k1")),
+        ) as sleep:
+            response = api_client.post(
+                self.base_url, self.data, HTTP_IDEMPOTENCY_KEY="k1"
+            )
+
+        sleep.assert_called_once()
+        assert response.status_code == status.HTTP_201_CREATED
+
+    def test_lock_timeout_conflicts(self, api_client, djoser_settings):
+        djoser_settings["IDEMPOTENCY_LOCK_TIMEOUT"] = 0
+        caches["default"].add(lock_key(self.base_url, "k1"), "other request")
+
+        response = api_client.post(self.base_url, self.data, HTTP_IDEMPOTENCY_KEY="k1")
+
+        assert response.status_code == status.HTTP_409_CONFLICT
+        assert not User.objects.filter(username="john").exists()
+
+    def test_unhandled_errors_release_the_lock(self, api_client):
+        api_client.raise_request_exception = True
+
+        with mock.patch(
+            "djoser.views.UserViewSet.perform_create", side_effect=RuntimeError
+        ):
+            with pytest.raises(RuntimeError):
+                api_client.post(self.base_url, self.data, HTTP_IDEMPOTENCY_KEY="k1")
+
+        assert caches["default"].get(lock_key(self.base_url, "k1")) is None
+        retry = api_client.post(self.base_url, self.data, HTTP_IDEMPOTENCY_KEY="k1")
+        assert retry.status_code == status.HTTP_201_CREATED
+
+    def test_cache_holds_no_plain_hash_of_the_body(self, api_client):
+        cache = caches["default"]
+        with mock.patch.object(cache, "add", wraps=cache.add) as add:
+            response = api_client.post(
+                self.base_url, self.data, HTTP_IDEMPOTENCY_KEY="k1"
+            )
+
+        body = response.wsgi_request.body
+        fingerprint = add.call_args.args[1]
+        assert fingerprint != hashlib.sha256(body).hexdigest()
+        assert fingerprint == salted_hmac("djoser.idempotency", body).hexdigest()
+
+    def test_keys_are_ignored_when_disabled(self, api_client, djoser_settings):
+        djoser_settings["IDEMPOTENCY_KEYS"] = False
+        api_client.post(self.base_url, self.data, HTTP_IDEMPOTENCY_KEY="k1")
+
+        response = api_client.post(self.base_url, self.data, HTTP_IDEMPOTENCY_KEY="k1")
+
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
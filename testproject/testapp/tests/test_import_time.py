@@ -0,0 +1,88 @@
+import os
+import subprocess
+import sys
+import textwrap
+
+import djoser
+
+# Summed self time (microseconds) of all djoser modules imported below.
+# Generous on purpose, it exists to catch work creeping into module bodies.
+DJOSER_IMPORT_BUDGET_US = 100_000
+
+# Optional subsystems must only be imported when they are used.
+LAZY_MODULES = (
+    "django.test",
+    "rest_framework_simplejwt",
+    "social_core",
+    "social_django",
+    "webauthn",
+    "djoser.social",
+    "djoser.webauthn",
+)
+
+SCRIPT = textwrap.dedent(
+    """
+    import django
+    from django.conf import settings
+
+    settings.configure(
+        SECRET_KEY="_",
+        INSTALLED_APPS=[
+            "django.contrib.auth",
+            "django.contrib.contenttypes",
+            "rest_framework",
+            "rest_framework.authtoken",
+            "djoser",
+        ],
+    )
+    django.setup()
+
+    import djoser.serializers
+    import djoser.urls
+    import djoser.urls.authtoken
+    import djoser.views
+    """
+)
+
+
+def _import_times():
+    env = dict(os.environ)
+    env["PYTHONPATH"] = os.path.dirname(os.path.dirname(djoser.__file__))
+    env.pop("DJANGO_SETTINGS_MODULE", None)
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", SCRIPT],
+        env=env,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    times = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, _, name = line[len("import time:") :].split("|")
+        times[name.strip()] = int(self_us)
+    return times
+
+
+def test_optional_subsystems_are_not_imported_eagerly():
+    imported = _import_times()
+
+    eager = sorted(
+        name
+        for name in imported
+        if any(name == lazy or name.startswith(lazy + ".") for lazy in LAZY_MODULES)
+    )
+    assert eager == []
+
+
+def test_djoser_import_time_within_budget():
+    imported = _import_times()
+
+    djoser_us = sum(
+        self_us
+        for name, self_us in imported.items()
+        if name == "djoser" or name.startswith("djoser.")
+    )
+    assert "djoser.views" in imported
+    assert djoser_us < DJOSER_IMPORT_BUDGET_US
@@ -0,0 +1,167 @@
+import io
+import json
+from unittest import mock
+
+import pytest
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import make_password
+from django.core.management import call_command
+from django.db import connection
+
+from djoser.utils import encode_uid
+
+User = get_user_model()
+
+
+def run_import(path, **options):
+    stdout, stderr = io.StringIO(), io.StringIO()
+    call_command(
+        "djoser_import_users",
+        str(path),
+        workers=1,
+        stdout=stdout,
+        stderr=stderr,
+        **options,
+    )
+    return stdout.getvalue(), stderr.getvalue()
+
+
+def write_ndjson(path, records):
+    path.write_text("".join(json.dumps(record) + "\n" for record in records))
+    return path
+
+
+def user_record(username, **kwargs):
+    return {
+        "username": username,
+        "email": f"{username}@beatles.com",
+        "password": "secret123!",
+        **kwargs,
+    }
+
+
+@pytest.mark.django_db
+class TestImportUsersCommand:
+    def test_imports_ndjson(self, tmp_path):
+        path = write_ndjson(
+            tmp_path / "users.ndjson", [user_record("john"), user_record("paul")]
+        )
+
+        stdout, stderr = run_import(path)
+
+        assert stderr == ""
+        assert "Offset 2: 2 created, 0 failed" in stdout
+        assert User.objects.get(username="john").check_password("secret123!")
+
+    def test_imports_csv(self, tmp_path):
+        path = tmp_path / "users.csv"
+        path.write_text(
+            "username,email,password\n"
+            "john,john@beatles.com,secret123!\n"
+            "paul,paul@beatles.com,secret123!\n"
+        )
+
+        run_import(path)
+
+        assert set(User.objects.values_list("username", flat=True)) == {
+            "john",
+            "paul",
+        }
+
+    def test_invalid_records_are_reported(self, tmp_path):
+        path = tmp_path / "users.ndjson"
+        path.write_text(
+            json.dumps(user_record("john"))
+            + "\nnot json\n"
+            + json.dumps(user_record("paul", password="666"))
+            + "\n"
+        )
+
+        stdout, stderr = run_import(path)
+
+        assert "Offset 3: 1 created, 2 failed" in stdout
+        assert stderr.startswith("Record 1: ")
+        assert "Record 2: " in stderr and "password" in stderr
+
+    def test_batches_are_committed_separately(self, tmp_path):
+        path = write_ndjson(
+            tmp_path / "users.ndjson",
+            [user_record("john"), user_record("paul"), user_record("john")],
+        )
+
+        stdout, stderr = run_import(path, batch_size=2)
+
+        assert "Offset 2: 2 created, 0 failed" in stdout
+        assert "Offset 3: 2 created, 1 failed" in stdout
+        assert stderr.startswith("Record 2: ")
+
+    def test_offset_resumes_import(self, tmp_path):
+        path = write_ndjson(
+            tmp_path / "users.ndjson",
+            [user_record("john"), user_record("paul"), user_record("george")],
+        )
+
+        stdout, _ = run_import(path, offset=2)
+
+        assert "Offset 3: 1 created" in stdout
+        assert list(User.objects.values_list("username", flat=True)) == ["george"]
+
+    def test_offset_counts_records_not_lines(self, tmp_path):
+        path = tmp_path / "users.ndjson"
+        path.write_text(
+            "\n"
+            + json.dumps(user_record("john"))
+            + "\n\n"
+            + json.dumps(user_record("paul"))
+            + "\n"
+        )
+
+        stdout, _ = run_import(path, offset=1)
+
+        assert "Offset 2: 1 created" in stdout
+        assert list(User.objects.values_list("username", flat=True)) == ["paul"]
+
+    def test_batch_faster_than_the_clock(self, tmp_path):
+        path = write_ndjson(tmp_path / "users.ndjson", [user_record("john")])
+
+        with mock.patch("time.monotonic", return_value=0.0):
+            stdout, _ = run_import(path)
+
+        assert "Offset 1: 1 created, 0 failed" in stdout
+
+    def test_prehashed_passwords(self, tmp_path):
+        path = write_ndjson(
+            tmp_path / "users.ndjson",
+            [
+                user_record("john", password=make_password("123")),
+                user_record("paul", password="not a hash"),
+            ],
+        )
+
+        _, stderr = run_import(path, prehashed=True)
+
+        assert User.objects.get(username="john").check_password("123")
+        assert stderr.startswith("Record 1: ")
+
+    def test_sends_registration_emails(self, tmp_path, djoser_settings, mailoutbox):
+        djoser_settings["SEND_ACTIVATION_EMAIL"] = True
+        path = write_ndjson(tmp_path / "users.ndjson", [user_record("john")])
+
+        run_import(path, send_emails=True)
+
+        assert not User.objects.get(username="john").is_active
+        assert mailoutbox[0].to == ["john@beatles.com"]
+
+    def test_emails_link_inserted_users_without_returning_bulk_inserts(
+        self, tmp_path, djoser_settings, mailoutbox
+    ):
+        djoser_settings["SEND_ACTIVATION_EMAIL"] = True
+        path = write_ndjson(tmp_path / "users.ndjson", [user_record("john")])
+
+        with mock.patch.object(
+            type(connection.features), "can_return_rows_from_bulk_insert", False
+        ):
+            run_import(path, send_emails=True)
+
+        john = User.objects.get(username="john")
+        assert f"#/activate/{encode_uid(john.pk)}/" in mailoutbox[0].body
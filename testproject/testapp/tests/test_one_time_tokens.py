@@ -0,0 +1,122 @@
+import re
+
+import pytest
+from django.contrib.auth.tokens import default_token_generator
+from django.core.cache import caches
+from rest_framework import status
+from rest_framework.reverse import reverse
+from testapp.factories import UserFactory
+
+from djoser import tokens
+from djoser.utils import encode_uid
+
+
+@pytest.mark.django_db
+class TestOneTimeTokens:
+    @pytest.fixture(autouse=True)
+    def setup(self, djoser_settings):
+        djoser_settings["ONE_TIME_TOKENS"] = True
+        caches["default"].clear()
+        self.user = UserFactory(password="secret")
+
+    def reset_password_data(self, token, **kwargs):
+        return {
+            "uid": encode_uid(self.user.pk),
+            "token": token,
+            "new_password": "new_secret123!",
+            **kwargs,
+        }
+
+    def test_emailed_token_can_be_used_once(self, api_client, mailoutbox):
+        api_client.post(reverse("user-reset-password"), {"email": self.user.email})
+        uid, token = re.search(
+            r"#/password/reset/confirm/([^/]+)/(\S+)", mailoutbox[0].body
+        ).groups()
+        url = reverse("user-reset-password-confirm")
+        data = {"uid": uid, "token": token, "new_password": "new_secret123!"}
+
+        response = api_client.post(url, data)
+        reused = api_client.post(url, data)
+
+        assert response.status_code == status.HTTP_204_NO_CONTENT
+        assert reused.status_code == status.HTTP_400_BAD_REQUEST
+        assert "token" in reused.data
+        self.user.refresh_from_db()
+        assert self.user.check_password("new_secret123!")
+
+    def test_unknown_token_is_rejected_without_queries(
+        self, api_client, django_assert_num_queries
+    ):
+        data = self.reset_password_data("not-a-token")
+
+        with django_assert_num_queries(0):
+            response = api_client.post(reverse("user-reset-password-confirm"), data)
+
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        assert "token" in response.data
+
+    def test_token_is_bound_to_its_user(self, api_client):
+        token = tokens.get_token_generator("password_reset").make_token(self.user)
+        other = UserFactory()
+        data = self.reset_password_data(token, uid=encode_uid(other.pk))
+
+        response = api_client.post(reverse("user-reset-password-confirm"), data)
+
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        # the token stays usable by its user
+        response = api_client.post(
+            reverse("user-reset-password-confirm"), self.reset_password_data(token)
+        )
+        assert response.status_code == status.HTTP_204_NO_CONTENT
+
+    def test_rejected_password_keeps_the_token(self, api_client):
+        token = tokens.get_token_generator("password_reset").make_token(self.user)
+        url = reverse("user-reset-password-confirm")
+
+        response = api_client.post(
+            url, self.reset_password_data(token, new_password="666")
+        )
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        assert list(response.data) == ["new_password"]
+        response = api_client.post(url, self.reset_password_data(token))
+        assert response.status_code == status.HTTP_204_NO_CONTENT
+
+    def test_token_is_bound_to_its_flow(self, api_client):
+        token = tokens.get_token_generator("activation").make_token(self.user)
+
+        response = api_client.post(
+            reverse("user-reset-password-confirm"), self.reset_password_data(token)
+        )
+
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+    def test_tokens_expire_per_flow(self, api_client, djoser_settings):
+        djoser_settings["ONE_TIME_TOKEN_TIMEOUTS"] = {"password_reset": 0}
+        token = tokens.get_token_generator("password_reset").make_token(self.user)
+
+        response = api_client.post(
+            reverse("user-reset-password-confirm"), self.reset_password_data(token)
+        )
+
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+    def test_activation(self, api_client):
+        self.user.is_active = False
+        self.user.save(update_fields=["is_active"])
+        token = tokens.get_token_generator("activation").make_token(self.user)
+        data = {"uid": encode_uid(self.user.pk), "token": token}
+
+        response = api_client.post(reverse("user-activation"), data)
+
+        assert response.status_code == status.HTTP_204_NO_CONTENT
+        self.user.refresh_from_db()
+        assert self.user.is_active
+
+    def test_hmac_tokens_are_rejected(self, api_client):
+        token = default_token_generator.make_token(self.user)
+
+        response = api_client.post(
+            reverse("user-reset-password-confirm"), self.reset_password_data(token)
+        )
+
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
@@ -0,0 +1,197 @@
+import re
+from unittest import mock
+
+import pytest
+from django.core.cache import caches
+from django.core.exceptions import ImproperlyConfigured
+from rest_framework import status
+from rest_framework.reverse import reverse
+from testapp.factories import UserFactory
+
+from djoser import tokens
+from djoser.utils import encode_uid
+
+
+@pytest.mark.django_db
+class TestOTPCodes:
+    @pytest.fixture(autouse=True)
+    def setup(self, djoser_settings):
+        djoser_settings["OTP_CODES"] = True
+        caches["default"].clear()
+        self.user = UserFactory(password="secret")
+
+    def reset_password_data(self, code, **kwargs):
+        return {
+            "email": self.user.email,
+            "code": code,
+            "new_password": "new_secret123!",
+            **kwargs,
+        }
+
+    def test_emailed_code_can_be_used_once(self, api_client, mailoutbox):
+        api_client.post(reverse("user-reset-password"), {"email": self.user.email})
+        code = re.search(r"Or enter this code: (\d+)", mailoutbox[0].body).group(1)
+        url = reverse("user-reset-password-confirm")
+        data = self.reset_password_data(code, email=self.user.email.upper())
+
+        response = api_client.post(url, data)
+        reused = api_client.post(url, data)
+
+        assert len(code) == 6
+        assert response.status_code == status.HTTP_204_NO_CONTENT
+        assert reused.status_code == status.HTTP_400_BAD_REQUEST
+        assert reused.data["code"][0].code == "invalid_code"
+        self.user.refresh_from_db()
+        assert self.user.check_password("new_secret123!")
+
+    def test_wrong_code_is_rejected_without_queries(
+        self, api_client, django_assert_num_queries
+    ):
+        code = tokens.make_otp_code("password_reset", self.user)
+        wrong = str((int(code) + 1) % 10**6).zfill(6)
+
+        with django_assert_num_queries(0):
+            response = api_client.post(
+                reverse("user-reset-password-confirm"),
+                self.reset_password_data(wrong),
+            )
+
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        assert "code" in response.data
+
+    def test_code_is_dropped_after_max_attempts(self, api_client, djoser_settings):
+        djoser_settings["OTP_CODE_MAX_ATTEMPTS"] = 2
+        code = tokens.make_otp_code("password_reset", self.user)
+        url = reverse("user-reset-password-confirm")
+        for _ in range(2):
+            api_client.post(url, self.reset_password_data("000000x"))
+
+        response = api_client.post(url, self.reset_password_data(code))
+
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        assert "code" in response.data
+
+    def test_new_code_does_not_restore_the_tries(self, api_client, djoser_settings):
+        djoser_settings["OTP_CODE_MAX_ATTEMPTS"] = 2
+        tokens.make_otp_code("password_reset", self.user)
+        url = reverse("user-reset-password-confirm")
+        for _ in range(2):
+            api_client.post(url, self.reset_password_data("000000x"))
+
+        code = tokens.make_otp_code("password_reset", self.user)
+        response = api_client.post(url, self.reset_password_data(code))
+
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        assert "code" in response.data
+
+    def test_tries_are_restored_after_the_timeout(self, api_client, djoser_settings):
+        djoser_settings["OTP_CODE_MAX_ATTEMPTS"] = 1
+        tokens.make_otp_code("password_reset", self.user)
+        url = reverse("user-reset-password-confirm")
+        api_client.post(url, self.reset_password_data("000000x"))
+        # as if OTP_CODE_TIMEOUT had passed since the first try
+        cache_key = tokens._otp_cache_key("password_reset", self.user.email)
+        caches["default"].delete(f"{cache_key}:attempts")
+
+        code = tokens.make_otp_code("password_reset", self.user)
+        response = api_client.post(url, self.reset_password_data(code))
+
+        assert response.status_code == status.HTTP_204_NO_CONTENT
+
+    def test_new_code_replaces_the_previous_one(self, api_client):
+        with mock.patch("secrets.randbelow", side_effect=[111111, 222222]):
+            code = tokens.make_otp_code("password_reset", self.user)
+            new_code = tokens.make_otp_code("password_reset", self.user)
+        url = reverse("user-reset-password-confirm")
+
+        response = api_client.post(url, self.reset_password_data(code))
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        response = api_client.post(url, self.reset_password_data(new_code))
+        assert response.status_code == status.HTTP_204_NO_CONTENT
+
+    def test_rejected_password_keeps_the_code(self, api_client):
+        code = tokens.make_otp_code("password_reset", self.user)
+        url = reverse("user-reset-password-confirm")
+
+        response = api_client.post(
+            url, self.reset_password_data(code, new_password="666")
+        )
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        assert list(response.data) == ["new_password"]
+        response = api_client.post(url, self.reset_password_data(code))
+        assert response.status_code == status.HTTP_204_NO_CONTENT
+
+    def test_code_is_bound_to_its_flow(self, api_client):
+        code = tokens.make_otp_code("activation", self.user)
+
+        response = api_client.post(
+            reverse("user-reset-password-confirm"), self.reset_password_data(code)
+        )
+
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+    def test_activation(self, api_client):
+        self.user.is_active = False
+        self.user.save(update_fields=["is_active"])
+        code = tokens.make_otp_code("activation", self.user)
+        data = {"email": self.user.email, "code": code}
+
+        response = api_client.post(reverse("user-activation"), data)
+
+        assert response.status_code == status.HTTP_204_NO_CONTENT
+        self.user.refresh_from_db()
+        assert self.user.is_active
+
+    def test_username_reset(self, api_client):
+        code = tokens.make_otp_code("username_reset", self.user)
+        data = {"email": self.user.email, "code": code, "new_username": "new_john"}
+
+        response = api_client.post(reverse("user-reset-username-confirm"), data)
+
+        assert response.status_code == status.HTTP_204_NO_CONTENT
+        self.user.refresh_from_db()
+        assert self.user.username == "new_john"
+
+    def test_uid_and_token_still_work(self, api_client, mailoutbox):
+        api_client.post(reverse("user-reset-password"), {"email": self.user.email})
+        uid, token = re.search(
+            r"#/password/reset/confirm/([^/]+)/(\S+)", mailoutbox[0].body
+        ).groups()
+        data = {"uid": uid, "token": token, "new_password": "new_secret123!"}
+
+        response = api_client.post(reverse("user-reset-password-confirm"), data)
+
+        assert response.status_code == status.HTTP_204_NO_CONTENT
+
+    def test_either_shape_is_required(self, api_client):
+        url = reverse("user-reset-password-confirm")
+
+        response = api_client.post(url, {"new_password": "new_secret123!"})
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        assert set(response.data) == {"uid", "token"}
+
+        response = api_client.post(
+            url, {"code": "123456", "new_password": "new_secret123!"}
+        )
+        assert set(response.data) == {"email"}
+
+        data = {"uid": encode_uid(self.user.pk), "new_password": "new_secret123!"}
+        response = api_client.post(url, data)
+        assert set(response.data) == {"token"}
+
+    def test_code_length(self, djoser_settings):
+        djoser_settings["OTP_CODE_LENGTH"] = 8
+        assert re.fullmatch(r"\d{8}", tokens.make_otp_code("activation", self.user))
+
+        djoser_settings["OTP_CODE_LENGTH"] = 4
+        with pytest.raises(ImproperlyConfigured):
+            tokens.make_otp_code("activation", self.user)
+
+    def test_codes_are_not_emailed_by_default(
+        self, api_client, djoser_settings, mailoutbox
+    ):
+        djoser_settings["OTP_CODES"] = False
+
+        api_client.post(reverse("user-reset-password"), {"email": self.user.email})
+
+        assert "Or enter this code" not in mailoutbox[0].body
@@ -158,7 +158,7 @@ def test_post_not_reset_if_fails_password_validation(api_client, djoser_settings
         "uid": djoser.utils.encode_uid(user.pk),
         "token": default_token_generator.make_token(user),
         "new_password": "666",
-        "re_new_password": "isokpassword",
+        "re_new_password": "666",
     }
 
     response = api_client.post(base_url, data)
@@ -0,0 +1,55 @@
+from unittest import mock
+
+import pytest
+from rest_framework import serializers
+
+from djoser.serializers import (
+    SendEmailResetSerializer,
+    SetUsernameRetypeSerializer,
+    TokenCreateSerializer,
+    UserCreatePasswordRetypeSerializer,
+)
+
+
+class TestCachedFields:
+    def test_fields_are_built_once(self, djoser_settings):
+        # start from a fresh settings generation
+        djoser_settings["HIDE_USERS"] = True
+        with mock.patch.object(
+            serializers.ModelSerializer,
+            "get_fields",
+            autospec=True,
+            side_effect=serializers.ModelSerializer.get_fields,
+        ) as get_fields:
+            first = UserCreatePasswordRetypeSerializer().fields
+            second = UserCreatePasswordRetypeSerializer().fields
+
+        assert get_fields.call_count == 1
+        assert list(first) == list(second)
+        assert "re_password" in first
+        assert first["re_password"] is not second["re_password"]
+
+    def test_instances_get_their_own_copy(self):
+        serializer = UserCreatePasswordRetypeSerializer()
+        serializer.fields.pop("re_password")
+
+        assert "re_password" in UserCreatePasswordRetypeSerializer().fields
+
+    def test_fields_follow_settings_reload(self, djoser_settings):
+        assert "username" in TokenCreateSerializer().fields
+
+        djoser_settings["LOGIN_FIELD"] = "email"
+
+        assert set(TokenCreateSerializer().fields) == {"password", "email"}
+
+    def test_login_field_is_renamed(self):
+        field = SetUsernameRetypeSerializer().fields["new_username"]
+
+        assert field.source == "username"
+
+    @pytest.mark.django_db
+    def test_email_field_is_added(self):
+        serializer = SendEmailResetSerializer(data={"email": "john@beatles.com"})
+
+        assert serializer.is_valid()
+        assert serializer.email_field == "email"
@@ -30,3 +30,14 @@ def test_djoser_serializer_setting_overriden(djoser_settings):
     from djoser.conf import settings as djoser_settings_module
 
     assert djoser_settings_module.SERIALIZERS.user.__name__ == "TokenSerializer"
+
+
+def test_pending_import_resolved_by_another_thread():
+    from djoser.conf import Settings, get_default_settings
+
+    settings = Settings(get_default_settings())
+    token_model = settings.TOKEN_MODEL
+
+    # a thread whose attribute lookup missed before the import finished
+    assert settings.__getattr__("TOKEN_MODEL") is token_model
+    assert "TOKEN_MODEL" not in settings._pending_imports
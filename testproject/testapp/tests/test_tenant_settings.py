@@ -0,0 +1,136 @@
+from unittest import mock
+
+import pytest
+from rest_framework import status
+from rest_framework.reverse import reverse
+
+from djoser.conf import settings as djoser_settings_module
+from djoser.conf import bind_tenant_settings, tenant_settings
+from djoser.serializers import UserSerializer
+
+
+def resolve_tenant(request):
+    return request.headers.get("X-Tenant")
+
+
+@pytest.fixture
+def tenants(djoser_settings):
+    djoser_settings.update(
+        TENANT_RESOLVER=resolve_tenant,
+        TENANT_SETTINGS={
+            "acme": {
+                "SEND_ACTIVATION_EMAIL": True,
+                "EMAIL_FRONTEND_DOMAIN": "acme.example.com",
+                "ACTIVATION_URL": "acme/activate/{uid}/{token}",
+            },
+            "globex": {"SEND_ACTIVATION_EMAIL": False},
+        },
+    )
+    return djoser_settings
+
+
+class RequestStub:
+    def __init__(self, tenant=None):
+        self.headers = {"X-Tenant": tenant} if tenant else {}
+
+
+def test_tenant_settings_overlay_global_settings(tenants):
+    with tenant_settings(RequestStub("acme")):
+        assert djoser_settings_module.EMAIL_FRONTEND_DOMAIN == "acme.example.com"
+        assert djoser_settings_module.SEND_ACTIVATION_EMAIL
+        # settings the tenant doesn't override come from DJOSER
+        assert (
+            djoser_settings_module.PASSWORD_RESET_CONFIRM_URL
+            == "#/password/reset/confirm/{uid}/{token}"
+        )
+
+    assert djoser_settings_module.EMAIL_FRONTEND_DOMAIN is None
+    assert not djoser_settings_module.SEND_ACTIVATION_EMAIL
+
+
+def test_requests_without_tenant_use_global_settings(tenants):
+    with tenant_settings(RequestStub()):
+        assert djoser_settings_module.ACTIVATION_URL == "#/activate/{uid}/{token}"
+
+
+def test_tenant_settings_instances_are_cached(tenants):
+    acme = djoser_settings_module.for_tenant("acme")
+
+    assert djoser_settings_module.for_tenant("acme") is acme
+    assert djoser_settings_module.for_tenant("globex") is not acme
+
+
+def test_tenant_settings_cache_is_bounded(tenants):
+    tenants["TENANT_SETTINGS_CACHE_SIZE"] = 1
+    acme = djoser_settings_module.for_tenant("acme")
+    djoser_settings_module.for_tenant("globex")
+
+    assert djoser_settings_module.for_tenant("acme") is not acme
+
+
+def test_tenant_settings_cache_is_dropped_on_reload(tenants):
+    acme = djoser_settings_module.for_tenant("acme")
+    tenants["HIDE_USERS"] = False
+
+    assert djoser_settings_module.for_tenant("acme") is not acme
+
+
+def test_user_create_uses_tenant_settings(api_client, tenants, mailoutbox):
+    data = {
+        "username": "john",
+        "password": "secret123!",
+        "email": "john@beatles.com",
+    }
+
+    response = api_client.post(reverse("user-list"), data, HTTP_X_TENANT="acme")
+
+    assert response.status_code == status.HTTP_201_CREATED
+    assert len(mailoutbox) == 1
+    assert "acme.example.com/acme/activate/" in mailoutbox[0].body
+
+
+def test_user_create_uses_global_settings_for_other_tenants(
+    api_client, tenants, mailoutbox
+):
+    data = {
+        "username": "john",
+        "password": "secret123!",
+        "email": "john@beatles.com",
+    }
+
+    response = api_client.post(reverse("user-list"), data, HTTP_X_TENANT="globex")
+
+    assert response.status_code == status.HTTP_201_CREATED
+    assert len(mailoutbox) == 0
+
+
+def test_bound_iterables_use_the_tenant_settings_of_their_creation(tenants):
+    def domains():
+        for _ in range(2):
+            yield djoser_settings_module.EMAIL_FRONTEND_DOMAIN
+
+    with tenant_settings(RequestStub("acme")):
+        rows = bind_tenant_settings(domains())
+
+    assert list(rows) == ["acme.example.com"] * 2
+    assert djoser_settings_module.EMAIL_FRONTEND_DOMAIN is None
+
+
+@pytest.mark.django_db
+def test_user_export_streams_with_tenant_settings(
+    api_client, tenants, create_superuser
+):
+    api_client.force_authenticate(user=create_superuser)
+
+    with mock.patch.object(
+        UserSerializer,
+        "to_representation",
+        side_effect=lambda user: {
+            "domain": djoser_settings_module.EMAIL_FRONTEND_DOMAIN
+        },
+    ):
+        response = api_client.get(reverse("user-export"), HTTP_X_TENANT="acme")
+        content = b"".join(response.streaming_content).decode()
+
+    assert response.status_code == status.HTTP_200_OK
+    assert content == '{"domain": "acme.example.com"}\n'
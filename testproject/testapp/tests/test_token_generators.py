@@ -0,0 +1,170 @@
+import re
+from datetime import timedelta
+from unittest import mock
+
+import pytest
+from django.contrib.auth.tokens import default_token_generator
+from django.core.cache import caches
+from rest_framework import status
+from rest_framework.reverse import reverse
+from testapp.factories import UserFactory
+
+from djoser import tokens
+from djoser.tokens import OneTimeTokenGenerator, TokenGenerator
+from djoser.utils import encode_uid
+
+RESET_GENERATOR = {
+    "NAME": "djoser.tokens.TokenGenerator",
+    "OPTIONS": {"key_salt": "password-reset", "timeout": 15 * 60},
+}
+
+
+class TestTokenGenerators:
+    def test_default_generators(self):
+        for flow in ("activation", "password_reset", "username_reset"):
+            assert tokens.get_token_generator(flow) is default_token_generator
+
+    def test_generators_are_created_once_per_reload(self, djoser_settings):
+        djoser_settings.update(TOKEN_GENERATORS={"password_reset": RESET_GENERATOR})
+        generator = tokens.get_token_generator("password_reset")
+
+        assert isinstance(generator, TokenGenerator)
+        assert generator.key_salt == "password-reset"
+        assert tokens.get_token_generator("password_reset") is generator
+        assert tokens.get_token_generator("activation") is default_token_generator
+
+        djoser_settings["TOKEN_GENERATORS"] = {}
+        assert tokens.get_token_generator("password_reset") is not generator
+
+    def test_one_time_generator_gets_its_flow(self, djoser_settings):
+        djoser_settings.update(
+            TOKEN_GENERATORS={
+                "username_reset": {
+                    "NAME": "djoser.tokens.OneTimeTokenGenerator",
+                    "OPTIONS": {"timeout": 60},
+                }
+            }
+        )
+
+        generator = tokens.get_token_generator("username_reset")
+
+        assert isinstance(generator, OneTimeTokenGenerator)
+        assert (generator.flow, generator.timeout) == ("username_reset", 60)
+
+
+@pytest.mark.django_db
+class TestTokenGeneratorTimeout:
+    def test_token_expires_after_timeout(self):
+        user = UserFactory()
+        generator = TokenGenerator(timeout=60)
+        token = generator.make_token(user)
+        now = generator._now()
+
+        assert generator.check_token(user, token)
+        with mock.patch.object(
+            TokenGenerator, "_now", return_value=now + timedelta(seconds=61)
+        ):
+            assert not generator.check_token(user, token)
+
+    def test_token_outlives_password_reset_timeout(self, settings):
+        settings.PASSWORD_RESET_TIMEOUT = 60
+        user = UserFactory()
+        generator = TokenGenerator(timeout=3600)
+        token = generator.make_token(user)
+
+        with mock.patch.object(
+            TokenGenerator,
+            "_now",
+            return_value=generator._now() + timedelta(seconds=120),
+        ):
+            assert generator.check_token(user, token)
+
+    def test_token_timeout_before_django_4_1(self):
+        user = UserFactory()
+        generator = TokenGenerator(timeout=60)
+        token = generator.make_token(user)
+        make_token_with_timestamp = TokenGenerator._make_token_with_timestamp
+
+        def two_arguments(self, user, timestamp):
+            # Django 4.0's signature, 3.2 has a legacy flag instead of secret
+            return make_token_with_timestamp(self, user, timestamp, self.secret)
+
+        with (
+            mock.patch("django.VERSION", (4, 0, 0, "final", 0)),
+            mock.patch.object(
+                TokenGenerator, "_make_token_with_timestamp", two_arguments
+            ),
+        ):
+            assert generator.check_token(user, token)
+            assert not generator.check_token(user, token[:-1] + "x")
+
+    def test_secret_and_salt_separate_tokens(self):
+        user = UserFactory()
+        token = TokenGenerator(secret="s1").make_token(user)
+
+        assert TokenGenerator(secret="s1").check_token(user, token)
+        assert not TokenGenerator(secret="s2").check_token(user, token)
+        assert not TokenGenerator(secret="s1", key_salt="x").check_token(user, token)
+
+
+@pytest.mark.django_db
+class TestPerFlowTokens:
+    @pytest.fixture(autouse=True)
+    def setup(self, djoser_settings):
+        djoser_settings.update(TOKEN_GENERATORS={"password_reset": RESET_GENERATOR})
+        caches["default"].clear()
+        self.user = UserFactory()
+
+    def test_emailed_token_is_checked_by_its_generator(self, api_client, mailoutbox):
+        api_client.post(reverse("user-reset-password"), {"email": self.user.email})
+        uid, token = re.search(
+            r"#/password/reset/confirm/([^/]+)/(\S+)", mailoutbox[0].body
+        ).groups()
+        data = {"uid": uid, "token": token, "new_password": "new_secret123!"}
+
+        response = api_client.post(reverse("user-reset-password-confirm"), data)
+
+        assert response.status_code == status.HTTP_204_NO_CONTENT
+
+    def test_token_of_another_flow_is_rejected(self, api_client):
+        data = {
+            "uid": encode_uid(self.user.pk),
+            "token": default_token_generator.make_token(self.user),
+            "new_password": "new_secret123!",
+        }
+
+        response = api_client.post(reverse("user-reset-password-confirm"), data)
+
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        assert "token" in response.data
+
+
+@pytest.mark.django_db
+class TestViewTokenGeneratorOverride:
+    @pytest.fixture(autouse=True)
+    def setup(self):
+        self.user = UserFactory()
+        self.generator = TokenGenerator(key_salt="custom")
+
+    def test_overridden_token_generator_is_honoured(self, api_client):
+        data = {
+            "uid": encode_uid(self.user.pk),
+            "token": self.generator.make_token(self.user),
+            "new_password": "new_secret123!",
+        }
+
+        with (
+            mock.patch("djoser.views.UserViewSet.token_generator", self.generator),
+            pytest.warns(DeprecationWarning, match="token_generator"),
+        ):
+            response = api_client.post(reverse("user-reset-password-confirm"), data)
+
+        assert response.status_code == status.HTTP_204_NO_CONTENT
+
+    def test_default_token_generator_uses_token_generators(self, recwarn):
+        from djoser.views import UserViewSet
+
+        view = UserViewSet(action="reset_password_confirm")
+
+        assert view.get_token_generator() is default_token_generator
+        assert not [w for w in recwarn if w.category is DeprecationWarning]
@@ -0,0 +1,149 @@
+from datetime import timedelta
+from unittest import mock
+
+import pytest
+from django.contrib.auth import get_user_model
+from rest_framework import status
+from rest_framework.authtoken.models import Token
+from rest_framework.reverse import reverse
+from testapp.factories import CustomUserFactory, TokenFactory, UserFactory
+from testapp.models import CustomUser
+
+from djoser import signals
+from djoser.views import UserViewSet
+
+User = get_user_model()
+
+
+@pytest.fixture
+def staff_client(api_client, create_superuser):
+    api_client.force_authenticate(user=create_superuser)
+    return api_client
+
+
+@pytest.mark.django_db
+class TestUserBulkDeactivateView:
+    @pytest.fixture(autouse=True)
+    def setup(self):
+        self.base_url = reverse("user-bulk-deactivate")
+        self.users = UserFactory.create_batch(5)
+
+    def test_staff_can_deactivate_users_by_id(self, staff_client):
+        picked = self.users[:3]
+
+        response = staff_client.post(
+            self.base_url, {"ids": [u.pk for u in picked]}, format="json"
+        )
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.data == {"count": 3}
+        assert set(User.objects.filter(is_active=False)) == set(picked)
+
+    def test_deactivates_in_primary_key_chunks(
+        self, staff_client, django_assert_num_queries
+    ):
+        # token revocation, then a SELECT and an UPDATE per chunk of two
+        # users, and the final empty SELECT
+        with mock.patch.object(UserViewSet, "bulk_action_chunk_size", 2):
+            with django_assert_num_queries(1 + 3 * 2 + 1):
+                response = staff_client.post(self.base_url, {"all": True})
+
+        assert response.data == {"count": 5}
+        assert not User.objects.filter(pk__in=[u.pk for u in self.users]).filter(
+            is_active=True
+        )
+
+    def test_tokens_of_deactivated_users_are_revoked(self, staff_client):
+        kept = TokenFactory(user=self.users[0])
+        TokenFactory(user=self.users[1])
+
+        staff_client.post(self.base_url, {"ids": [self.users[1].pk]}, format="json")
+
+        assert list(Token.objects.all()) == [kept]
+
+    def test_sends_single_signal(self, staff_client):
+        receiver = mock.Mock()
+        signals.users_deactivated.connect(receiver)
+        try:
+            with mock.patch.object(UserViewSet, "bulk_action_chunk_size", 2):
+                staff_client.post(self.base_url, {"all": True})
+        finally:
+            signals.users_deactivated.disconnect(receiver)
+
+        receiver.assert_called_once()
+        assert receiver.call_args.kwargs["user_ids"] == sorted(u.pk for u in self.users)
+
+    def test_requesting_user_is_left_out(self, staff_client, create_superuser):
+        staff_client.post(self.base_url, {"all": True})
+
+        create_superuser.refresh_from_db()
+        assert create_superuser.is_active
+
+    @pytest.mark.parametrize(
+        "data", [{}, {"ids": [1], "all": True}, {"ids": []}, {"ids": ["x"]}]
+    )
+    def test_invalid_scope(self, staff_client, data):
+        response = staff_client.post(self.base_url, data, format="json")
+
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        assert User.objects.filter(is_active=False).count() == 0
+
+    def test_updates_auto_now_fields(self, staff_client):
+        user = CustomUserFactory()
+        stale = user.updated_at - timedelta(days=1)
+        CustomUser.objects.filter(pk=user.pk).update(updated_at=stale)
+
+        with mock.patch.object(UserViewSet, "queryset", CustomUser.objects.all()):
+            staff_client.post(self.base_url, {"all": True})
+
+        user.refresh_from_db()
+        assert not user.is_active
+        assert user.updated_at > stale
+
+    def test_non_staff_cannot_deactivate(self, api_client, user):
+        api_client.force_authenticate(user=user)
+
+        response = api_client.post(self.base_url, {"all": True})
+
+        assert response.status_code == status.HTTP_403_FORBIDDEN
+
+
+@pytest.mark.django_db
+class TestUserBulkDeleteView:
+    @pytest.fixture(autouse=True)
+    def setup(self):
+        self.base_url = reverse("user-bulk-delete")
+        self.users = UserFactory.create_batch(5)
+
+    def test_staff_can_delete_users_by_id(self, staff_client):
+        TokenFactory(user=self.users[0])
+
+        response = staff_client.post(
+            self.base_url, {"ids": [u.pk for u in self.users[:3]]}, format="json"
+        )
+
+        assert response.data == {"count": 3}
+        assert set(User.objects.filter(is_staff=False)) == set(self.users[3:])
+        assert not Token.objects.exists()
+
+    def test_sends_single_signal(self, staff_client):
+        receiver = mock.Mock()
+        signals.users_deleted.connect(receiver)
+        try:
+            with mock.patch.object(UserViewSet, "bulk_action_chunk_size", 2):
+                response = staff_client.post(self.base_url, {"all": True})
+        finally:
+            signals.users_deleted.disconnect(receiver)
+
+        assert response.data == {"count": 5}
+        receiver.assert_called_once()
+        assert len(receiver.call_args.kwargs["user_ids"]) == 5
+        assert list(User.objects.all()) == [User.objects.get(is_staff=True)]
+
+    def test_non_staff_cannot_delete(self, api_client, user):
+        api_client.force_authenticate(user=user)
+
+        response = api_client.post(self.base_url, {"all": True})
+
+        assert response.status_code == status.HTTP_403_FORBIDDEN
+        assert User.objects.count() == 6
@@ -0,0 +1,167 @@
+from unittest import mock
+
+import pytest
+from django.contrib.auth import get_user_model
+from django.db import connection
+from rest_framework import status
+from rest_framework.reverse import reverse
+
+from djoser import signals
+from djoser.utils import encode_uid
+
+User = get_user_model()
+
+
+def user_data(username, **kwargs):
+    return {
+        "username": username,
+        "email": f"{username}@beatles.com",
+        "password": "secret123!",
+        **kwargs,
+    }
+
+
+@pytest.mark.django_db
+class TestUserBulkCreateView:
+    @pytest.fixture(autouse=True)
+    def setup(self, api_client, create_superuser, djoser_settings):
+        self.base_url = reverse("user-bulk-create")
+        api_client.force_authenticate(user=create_superuser)
+        djoser_settings["PASSWORD_HASHING_WORKERS"] = 1
+
+    def test_staff_can_create_users(self, api_client):
+        data = [user_data("john"), user_data("paul")]
+
+        response = api_client.post(self.base_url, data, format="json")
+
+        assert response.status_code == status.HTTP_201_CREATED
+        assert [u["username"] for u in response.data["created"]] == ["john", "paul"]
+        assert response.data["errors"] == []
+        john = User.objects.get(username="john")
+        assert john.check_password("secret123!")
+        assert response.data["created"][0]["id"] == john.pk
+
+    def test_invalid_items_do_not_abort_the_batch(self, api_client, user):
+        data = [
+            user_data("john"),
+            user_data(user.username),
+            user_data("paul", password="666"),
+            user_data("john", email="another@beatles.com"),
+            user_data("george"),
+        ]
+
+        response = api_client.post(self.base_url, data, format="json")
+
+        assert response.status_code == status.HTTP_207_MULTI_STATUS
+        assert [u["username"] for u in response.data["created"]] == ["john", "george"]
+        assert [e["index"] for e in response.data["errors"]] == [1, 2, 3]
+        assert "username" in response.data["errors"][0]["errors"]
+        assert "password" in response.data["errors"][1]["errors"]
+        assert response.data["errors"][2]["errors"] == {
+            "username": ["Duplicates an earlier user in this batch."]
+        }
+        assert not User.objects.filter(username="paul").exists()
+
+    def test_fails_when_no_user_is_created(self, api_client):
+        data = [user_data("john", password="666")]
+
+        response = api_client.post(self.base_url, data, format="json")
+
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        assert response.data["created"] == []
+
+    def test_constraint_violations_only_fail_offending_rows(self, api_client):
+        data = [user_data("john"), user_data("paul")]
+
+        with mock.patch(
+            "djoser.views.UserViewSet.validate_bulk_create",
+            side_effect=lambda items, errors: [
+                (0, {"username": "john", "password": "secret123!"}),
+                (1, {"username": "john", "password": "secret123!"}),
+            ],
+        ):
+            response = api_client.post(self.base_url, data, format="json")
+
+        assert response.status_code == status.HTTP_207_MULTI_STATUS
+        assert len(response.data["created"]) == 1
+        assert response.data["errors"] == [
+            {"index": 1, "errors": {"non_field_errors": ["Unable to create account."]}}
+        ]
+        assert User.objects.filter(username="john").count() == 1
+
+    def test_user_registered_is_sent_per_user(self, api_client):
+        receiver = mock.Mock()
+        signals.user_registered.connect(receiver)
+        try:
+            api_client.post(
+                self.base_url,
+                [user_data("john"), user_data("paul")],
+                format="json",
+            )
+        finally:
+            signals.user_registered.disconnect(receiver)
+
+        registered = [call.kwargs["user"].username for call in receiver.call_args_list]
+        assert registered == ["john", "paul"]
+
+    def test_users_await_activation(self, api_client, djoser_settings, mailoutbox):
+        djoser_settings["SEND_ACTIVATION_EMAIL"] = True
+
+        api_client.post(self.base_url, [user_data("john")], format="json")
+
+        assert not User.objects.get(username="john").is_active
+        assert len(mailoutbox) == 1
+
+    def test_primary_keys_without_returning_bulk_inserts(
+        self, api_client, djoser_settings, mailoutbox
+    ):
+        djoser_settings["SEND_ACTIVATION_EMAIL"] = True
+        receiver = mock.Mock()
+        signals.user_registered.connect(receiver)
+        try:
+            with mock.patch.object(
+                type(connection.features), "can_return_rows_from_bulk_insert", False
+            ):
+                response = api_client.post(
+                    self.base_url,
+                    [user_data("john"), user_data("paul")],
+                    format="json",
+                )
+        finally:
+            signals.user_registered.disconnect(receiver)
+
+        john, paul = User.objects.get(username="john"), User.objects.get(
+            username="paul"
+        )
+        assert [u["id"] for u in response.data["created"]] == [john.pk, paul.pk]
+        registered = [call.kwargs["user"] for call in receiver.call_args_list]
+        assert [user.pk for user in registered] == [john.pk, paul.pk]
+        assert not any(user._state.adding for user in registered)
+        assert f"#/activate/{encode_uid(john.pk)}/" in mailoutbox[0].body
+
+    def test_passwords_are_hashed_in_worker_processes(
+        self, api_client, djoser_settings
+    ):
+        djoser_settings["PASSWORD_HASHING_WORKERS"] = 2
+        data = [user_data(f"user{i}") for i in range(4)]
+
+        response = api_client.post(self.base_url, data, format="json")
+
+        assert response.status_code == status.HTTP_201_CREATED
+        assert all(
+            user.check_password("secret123!")
+            for user in User.objects.filter(username__startswith="user")
+        )
+
+    def test_payload_must_be_a_list(self, api_client):
+        response = api_client.post(self.base_url, user_data("john"), format="json")
+
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        assert response.data == {"non_field_errors": ["Expected a list of users."]}
+
+    def test_non_staff_cannot_bulk_create(self, api_client, user):
+        api_client.force_authenticate(user=user)
+
+        response = api_client.post(self.base_url, [user_data("john")], format="json")
+
+        assert response.status_code == status.HTTP_403_FORBIDDEN
@@ -66,6 +66,31 @@ class TestUserCreateView:
 
         assert response.status_code == status.HTTP_400_BAD_REQUEST
 
+    def test_taken_username_fails_before_hashing(
+        self, api_client, user, django_assert_num_queries
+    ):
+        data = {"username": user.username, "password": "secret"}
+
+        with mock.patch("djoser.serializers.validate_password") as validate:
+            with mock.patch.object(User, "set_password") as set_password:
+                with django_assert_num_queries(1):
+                    response = api_client.post(self.base_url, data)
+
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        assert response.data["username"][0].code == "unique"
+        validate.assert_not_called()
+        set_password.assert_not_called()
+
+    def test_taken_username_is_compared_normalized(self, api_client):
+        User.objects.create_user(username="fiona", password="secret")
+        # create_user would store the ligature as "fi"
+        data = {"username": "\ufb01ona", "password": "secret"}
+
+        response = api_client.post(self.base_url, data)
+
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        assert list(response.data) == ["username"]
+
     def test_post_not_register_if_fails_password_validation(self, api_client):
         data = {"username": "john", "password": "666", "csrftoken": "asdf"}
         response = api_client.post(self.base_url, data)
@@ -1,14 +1,19 @@
 from unittest import mock
 
-from testapp.factories import UserFactory
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from testapp.factories import TokenFactory, UserFactory
 import pytest
-from rest_framework import status
+from rest_framework import serializers, status
 from rest_framework.reverse import reverse
 
 import djoser.permissions
 import djoser.views
 import djoser.signals
 
+User = get_user_model()
+
 # The classes handling user-detail requests differ between the monolithic
 # UserViewSet (2.x) and the split views (3.x); patch whichever exist.
 USER_DETAIL_VIEW_CLASS_NAMES = [
@@ -252,3 +257,71 @@ class TestModifiedPermissionsViewSetEdit:
 
         another_user.refresh_from_db()
         assert another_user.email == "paulmc@beatles.com"
+
+
+class TokenUserSerializer(serializers.ModelSerializer):
+    auth_token = serializers.CharField(source="auth_token.key")
+
+    class Meta:
+        model = User
+        fields = ("id", "username", "auth_token")
+        select_related = ("auth_token",)
+
+
+class FullNameUserSerializer(serializers.ModelSerializer):
+    full_name = serializers.CharField(source="get_full_name")
+
+    class Meta:
+        model = User
+        fields = ("id", "full_name")
+
+
+@pytest.mark.django_db
+class TestUserQuerysetNarrowing:
+    @pytest.fixture(autouse=True)
+    def setup(self, user, create_superuser, api_client):
+        self.user = user
+        self.client = api_client
+        self.client.force_authenticate(user=create_superuser)
+
+    def get_user_select(self, url):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(url)
+        assert response.status_code == status.HTTP_200_OK
+        (sql,) = [q["sql"] for q in queries if '"auth_user"."id"' in q["sql"]]
+        return response, sql
+
+    def test_retrieve_loads_only_serializer_columns(self):
+        _, sql = self.get_user_select(reverse("user-detail", args=[self.user.pk]))
+
+        assert '"auth_user"."email"' in sql
+        assert '"auth_user"."password"' not in sql
+        assert '"auth_user"."last_login"' not in sql
+
+    def test_list_loads_only_serializer_columns(self):
+        _, sql = self.get_user_select(reverse("user-list"))
+
+        assert '"auth_user"."username"' in sql
+        assert '"auth_user"."password"' not in sql
+
+    def test_serializer_select_related_is_applied(self, djoser_settings):
+        TokenFactory.create(user=self.user)
+        djoser_settings["SERIALIZERS"] = {"user": TokenUserSerializer}
+
+        response, sql = self.get_user_select(
+            reverse("user-detail", args=[self.user.pk])
+        )
+
+        assert response.data["auth_token"] == self.user.auth_token.key
+        assert '"authtoken_token"."key"' in sql
+        assert '"auth_user"."password"' not in sql
+
+    def test_fields_not_backed_by_model_fields_disable_narrowing(self, djoser_settings):
+        djoser_settings["SERIALIZERS"] = {"user": FullNameUserSerializer}
+
+        response, sql = self.get_user_select(
+            reverse("user-detail", args=[self.user.pk])
+        )
+
+        assert response.data["full_name"] == self.user.get_full_name()
+        assert '"auth_user"."password"' in sql
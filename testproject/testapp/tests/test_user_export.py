@@ -0,0 +1,119 @@
+import csv
+import json
+
+import pytest
+from rest_framework import status
+from rest_framework.reverse import reverse
+from testapp.factories import UserFactory
+
+from djoser import constants
+
+
+@pytest.mark.django_db
+class TestUserExportView:
+    @pytest.fixture(autouse=True)
+    def setup(self, user, create_superuser):
+        self.base_url = reverse("user-export")
+        self.user = user
+        self.superuser = create_superuser
+        self.others = UserFactory.create_batch(2)
+
+    def test_staff_can_export_users_as_ndjson(self, api_client):
+        api_client.force_authenticate(user=self.superuser)
+
+        response = api_client.get(self.base_url)
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.streaming
+        assert response["Content-Type"] == "application/x-ndjson"
+        rows = [
+            json.loads(line)
+            for line in b"".join(response.streaming_content).decode().splitlines()
+        ]
+        users = sorted([self.user, self.superuser, *self.others], key=lambda u: u.pk)
+        assert [row["id"] for row in rows] == [u.pk for u in users]
+        assert rows[0] == {
+            "id": users[0].pk,
+            "username": users[0].username,
+            "email": users[0].email,
+        }
+
+    def test_staff_can_export_users_as_csv(self, api_client):
+        api_client.force_authenticate(user=self.superuser)
+
+        response = api_client.get(self.base_url, {"export_format": "csv"})
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response["Content-Type"] == "text/csv"
+        content = b"".join(response.streaming_content).decode()
+        rows = list(csv.DictReader(content.splitlines()))
+        assert len(rows) == 4
+        assert rows[0] == {
+            "email": self.user.email,
+            "id": str(self.user.pk),
+            "username": self.user.username,
+        }
+
+    def test_csv_cells_are_not_formulas(self, api_client):
+        api_client.force_authenticate(user=self.superuser)
+        self.user.username = "=HYPERLINK(1)"
+        self.user.email = "@SUM(1)@beatles.com"
+        self.user.save()
+
+        response = api_client.get(self.base_url, {"export_format": "csv"})
+
+        content = b"".join(response.streaming_content).decode()
+        row = next(csv.DictReader(content.splitlines()))
+        assert row["username"] == "'=HYPERLINK(1)"
+        assert row["email"] == "'@SUM(1)@beatles.com"
+
+    def test_export_supports_sparse_fieldsets(self, api_client, djoser_settings):
+        djoser_settings["SPARSE_FIELDSETS"] = True
+        api_client.force_authenticate(user=self.superuser)
+
+        response = api_client.get(self.base_url, {"fields": "id"})
+
+        lines = b"".join(response.streaming_content).decode().splitlines()
+        assert json.loads(lines[0]) == {"id": self.user.pk}
+
+    def test_unknown_export_format_is_rejected(self, api_client):
+        api_client.force_authenticate(user=self.superuser)
+
+        response = api_client.get(self.base_url, {"export_format": "xml"})
+
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        assert response.data["export_format"] == ['"xml" is not a valid choice.']
+
+    def test_unknown_export_format_message_is_configurable(
+        self, api_client, djoser_settings
+    ):
+        djoser_settings["CONSTANTS"] = {
+            "messages": "testapp.tests.test_user_export.Messages"
+        }
+        api_client.force_authenticate(user=self.superuser)
+
+        response = api_client.get(self.base_url, {"export_format": "xml"})
+
+        assert response.data["export_format"] == ["No xml export."]
+
+    def test_regular_user_cannot_export_users(self, api_client):
+        api_client.force_authenticate(user=self.user)
+
+        response = api_client.get(self.base_url)
+
+        assert response.status_code == status.HTTP_403_FORBIDDEN
+
+    def test_export_permission_is_configurable(self, api_client, djoser_settings):
+        djoser_settings["PERMISSIONS"] = {
+            "user_export": ["rest_framework.permissions.IsAuthenticated"]
+        }
+        api_client.force_authenticate(user=self.user)
+
+        response = api_client.get(self.base_url)
+
+        lines = b"".join(response.streaming_content).decode().splitlines()
+        assert [json.loads(line)["id"] for line in lines] == [self.user.pk]
+
+
+class Messages(constants.Messages):
+    INVALID_EXPORT_FORMAT_ERROR = "No {export_format} export."
@@ -1,6 +1,20 @@
+from unittest import mock
+
 import pytest
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.db.models import Index
+from django.db.models.functions import Collate, Lower, Upper
+from django.test.utils import CaptureQueriesContext
 from rest_framework import status
 from rest_framework.reverse import reverse
+from testapp.factories import UserFactory
+
+from djoser.checks import check_user_search_indexes
+from djoser.filters import get_search_expression
+from djoser.pagination import UserCursorPagination
+
+User = get_user_model()
 
 
 class TestUserListView:
@@ -35,3 +49,155 @@ class TestUserListView:
 
         assert response.status_code == status.HTTP_200_OK
         assert len(response.json()) == 2
+
+
+class TestUserListCursorPagination:
+    @pytest.fixture(autouse=True)
+    def setup(self, create_superuser, djoser_settings):
+        self.base_url = reverse("user-list")
+        self.superuser = create_superuser
+        self.users = UserFactory.create_batch(4)
+        djoser_settings["USER_LIST_PAGINATION_CLASS"] = (
+            "djoser.pagination.UserCursorPagination"
+        )
+
+    def test_pages_follow_user_id_order(self, api_client, monkeypatch):
+        monkeypatch.setattr(UserCursorPagination, "page_size", 2)
+        api_client.force_authenticate(user=self.superuser)
+
+        ids = []
+        url = self.base_url
+        while url:
+            response = api_client.get(url)
+            assert response.status_code == status.HTTP_200_OK
+            ids += [user["id"] for user in response.data["results"]]
+            url = response.data["next"]
+
+        assert ids == sorted(user.pk for user in [self.superuser, *self.users])
+
+    def test_no_count_query(self, api_client):
+        api_client.force_authenticate(user=self.superuser)
+
+        with CaptureQueriesContext(connection) as queries:
+            response = api_client.get(self.base_url)
+
+        assert response.status_code == status.HTTP_200_OK
+        assert "count" not in response.data
+        assert not any("COUNT(" in query["sql"] for query in queries)
+
+    def test_hide_users_still_applies(self, api_client, djoser_settings):
+        djoser_settings["HIDE_USERS"] = True
+        api_client.force_authenticate(user=self.users[0])
+
+        response = api_client.get(self.base_url)
+
+        assert [user["id"] for user in response.data["results"]] == [self.users[0].pk]
+
+
+class TestUserListSearch:
+    @pytest.fixture(autouse=True)
+    def setup(self, api_client, create_superuser, djoser_settings):
+        djoser_settings["USER_SEARCH"] = True
+        self.base_url = reverse("user-list")
+        api_client.force_authenticate(user=create_superuser)
+        UserFactory(username="John", email="lennon@beatles.com")
+        UserFactory(username="johnny", email="cash@example.com", is_active=False)
+        UserFactory(username="paul", email="JOHN.paul@example.com")
+        UserFactory(username="jo_hn", email="george@beatles.com")
+
+    def search(self, api_client, **params):
+        response = api_client.get(self.base_url, params)
+        assert response.status_code == status.HTTP_200_OK
+        return sorted(user["username"] for user in response.data)
+
+    def test_matches_login_or_email_prefix_ignoring_case(self, api_client):
+        assert self.search(api_client, search="JOHN") == ["John", "johnny", "paul"]
+
+    def test_prefix_wildcards_are_literal(self, api_client):
+        assert self.search(api_client, search="jo_") == ["jo_hn"]
+
+    def test_filters_by_is_active(self, api_client):
+        assert self.search(api_client, search="john", is_active="false") == ["johnny"]
+
+    def test_invalid_is_active_is_rejected(self, api_client):
+        response = api_client.get(self.base_url, {"is_active": "maybe"})
+
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        assert "is_active" in response.data
+
+    def test_search_is_a_range_on_lowered_columns(self, api_client):
+        with CaptureQueriesContext(connection) as queries:
+            api_client.get(self.base_url, {"search": "jo"})
+
+        (sql,) = [q["sql"] for q in queries if 'FROM "auth_user"' in q["sql"]]
+        assert 'LOWER("auth_user"."username") >= \'jo\'' in sql
+        assert 'LOWER("auth_user"."username") < \'jp\'' in sql
+
+    def test_search_is_not_a_range_where_strings_may_not_sort_by_code_point(
+        self, api_client
+    ):
+        with (
+            mock.patch.object(connection, "vendor", "mysql"),
+            CaptureQueriesContext(connection) as queries,
+        ):
+            api_client.get(self.base_url, {"search": "jo"})
+
+        (sql,) = [q["sql"] for q in queries if 'FROM "auth_user"' in q["sql"]]
+        assert "LIKE 'jo%'" in sql
+        assert "<" not in sql and ">=" not in sql
+
+    def test_search_expression_is_collated_on_postgresql(self):
+        expression = get_search_expression("username", "postgresql")
+
+        assert isinstance(expression, Collate)
+        assert expression.collation == "C"
+        assert get_search_expression("username", "sqlite") == Lower("username")
+
+    def test_parameters_are_ignored_when_disabled(self, api_client, djoser_settings):
+        djoser_settings["USER_SEARCH"] = False
+
+        assert len(self.search(api_client, search="john", is_active="false")) == 5
+
+
+class TestUserSearchIndexCheck:
+    def test_warns_about_missing_indexes(self, djoser_settings):
+        djoser_settings["USER_SEARCH"] = True
+
+        warnings = check_user_search_indexes(None)
+
+        assert [w.id for w in warnings] == ["djoser.W001", "djoser.W001"]
+        assert "Lower('username')" in warnings[0].msg
+        assert "Lower('email')" in warnings[1].msg
+
+    def test_passes_with_lowered_indexes(self, djoser_settings):
+        djoser_settings["USER_SEARCH"] = True
+        indexes = [
+            Index(Lower("username"), name="user_username_lower"),
+            Index(Upper("first_name"), Lower("email"), name="user_email_lower"),
+        ]
+
+        with mock.patch.object(User._meta, "indexes", indexes):
+            assert check_user_search_indexes(None) == []
+
+    def test_requires_c_collated_indexes_on_postgresql(self, djoser_settings):
+        djoser_settings["USER_SEARCH"] = True
+        lowered = [
+            Index(Lower("username"), name="user_username_lower"),
+            Index(Lower("email"), name="user_email_lower"),
+        ]
+        collated = [
+            Index(Collate(Lower("username"), "C"), name="user_username_lower"),
+            Index(Collate(Lower("email"), "C"), name="user_email_lower"),
+        ]
+
+        with mock.patch.object(connection, "vendor", "postgresql"):
+            with mock.patch.object(User._meta, "indexes", lowered):
+                warnings = check_user_search_indexes(None)
+            with mock.patch.object(User._meta, "indexes", collated):
+                assert check_user_search_indexes(None) == []
+
+        assert "Collate(Lower('username'), 'C')" in warnings[0].msg
+        assert len(warnings) == 2
+
+    def test_silent_when_search_is_disabled(self):
+        assert check_user_search_indexes(None) == []
@@ -1,8 +1,15 @@
+from unittest import mock
+
 import pytest
 from django.contrib.auth import get_user_model
+from django.core.cache import caches
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
 from rest_framework import serializers, status
 from rest_framework.reverse import reverse
 
+from djoser import signals
+
 User = get_user_model()
 
 
@@ -124,3 +131,243 @@ class TestUserMeDeleteView:
 
         assert response.status_code == status.HTTP_400_BAD_REQUEST
         assert response.data == {"current_password": ["Invalid password."]}
+
+
+@pytest.mark.django_db
+class TestUserSparseFieldsets:
+    @pytest.fixture(autouse=True)
+    def setup(self, djoser_settings):
+        djoser_settings["SPARSE_FIELDSETS"] = True
+
+    def test_me_returns_only_requested_fields(self, authenticated_client, user):
+        response = authenticated_client.get(reverse("user-me"), {"fields": "id,email"})
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.data == {"id": user.pk, "email": user.email}
+
+    def test_retrieve_narrows_queryset_to_requested_fields(
+        self, authenticated_client, user
+    ):
+        url = reverse("user-detail", args=[user.pk])
+
+        with CaptureQueriesContext(connection) as queries:
+            response = authenticated_client.get(url, {"fields": "id"})
+
+        assert response.data == {"id": user.pk}
+        (sql,) = [q["sql"] for q in queries if 'FROM "auth_user"' in q["sql"]]
+        assert '"auth_user"."email"' not in sql
+
+    def test_list_returns_only_requested_fields(self, authenticated_client, user):
+        response = authenticated_client.get(reverse("user-list"), {"fields": "email"})
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.data == [{"email": user.email}]
+
+    def test_undeclared_fields_are_rejected(self, authenticated_client):
+        response = authenticated_client.get(
+            reverse("user-me"), {"fields": "id,password,is_staff"}
+        )
+
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        assert response.data == {
+            "fields": ["Unknown fields requested: password, is_staff."]
+        }
+
+    def test_fields_param_is_ignored_when_disabled(
+        self, authenticated_client, djoser_settings
+    ):
+        djoser_settings["SPARSE_FIELDSETS"] = False
+
+        response = authenticated_client.get(reverse("user-me"), {"fields": "id"})
+
+        assert response.status_code == status.HTTP_200_OK
+        assert len(response.data) > 1
+
+
+@pytest.mark.django_db
+class TestUserETags:
+    @pytest.fixture(autouse=True)
+    def setup(self, djoser_settings):
+        djoser_settings["USER_ETAGS"] = True
+        caches["default"].clear()
+
+    def test_me_returns_weak_etag(self, authenticated_client):
+        response = authenticated_client.get(reverse("user-me"))
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response["ETag"].startswith('W/"')
+
+    def test_me_not_modified_only_authenticates(
+        self, authenticated_client, django_assert_num_queries
+    ):
+        etag = authenticated_client.get(reverse("user-me"))["ETag"]
+
+        with django_assert_num_queries(1):
+            response = authenticated_client.get(
+                reverse("user-me"), HTTP_IF_NONE_MATCH=etag
+            )
+
+        assert response.status_code == status.HTTP_304_NOT_MODIFIED
+        assert response["ETag"] == etag
+        assert not response.content
+
+    def test_retrieve_not_modified_skips_serializer_columns(
+        self, authenticated_client, user
+    ):
+        url = reverse("user-detail", args=[user.pk])
+        etag = authenticated_client.get(url)["ETag"]
+
+        with CaptureQueriesContext(connection) as queries:
+            response = authenticated_client.get(url, HTTP_IF_NONE_MATCH=etag)
+
+        assert response.status_code == status.HTTP_304_NOT_MODIFIED
+        assert len(queries) == 2
+        assert '"auth_user"."email"' not in queries[1]["sql"]
+
+    def test_etag_changes_after_update(self, authenticated_client):
+        etag = authenticated_client.get(reverse("user-me"))["ETag"]
+        authenticated_client.patch(reverse("user-me"), {"email": "ringo@beatles.com"})
+
+        response = authenticated_client.get(reverse("user-me"), HTTP_IF_NONE_MATCH=etag)
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response["ETag"] != etag
+        assert response.data["email"] == "ringo@beatles.com"
+
+    def test_etag_changes_after_set_password(self, authenticated_client):
+        etag = authenticated_client.get(reverse("user-me"))["ETag"]
+        authenticated_client.post(
+            reverse("user-set-password"),
+            {"current_password": "secret", "new_password": "new_secret123!"},
+        )
+
+        response = authenticated_client.get(reverse("user-me"), HTTP_IF_NONE_MATCH=etag)
+
+        assert response.status_code == status.HTTP_200_OK
+
+    def test_etag_depends_on_requested_fields(
+        self, authenticated_client, djoser_settings
+    ):
+        djoser_settings["SPARSE_FIELDSETS"] = True
+        etag = authenticated_client.get(reverse("user-me"))["ETag"]
+
+        response = authenticated_client.get(
+            reverse("user-me"), {"fields": "id"}, HTTP_IF_NONE_MATCH=etag
+        )
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.data == {"id": response.data["id"]}
+
+    def test_no_etag_when_disabled(self, authenticated_client, djoser_settings):
+        djoser_settings["USER_ETAGS"] = False
+
+        response = authenticated_client.get(reverse("user-me"), HTTP_IF_NONE_MATCH="*")
+
+        assert response.status_code == status.HTTP_200_OK
+        assert "ETag" not in response
+
+
+@pytest.mark.django_db
+class TestUserMeCache:
+    @pytest.fixture(autouse=True)
+    def setup(self, djoser_settings):
+        djoser_settings["CACHE_USER_ME"] = True
+        caches["default"].clear()
+
+    def test_cache_hit_skips_serializer(self, authenticated_client, user):
+        authenticated_client.get(reverse("user-me"))
+
+        with mock.patch(
+            "rest_framework.serializers.ModelSerializer.to_representation"
+        ) as to_representation:
+            response = authenticated_client.get(reverse("user-me"))
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.data["email"] == user.email
+        to_representation.assert_not_called()
+
+    def test_update_invalidates_cache(self, authenticated_client):
+        authenticated_client.get(reverse("user-me"))
+        authenticated_client.patch(reverse("user-me"), {"email": "ringo@beatles.com"})
+
+        response = authenticated_client.get(reverse("user-me"))
+
+        assert response.data["email"] == "ringo@beatles.com"
+
+    def test_user_updated_signal_invalidates_cache(self, authenticated_client, user):
+        authenticated_client.get(reverse("user-me"))
+        User.objects.filter(pk=user.pk).update(email="ringo@beatles.com")
+        user.email = "ringo@beatles.com"
+        signals.user_updated.send(sender=None, user=user, request=None)
+
+        response = authenticated_client.get(reverse("user-me"))
+
+        assert response.data["email"] == "ringo@beatles.com"
+
+    def test_set_username_invalidates_cache(self, authenticated_client):
+        authenticated_client.get(reverse("user-me"))
+        authenticated_client.post(
+            reverse(f"user-set-{User.USERNAME_FIELD}"),
+            {
+                f"new_{User.USERNAME_FIELD}": "ringo",
+                "current_password": "secret",
+            },
+        )
+
+        response = authenticated_client.get(reverse("user-me"))
+
+        assert response.data[User.USERNAME_FIELD] == "ringo"
+
+    def test_settings_reload_invalidates_cache(
+        self, authenticated_client, djoser_settings
+    ):
+        authenticated_client.get(reverse("user-me"))
+        djoser_settings["SERIALIZERS"] = {
+            "current_user": "testapp.tests.test_user_me.UsernameOnlySerializer"
+        }
+
+        response = authenticated_client.get(reverse("user-me"))
+
+        assert set(response.data) == {User.USERNAME_FIELD}
+
+    @pytest.fixture
+    def tenants(self, djoser_settings):
+        djoser_settings.update(
+            TENANT_RESOLVER=lambda request: request.headers.get("X-Tenant"),
+            TENANT_SETTINGS={"acme": {}, "globex": {}},
+        )
+        return djoser_settings
+
+    def test_cache_survives_settings_rebuilt_in_another_order(
+        self, authenticated_client, tenants
+    ):
+        authenticated_client.get(reverse("user-me"), HTTP_X_TENANT="acme")
+        authenticated_client.get(reverse("user-me"), HTTP_X_TENANT="globex")
+        # as in another process, the tenants' settings are built in another order
+        tenants["TENANT_SETTINGS_CACHE_SIZE"] = 128
+
+        with mock.patch(
+            "rest_framework.serializers.ModelSerializer.to_representation"
+        ) as to_representation:
+            authenticated_client.get(reverse("user-me"), HTTP_X_TENANT="globex")
+            authenticated_client.get(reverse("user-me"), HTTP_X_TENANT="acme")
+
+        to_representation.assert_not_called()
+
+    def test_update_invalidates_cache_of_other_tenants(
+        self, authenticated_client, tenants
+    ):
+        authenticated_client.get(reverse("user-me"), HTTP_X_TENANT="acme")
+        authenticated_client.patch(
+            reverse("user-me"), {"email": "ringo@beatles.com"}, HTTP_X_TENANT="globex"
+        )
+
+        response = authenticated_client.get(reverse("user-me"), HTTP_X_TENANT="acme")
+
+        assert response.data["email"] == "ringo@beatles.com"
+
+
+class UsernameOnlySerializer(serializers.ModelSerializer):
+    class Meta:
+        model = User
+        fields = (User.USERNAME_FIELD,)
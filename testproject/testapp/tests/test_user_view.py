@@ -110,3 +110,54 @@ def test_fail_404_without_permission(
     assert response1.status_code == status.HTTP_404_NOT_FOUND
     response2 = authenticated_client.get(user_url)
     assert response2.status_code == status.HTTP_200_OK
+
+
+def test_dispatch_tables_resolve_retype_serializers(djoser_settings):
+    from djoser import serializers, views
+
+    permission_table, serializer_table = views.UserViewSet.get_dispatch_tables()
+    assert serializer_table[("set_password", "POST")] is (
+        serializers.SetPasswordSerializer
+    )
+    assert serializer_table[("me", "DELETE")] is serializers.UserDeleteSerializer
+    assert serializer_table[("me", "PATCH")] is serializers.UserSerializer
+
+    djoser_settings["SET_PASSWORD_RETYPE"] = True
+    _, serializer_table = views.UserViewSet.get_dispatch_tables()
+    assert serializer_table[("set_password", "POST")] is (
+        serializers.SetPasswordRetypeSerializer
+    )
+
+
+def test_dispatch_tables_can_be_extended_by_subclasses():
+    from djoser import permissions, serializers, views
+
+    class CustomUserViewSet(views.UserViewSet):
+        permission_keys = {
+            **views.UserViewSet.permission_keys,
+            ("custom", None): "user_delete",
+        }
+        serializer_keys = {
+            **views.UserViewSet.serializer_keys,
+            ("custom", "POST"): "user_delete",
+        }
+
+    permission_table, serializer_table = CustomUserViewSet.get_dispatch_tables()
+    assert permission_table[("custom", "GET")] == [permissions.CurrentUserOrAdmin]
+    assert serializer_table[("custom", "POST")] is serializers.UserDeleteSerializer
+    assert ("custom", "GET") not in serializer_table
+    assert ("custom", None) not in views.UserViewSet.get_dispatch_tables()[0]
+
+
+def test_get_permissions_does_not_mutate_permission_classes():
+    from djoser import views
+    from djoser.conf import settings
+
+    viewset = views.UserViewSet()
+    viewset.action = "create"
+    viewset.request = None
+
+    viewset.get_permissions()
+
+    assert "permission_classes" not in viewset.__dict__
+    assert viewset.permission_classes == settings.PERMISSIONS.user
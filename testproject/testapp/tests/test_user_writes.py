@@ -0,0 +1,190 @@
+import re
+from datetime import timedelta
+from unittest import mock
+
+import pytest
+from django.contrib.auth import get_user_model
+from django.contrib.auth.tokens import default_token_generator
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework import status
+from rest_framework.reverse import reverse
+from testapp.factories import CustomUserFactory, UserFactory
+from testapp.models import CustomUser
+
+from djoser.serializers import UserSerializer
+from djoser.utils import encode_uid, get_update_fields, get_update_values
+
+User = get_user_model()
+
+
+def user_writes(queries):
+    """Return the columns set by each INSERT/UPDATE on the user table."""
+    writes = []
+    for query in queries:
+        sql = query["sql"]
+        if sql.startswith('UPDATE "auth_user" SET'):
+            set_clause = sql.split(" SET ", 1)[1].split(" WHERE ", 1)[0]
+            writes.append(("UPDATE", set(re.findall(r'"(\w+)" = ', set_clause))))
+        elif sql.startswith('INSERT INTO "auth_user"'):
+            writes.append(("INSERT", None))
+    return writes
+
+
+def post(client, url, data):
+    with CaptureQueriesContext(connection) as queries:
+        response = client.post(url, data)
+    return response, user_writes(queries)
+
+
+@pytest.mark.django_db
+class TestMinimalUserWrites:
+    @pytest.fixture(autouse=True)
+    def setup(self):
+        self.user = UserFactory(password="secret")
+        self.uid_and_token = {
+            "uid": encode_uid(self.user.pk),
+            "token": default_token_generator.make_token(self.user),
+        }
+
+    def test_activation_only_writes_is_active(self, api_client):
+        User.objects.filter(pk=self.user.pk).update(is_active=False)
+        self.user.is_active = False
+        data = {
+            "uid": encode_uid(self.user.pk),
+            "token": default_token_generator.make_token(self.user),
+        }
+
+        response, writes = post(api_client, reverse("user-activation"), data)
+
+        assert response.status_code == status.HTTP_204_NO_CONTENT
+        assert writes == [("UPDATE", {"is_active"})]
+
+    def test_set_password_only_writes_password(self, api_client):
+        api_client.force_authenticate(user=self.user)
+        data = {"current_password": "secret", "new_password": "new_secret123!"}
+
+        response, writes = post(api_client, reverse("user-set-password"), data)
+
+        assert response.status_code == status.HTTP_204_NO_CONTENT
+        assert writes == [("UPDATE", {"password"})]
+
+    def test_reset_password_confirm_writes_password_and_last_login(self, api_client):
+        data = {**self.uid_and_token, "new_password": "new_secret123!"}
+
+        response, writes = post(
+            api_client, reverse("user-reset-password-confirm"), data
+        )
+
+        assert response.status_code == status.HTTP_204_NO_CONTENT
+        assert writes == [("UPDATE", {"password", "last_login"})]
+
+    def test_set_username_only_writes_username(self, api_client):
+        api_client.force_authenticate(user=self.user)
+        data = {"new_username": "ringo", "current_password": "secret"}
+
+        response, writes = post(api_client, reverse("user-set-username"), data)
+
+        assert response.status_code == status.HTTP_204_NO_CONTENT
+        assert writes == [("UPDATE", {"username"})]
+
+    def test_reset_username_confirm_writes_username_and_last_login(self, api_client):
+        data = {**self.uid_and_token, "new_username": "ringo"}
+
+        response, writes = post(
+            api_client, reverse("user-reset-username-confirm"), data
+        )
+
+        assert response.status_code == status.HTTP_204_NO_CONTENT
+        assert writes == [("UPDATE", {"username", "last_login"})]
+
+    def test_update_writes_changed_fields_once(self, api_client, djoser_settings):
+        djoser_settings["SEND_ACTIVATION_EMAIL"] = True
+        api_client.force_authenticate(user=self.user)
+
+        with CaptureQueriesContext(connection) as queries:
+            response = api_client.patch(
+                reverse("user-me"), {"email": "ringo@beatles.com"}
+            )
+
+        assert response.status_code == status.HTTP_200_OK
+        assert user_writes(queries) == [("UPDATE", {"email", "is_active"})]
+
+    def test_update_without_changes_writes_nothing(self, api_client):
+        api_client.force_authenticate(user=self.user)
+
+        with CaptureQueriesContext(connection) as queries:
+            response = api_client.put(reverse("user-me"), {"email": self.user.email})
+
+        assert response.status_code == status.HTTP_200_OK
+        assert user_writes(queries) == []
+
+    def test_create_awaiting_activation_is_a_single_insert(
+        self, api_client, djoser_settings
+    ):
+        djoser_settings["SEND_ACTIVATION_EMAIL"] = True
+        data = {
+            "username": "john",
+            "email": "john@beatles.com",
+            "password": "secret123!",
+        }
+
+        response, writes = post(api_client, reverse("user-list"), data)
+
+        assert response.status_code == status.HTTP_201_CREATED
+        assert writes == [("INSERT", None)]
+        assert not User.objects.get(username="john").is_active
+
+
+@pytest.mark.django_db
+class TestAutoNowFields:
+    @pytest.fixture(autouse=True)
+    def setup(self):
+        self.user = CustomUserFactory(password="secret")
+        self.stale = self.user.updated_at - timedelta(days=1)
+        CustomUser.objects.filter(pk=self.user.pk).update(updated_at=self.stale)
+
+    def test_update_fields_include_auto_now_fields(self):
+        assert get_update_fields(self.user, ["password"]) == ["password", "updated_at"]
+        assert get_update_fields(UserFactory.build(), ["password"]) == ["password"]
+
+    def test_set_password_updates_auto_now_fields(self, api_client):
+        api_client.force_authenticate(user=self.user)
+        data = {"new_password": "new_secret123!", "current_password": "secret"}
+
+        response = api_client.post(reverse("user-set-password"), data)
+
+        assert response.status_code == status.HTTP_204_NO_CONTENT
+        self.user.refresh_from_db()
+        assert self.user.updated_at > self.stale
+
+    def test_update_values_include_auto_now_fields(self):
+        values = get_update_values(CustomUser, is_active=True)
+
+        assert values.keys() == {"is_active", "updated_at"}
+        assert values["updated_at"] > self.stale
+        assert get_update_values(User, is_active=True) == {"is_active": True}
+
+    @mock.patch("djoser.serializers.User", CustomUser)
+    @mock.patch("djoser.views.User", CustomUser)
+    def test_activation_updates_auto_now_fields(self, api_client):
+        CustomUser.objects.filter(pk=self.user.pk).update(is_active=False)
+        self.user.is_active = False
+        data = {
+            "uid": encode_uid(self.user.pk),
+            "token": default_token_generator.make_token(self.user),
+        }
+
+        response = api_client.post(reverse("user-activation"), data)
+
+        assert response.status_code == status.HTTP_204_NO_CONTENT
+        self.user.refresh_from_db()
+        assert self.user.is_active
+        assert self.user.updated_at > self.stale
+
+    def test_user_update_updates_auto_now_fields(self):
+        UserSerializer().update(self.user, {"custom_email": "ringo@beatles.com"})
+
+        self.user.refresh_from_db()
+        assert self.user.custom_email == "ringo@beatles.com"
+        assert self.user.updated_at > self.stale
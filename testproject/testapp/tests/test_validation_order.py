@@ -0,0 +1,154 @@
+from unittest import mock
+
+import pytest
+from django.contrib.auth import get_user_model
+from django.contrib.auth.tokens import default_token_generator
+from rest_framework import status
+from rest_framework.reverse import reverse
+from testapp.factories import UserFactory
+
+from djoser.utils import encode_uid
+
+User = get_user_model()
+
+
+@pytest.fixture
+def validate_password():
+    with mock.patch("djoser.serializers.validate_password") as validate_password:
+        yield validate_password
+
+
+@pytest.fixture
+def check_password():
+    with mock.patch.object(User, "check_password", return_value=True) as check:
+        yield check
+
+
+@pytest.mark.django_db
+class TestCheapChecksRunFirst:
+    @pytest.fixture(autouse=True)
+    def setup(self, api_client):
+        self.user = UserFactory(password="secret")
+        api_client.force_authenticate(user=self.user)
+
+    def test_create_password_mismatch(
+        self, api_client, djoser_settings, validate_password, django_assert_num_queries
+    ):
+        djoser_settings["USER_CREATE_PASSWORD_RETYPE"] = True
+        api_client.force_authenticate(user=None)
+        data = {
+            "username": self.user.username,
+            "email": "john@beatles.com",
+            "password": "secret123!",
+            "re_password": "wrong",
+        }
+
+        # the username is taken, but the mismatch fails before it's looked up
+        with django_assert_num_queries(0):
+            response = api_client.post(reverse("user-list"), data)
+
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        assert list(response.data) == ["non_field_errors"]
+        validate_password.assert_not_called()
+
+    def test_set_password_mismatch(
+        self, api_client, djoser_settings, validate_password, check_password
+    ):
+        djoser_settings["SET_PASSWORD_RETYPE"] = True
+        data = {
+            "new_password": "new_secret123!",
+            "re_new_password": "wrong",
+            "current_password": "secret",
+        }
+
+        response = api_client.post(reverse("user-set-password"), data)
+
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        validate_password.assert_not_called()
+        check_password.assert_not_called()
+
+    def test_reset_password_confirm_mismatch(
+        self, api_client, djoser_settings, validate_password
+    ):
+        djoser_settings["PASSWORD_RESET_CONFIRM_RETYPE"] = True
+        data = {
+            "uid": encode_uid(self.user.pk),
+            "token": default_token_generator.make_token(self.user),
+            "new_password": "new_secret123!",
+            "re_new_password": "wrong",
+        }
+
+        response = api_client.post(reverse("user-reset-password-confirm"), data)
+
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        validate_password.assert_not_called()
+
+    @pytest.mark.parametrize("retype", [False, True])
+    def test_reset_password_confirm_invalid_token(
+        self, api_client, djoser_settings, validate_password, retype
+    ):
+        djoser_settings["PASSWORD_RESET_CONFIRM_RETYPE"] = retype
+        data = {
+            "uid": encode_uid(self.user.pk),
+            "token": "wrong",
+            "new_password": "new_secret123!",
+            "re_new_password": "new_secret123!",
+        }
+
+        response = api_client.post(reverse("user-reset-password-confirm"), data)
+
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        assert list(response.data) == ["token"]
+        validate_password.assert_not_called()
+
+    def test_set_username_mismatch(
+        self, api_client, djoser_settings, check_password, django_assert_num_queries
+    ):
+        djoser_settings["SET_USERNAME_RETYPE"] = True
+        data = {
+            "new_username": "ringo",
+            "re_new_username": "paul",
+            "current_password": "secret",
+        }
+
+        with django_assert_num_queries(0):
+            response = api_client.post(reverse("user-set-username"), data)
+
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        check_password.assert_not_called()
+
+    def test_taken_username_is_not_hashed(self, api_client, check_password):
+        other = UserFactory()
+        data = {"new_username": other.username, "current_password": "secret"}
+
+        response = api_client.post(reverse("user-set-username"), data)
+
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        assert list(response.data) == ["new_username"]
+        check_password.assert_not_called()
+
+    def test_wrong_current_password_skips_validators(
+        self, api_client, validate_password
+    ):
+        data = {"new_password": "new_secret123!", "current_password": "wrong"}
+
+        response = api_client.post(reverse("user-set-password"), data)
+
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        validate_password.assert_not_called()
+
+    def test_matching_input_runs_every_stage(
+        self, api_client, djoser_settings, validate_password, check_password
+    ):
+        djoser_settings["SET_PASSWORD_RETYPE"] = True
+        data = {
+            "new_password": "new_secret123!",
+            "re_new_password": "new_secret123!",
+            "current_password": "secret",
+        }
+
+        response = api_client.post(reverse("user-set-password"), data)
+
+        assert response.status_code == status.HTTP_204_NO_CONTENT
+        validate_password.assert_called_once()
+        check_password.assert_called_once_with("secret")